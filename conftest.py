@@ -0,0 +1,77 @@
+"""
+Fixture bersama untuk test: PagePool dan halaman pertemuan tanpa browser
+"""
+
+import os
+from contextlib import asynccontextmanager
+
+import pytest
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from src.config import AppSettings
+from src.models import ForumStatus
+from src.services.forum_scraper import ForumScraperService
+from src.services.page_pool import PagePool
+
+
+STATUS_MESSAGES = {
+    ForumStatus.JOINED: "✅ Sudah bergabung",
+    ForumStatus.AVAILABLE: "🟡 Tersedia tapi belum bergabung",
+    ForumStatus.UNAVAILABLE: "❌ Forum belum tersedia",
+}
+
+
+class FakePool:
+    """PagePool tanpa browser"""
+    max_pages = 1
+
+    async def acquire(self):
+        return object()
+
+    async def release(self, page):
+        pass
+
+    @asynccontextmanager
+    async def page(self):
+        yield object()
+
+
+@pytest.fixture
+def fake_page_pool(monkeypatch):
+    """PagePool.for_context mengembalikan FakePool yang sama untuk semua context"""
+    pool = FakePool()
+    monkeypatch.setattr(PagePool, "for_context", classmethod(lambda cls, context, settings=None: pool))
+    return pool
+
+
+@pytest.fixture
+def fake_scraper(fake_page_pool):
+    """
+    Pabrik ForumScraperService dengan halaman pertemuan palsu
+
+    make(status_for, **settings) mengembalikan (scraper, loads): status_for(n)
+    menentukan status pertemuan n, loads mencatat pertemuan yang dimuat.
+    """
+    def make(status_for, **settings):
+        settings.setdefault("delay_between_requests", 0)
+        scraper = ForumScraperService(AppSettings(**settings))
+        loads = []
+
+        async def load(page, code, meeting_num):
+            loads.append(meeting_num)
+
+        async def find_section(page, meeting_num):
+            return meeting_num
+
+        async def analyze(section, meeting_num):
+            status = status_for(meeting_num)
+            return status, f"Pertemuan {meeting_num}: {STATUS_MESSAGES[status]}"
+
+        scraper._load_meeting_page = load
+        scraper._find_forum_section = find_section
+        scraper._analyze_forum_status = analyze
+        return scraper, loads
+
+    return make
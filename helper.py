@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import json
 import time
@@ -8,6 +9,9 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, WebAppI
 from telegram.ext import ContextTypes
 from telegram.error import NetworkError, TelegramError
 from forum_tracker import get_user_completions
+from src.config import env_config
+from src.core.metrics import time_phase
+from src.integrations.telegram_miniapp import MiniAppConfig, TelegramMiniAppGenerator
 
 logger = logging.getLogger(__name__)
 
@@ -42,10 +46,10 @@ def load_courses_mapping():
             if course['name'] == 'STATISTIKA DAN PROBABILITAS':
                 mapping['STATISTIKA DAN PROB'] = course['code']
         
-        print(f"DEBUG: Loaded courses mapping from JSON: {len(mapping)} entries")
+        logger.debug("Loaded courses mapping from JSON: %d entries", len(mapping))
         return mapping
     except Exception as e:
-        print(f"ERROR: Failed to load courses.json: {e}")
+        logger.error("Failed to load courses.json: %s", e)
         # Fallback to hardcoded mapping
         return {
             'STATISTIKA DAN PROBABILITAS': '20251-03TPLK006-22TIF0093',
@@ -55,9 +59,80 @@ def load_courses_mapping():
             'JARINGAN KOMPUTER': '20251-03TPLK006-22TIF0133'
         }
 
-def perform_forum_joining_scraper(nim: str, password: str, target_url: str, course_code: str, meeting_number: str) -> dict:
+_default_bot_core = None
+
+
+def _get_bot_core(bot_core=None):
+    """Pakai bot_core yang diberikan, selain itu satu instance bersama"""
+    global _default_bot_core
+    if bot_core is not None:
+        return bot_core
+    if _default_bot_core is None:
+        from src.core.bot_service import MentariBotCore
+        _default_bot_core = MentariBotCore()
+    return _default_bot_core
+
+
+async def process_forums_batch(
+    nim: str,
+    password: str,
+    forums: list,
+    action: str = "join",
+    bot_core=None,
+    progress_callback=None,
+    result_callback=None
+) -> list:
     """
-    Real forum joining function menggunakan scraper
+    Join atau verifikasi banyak forum dengan satu login
+    
+    Args:
+        nim: Student ID number
+        password: Student password
+        forums: List of dicts with 'course_code' and 'meeting_number'
+        action: "join" atau "verify"
+        bot_core: MentariBotCore yang dipakai (default: instance bersama)
+        progress_callback: Async callback untuk teks progress
+        result_callback: Async callback untuk ParticipationResult setiap forum
+    
+    Returns:
+        list: ParticipationResult.to_dict() per forum, urutan sama dengan forums
+    """
+    from src.core.bot_service import LoginFailedError
+    from src.models import LoginCredentials, ForumTarget, ForumStatus
+    
+    targets = [
+        ForumTarget(course_code=str(forum['course_code']), meeting_number=int(forum['meeting_number']))
+        for forum in forums
+    ]
+    
+    try:
+        results = await _get_bot_core(bot_core).run_forum_actions(
+            LoginCredentials(nim=nim, password=password),
+            targets, action, progress_callback, result_callback
+        )
+        return [result.to_dict() for result in results]
+    except LoginFailedError:
+        message = 'Login gagal - periksa NIM dan password'
+    except Exception as e:
+        logger.error(f"Error in process_forums_batch: {e}")
+        message = f'Error: {str(e)}'
+    
+    return [
+        {
+            'course_code': target.course_code,
+            'meeting_number': target.meeting_number,
+            'action': action,
+            'success': False,
+            'status': ForumStatus.ERROR.value,
+            'message': message,
+            'error_details': None
+        }
+        for target in targets
+    ]
+
+async def perform_forum_joining_scraper(nim: str, password: str, target_url: str, course_code: str, meeting_number: str, bot_core=None) -> dict:
+    """
+    Gabung ke satu forum menggunakan scraper
     
     Args:
         nim: Student ID number
@@ -65,6 +140,7 @@ def perform_forum_joining_scraper(nim: str, password: str, target_url: str, cour
         target_url: Forum URL to join
         course_code: Course code (e.g., 20251-03TPLK006-22TIF0093)
         meeting_number: Meeting number (e.g., 2)
+        bot_core: MentariBotCore yang dipakai (default: instance bersama)
     
     Returns:
         dict: {
@@ -73,55 +149,40 @@ def perform_forum_joining_scraper(nim: str, password: str, target_url: str, cour
             'join_data': dict (optional)
         }
     """
-    try:
-        logger.info(f"Starting real forum join for {nim} to {target_url}")
-        
-        # TODO: Implement actual scraper logic here
-        # This would include:
-        # 1. Login to Mentari UNPAM with credentials
-        # 2. Navigate to the forum URL
-        # 3. Find and click join forum button
-        # 4. Verify successful join
-        
-        # For now, simulate the process with realistic timing
-        time.sleep(2)  # Simulate login time
-        
-        # Simulate successful join (replace with real logic)
-        success_rate = 0.9  # 90% success rate for simulation
-        import random
-        
-        if random.random() < success_rate:
-            return {
-                'success': True,
-                'message': f'Successfully joined forum {course_code} meeting {meeting_number}',
-                'join_data': {
-                    'join_time': datetime.now().isoformat(),
-                    'forum_url': target_url,
-                    'course_code': course_code,
-                    'meeting_number': meeting_number
-                }
-            }
-        else:
-            return {
-                'success': False,
-                'message': 'Failed to join forum - login credentials may be incorrect or forum is not accessible'
-            }
-            
-    except Exception as e:
-        logger.error(f"Error in perform_forum_joining_scraper: {e}")
-        return {
-            'success': False,
-            'message': f'Error during forum joining: {str(e)}'
+    logger.info(f"Starting forum join for {nim} to {target_url}")
+    
+    result = (await process_forums_batch(
+        nim, password, [{'course_code': course_code, 'meeting_number': meeting_number}], "join", bot_core
+    ))[0]
+    
+    if not result['success']:
+        return {'success': False, 'message': result['message']}
+    
+    return {
+        'success': True,
+        'message': result['message'],
+        'join_data': {
+            'join_time': datetime.now().isoformat(),
+            'forum_url': target_url,
+            'course_code': course_code,
+            'meeting_number': meeting_number,
+            'status': result['status']
         }
+    }
 
-def verify_forum_participation(course_code: str, meeting_number: str, forum_url: str) -> dict:
+async def verify_forum_participation(nim: str, password: str, course_code: str, meeting_number: str, forum_url: str = None, bot_core=None) -> dict:
     """
     Verify if user has actually participated in the forum discussion
     
+    Partisipasi dianggap selesai jika pertemuan sudah bertanda centang di Mentari.
+    
     Args:
+        nim: Student ID number
+        password: Student password
         course_code: Course code
         meeting_number: Meeting number
         forum_url: Forum URL to check
+        bot_core: MentariBotCore yang dipakai (default: instance bersama)
     
     Returns:
         dict: {
@@ -130,46 +191,24 @@ def verify_forum_participation(course_code: str, meeting_number: str, forum_url:
             'data': dict (optional)
         }
     """
-    try:
-        logger.info(f"Verifying participation for {course_code} meeting {meeting_number}")
-        
-        # TODO: Implement real verification logic
-        # This would include:
-        # 1. Login to Mentari UNPAM
-        # 2. Navigate to forum
-        # 3. Check if user has posted/participated
-        # 4. Return verification status
-        
-        # Simulate verification process
-        time.sleep(3)  # Simulate checking time
-        
-        # Simulate verification result (replace with real logic)
-        # In real implementation, this would check actual forum posts
-        verification_rate = 0.8  # 80% verification success for simulation
-        import random
-        
-        if random.random() < verification_rate:
-            return {
-                'verified': True,
-                'message': 'Participation verified successfully',
-                'data': {
-                    'verification_time': datetime.now().isoformat(),
-                    'forum_url': forum_url,
-                    'participation_type': 'discussion_post'  # Could be post, reply, etc.
-                }
-            }
-        else:
-            return {
-                'verified': False,
-                'message': 'No participation detected in forum discussion'
-            }
-            
-    except Exception as e:
-        logger.error(f"Error in verify_forum_participation: {e}")
-        return {
-            'verified': False,
-            'message': f'Error during verification: {str(e)}'
+    logger.info(f"Verifying participation for {course_code} meeting {meeting_number}")
+    
+    result = (await process_forums_batch(
+        nim, password, [{'course_code': course_code, 'meeting_number': meeting_number}], "verify", bot_core
+    ))[0]
+    
+    if not result['success']:
+        return {'verified': False, 'message': result['message']}
+    
+    return {
+        'verified': True,
+        'message': result['message'],
+        'data': {
+            'verification_time': datetime.now().isoformat(),
+            'forum_url': forum_url,
+            'status': result['status']
         }
+    }
 
 def format_result_message(hasil: str, nim: str = None, available_forums: list = None, forum_status_text: str = None) -> str:
     """Format the final result message with Mini App support - improved readability"""
@@ -230,11 +269,11 @@ def extract_available_forums_from_result(result: str) -> list:
     if not result:
         return available_forums
     
-    # DEBUG: Log the input result
-    print(f"DEBUG EXTRACT_AVAILABLE_FORUMS:")
-    print(f"  Result length: {len(result)} chars")
-    print(f"  Contains 🟡: {'🟡' in result}")
-    print(f"  Contains Tersedia: {'Tersedia' in result}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "extract_available_forums: length=%d has_yellow=%s has_tersedia=%s",
+            len(result), '🟡' in result, 'Tersedia' in result
+        )
     
     # Check if any available pattern exists
     has_available = any(pattern in result for pattern in available_patterns)
@@ -244,15 +283,12 @@ def extract_available_forums_from_result(result: str) -> list:
     status_match = re.search(r'🟡 Tersedia belum gabung:\s*(\d+)', result)
     if status_match:
         available_count = int(status_match.group(1))
-        print(f"  Found status summary: {available_count} forums available")
+        logger.debug("Found status summary: %d forums available", available_count)
         has_available = True
     
     if not has_available:
-        print(f"  No available patterns found!")
+        logger.debug("No available patterns found")
         return available_forums
-    else:
-        print(f"  Available patterns found!")
-    print("="*30)
     
     lines = result.split('\n')
     current_course = None
@@ -268,13 +304,11 @@ def extract_available_forums_from_result(result: str) -> list:
             current_course = current_course.strip('*').strip()
             current_course_code = None
         
-        # Try to extract course code from URL patterns in the result
-        # Look for patterns like: "20251-03TPLK006-22TIF0093"
-        elif 'u-courses/' in line or '20251-' in line:
-            import re
-            course_code_match = re.search(r'20251-\w+-\w+', line)
+        # Kode mata kuliah dari hasil: "📋 Kode: `...`" atau URL /u-courses/<kode>
+        elif line.startswith('📋 Kode:') or 'u-courses/' in line:
+            course_code_match = re.search(r'Kode:\s*`([^`]+)`', line) or re.search(r'u-courses/([^?\s/]+)', line)
             if course_code_match:
-                current_course_code = course_code_match.group(0)
+                current_course_code = course_code_match.group(1)
         
         # Detect available forum (🟡 Tersedia - various patterns)
         elif '🟡' in line and ('Tersedia' in line or 'tersedia' in line):
@@ -287,35 +321,23 @@ def extract_available_forums_from_result(result: str) -> list:
                     if meeting_match:
                         meeting_number = int(meeting_match.group(1))
                         
-                        # Use extracted course code or fallback to mapping
-                        if not current_course_code and current_course:
-                            # Fallback course code mapping based on course name - FIXED
-                            course_map = load_courses_mapping()
-                            current_course_code = course_map.get(current_course, None)  # Don't fallback to STATISTIKA
-                        
                         if current_course:
-                            # Always use course_code from mapping to ensure consistency
-                            course_map = load_courses_mapping()
-                            # Always prioritize mapping over any extracted code
-                            final_course_code = course_map.get(current_course)
+                            # Kode dari hasil scraping; mapping courses.json hanya fallback
+                            final_course_code = current_course_code or load_courses_mapping().get(current_course)
                             
-                            # DEBUG: Log course mapping lookup
-                            print(f"DEBUG: Course mapping lookup: '{current_course}' -> '{final_course_code}'")
+                            logger.debug("Course code for %r: %r", current_course, final_course_code)
                             
-                            # Only add if we have a valid mapping AND meeting number is in JSON
                             if final_course_code:
-                                # Validate meeting number against JSON data
-                                courses_data = load_courses_data()
-                                valid_meeting = False
-                                for course in courses_data:
-                                    if course['code'] == final_course_code:
-                                        if meeting_number in course['meetings']:
-                                            valid_meeting = True
-                                        break
+                                # Kode hasil mapping: pertemuan harus ada di courses.json
+                                valid_meeting = bool(current_course_code)
+                                if not valid_meeting:
+                                    for course in load_courses_data():
+                                        if course['code'] == final_course_code:
+                                            valid_meeting = meeting_number in course['meetings']
+                                            break
                                 
-                                # Only add if meeting number is valid according to JSON
                                 if valid_meeting:
-                                    print(f"DEBUG: Adding forum: {current_course} - Meeting {meeting_number}")
+                                    logger.debug("Adding forum: %s - Meeting %d", current_course, meeting_number)
                                     available_forums.append({
                                         'course_name': current_course,
                                         'course_code': final_course_code,
@@ -323,15 +345,13 @@ def extract_available_forums_from_result(result: str) -> list:
                                         'status': 'available'
                                     })
                                 else:
-                                    print(f"DEBUG: Ignoring meeting {meeting_number} for {current_course} - not in JSON meetings")
+                                    logger.debug("Ignoring meeting %d for %s - not in JSON meetings", meeting_number, current_course)
                             else:
-                                print(f"DEBUG: No course code mapping found for '{current_course}'")
-                                print(f"DEBUG: Available mappings: {list(course_map.keys())}")
+                                logger.debug("No course code found for %r", current_course)
                 except (ValueError, AttributeError):
                     continue
     
-    # DEBUG: Log what was found
-    print(f"DEBUG: Found {len(available_forums)} individual forums from parsing")
+    logger.debug("Found %d individual forums from parsing", len(available_forums))
     
     # NO FALLBACK LOGIC - Only show forums that are actually available from scraping
     # Fallback was creating false positives by showing all forums as available
@@ -339,6 +359,22 @@ def extract_available_forums_from_result(result: str) -> list:
     
     return available_forums
 
+def extract_available_forums_from_courses(course_results: list) -> list:
+    """Forum tersedia (belum bergabung) langsung dari CourseResult; kode dari CourseInfo"""
+    from src.models import ForumStatus
+    
+    return [
+        {
+            'course_name': course_result.course.name,
+            'course_code': course_result.course.code,
+            'meeting_number': meeting.number,
+            'status': 'available'
+        }
+        for course_result in course_results
+        for meeting in course_result.meetings_status
+        if meeting.status == ForumStatus.AVAILABLE
+    ]
+
 def create_miniapp_keyboard(available_forums: list, user_credentials=None, completed_forums=None) -> InlineKeyboardMarkup:
     """Create inline keyboard dengan Web App buttons yang sebenarnya untuk forum yang available"""
     if not available_forums:
@@ -367,46 +403,36 @@ def create_miniapp_keyboard(available_forums: list, user_credentials=None, compl
     
     keyboard_buttons = []
     
+    # Halaman Mini App dilayani server terpadu (main_unified.py); tanpa
+    # WEBHOOK_URL tidak ada server yang bisa join/cek forum sungguhan
+    if not env_config.webhook_url:
+        logger.info("WEBHOOK_URL not set, skipping Mini App forum buttons")
+        pending_forums = []
+    
+    generator = TelegramMiniAppGenerator(
+        MiniAppConfig(bot_token=env_config.telegram_token, app_url=env_config.webhook_url or '')
+    )
+    
     # Show all pending forums (up to 6 for UI limits)
     display_forums = pending_forums[:6]
     
     # Add Web App buttons untuk setiap pending forum
     for forum in display_forums:
-        # Encode credentials ke Mini App URL (base64 for security)
-        import base64
-        import json
-        
-        if user_credentials:
-            cred_data = {
-                'nim': user_credentials.get('nim', ''),
-                'password': user_credentials.get('password', '')
-            }
-            encoded_creds = base64.b64encode(json.dumps(cred_data).encode()).decode()
-        else:
-            encoded_creds = ''
-        
-        # FIXED: Course code mapping sesuai dengan courses.json
-        # Updated untuk match dengan data real dari courses.json
-        course_code_mapping = load_courses_mapping()
-        
-        # Get actual course code from mapping (should always exist now)
-        actual_course_code = course_code_mapping.get(forum['course_name'])
+        # Kode dari hasil scraping (CourseInfo.code); mapping courses.json hanya fallback
+        actual_course_code = forum.get('course_code') or load_courses_mapping().get(forum['course_name'])
         
-        # Skip if no mapping found (safety check)
         if not actual_course_code:
-            print(f"WARNING: No course code mapping for: {forum['course_name']}")
+            logger.warning("No course code for: %s", forum['course_name'])
             continue
         
-        # DEBUG: Log untuk troubleshooting
-        print(f"DEBUG CREATE MINIAPP KEYBOARD:")
-        print(f"  Course Name: {forum['course_name']}")
-        print(f"  Original Course Code: {forum['course_code']}")
-        print(f"  Mapped Course Code: {actual_course_code}")
-        print(f"  Meeting: {forum['meeting_number']}")
-        print("="*50)
+        logger.debug(
+            "Mini app button: course=%s code=%s meeting=%s",
+            forum['course_name'], actual_course_code, forum['meeting_number']
+        )
         
-        # Create Mini App URL dengan parameter forum dan credentials
-        miniapp_url = f"https://mentari-miniapp.vercel.app/forum?course_code={actual_course_code}&course_title={forum['course_name'][:30].replace(' ', '%20')}&meeting_number={forum['meeting_number']}&creds={encoded_creds}"
+        miniapp_url = generator.generate_forum_page_url(
+            actual_course_code, forum['course_name'], forum['meeting_number'], user_credentials
+        )
         
         # Create Web App button yang akan membuka Mini App
         # Format nama course yang lebih friendly dan jelas
@@ -419,6 +445,21 @@ def create_miniapp_keyboard(available_forums: list, user_credentials=None, compl
         )
         keyboard_buttons.append([button])
     
+    # Gabung semua forum dengan satu login (butuh server terpadu, lihat main_unified.py)
+    if len(pending_forums) > 1 and user_credentials:
+        bulk_forums = [
+            {
+                'course_code': forum['course_code'],
+                'course_name': forum['course_name'],
+                'meeting_number': forum['meeting_number']
+            }
+            for forum in pending_forums
+        ]
+        keyboard_buttons.insert(0, [InlineKeyboardButton(
+            f"🚀 Gabung Semua ({len(bulk_forums)} forum)",
+            web_app=WebAppInfo(url=generator.generate_bulk_page_url(bulk_forums, user_credentials))
+        )])
+    
     # Add fallback manual guide button
     info_button = InlineKeyboardButton(
         "📖 Panduan Manual", 
@@ -507,8 +548,135 @@ def split_message(text: str, max_length: int = 4000) -> list:
     
     return final_chunks if final_chunks else [text[:max_length]]
 
-async def send_result_or_error(update, context, nim: str, password: str, scrape_function, processing_msg=None):
-    """Send scraping result or error message with live updates - Original compatibility function"""
+def filter_pending_forums(available_forums: list, user_completions: list) -> list:
+    """Buang forum yang sudah ditandai selesai oleh user"""
+    pending_forums = []
+    course_code_mapping = None
+    
+    for forum in available_forums:
+        actual_course_code = forum.get('course_code')
+        if not actual_course_code:
+            if course_code_mapping is None:
+                course_code_mapping = load_courses_mapping()
+            actual_course_code = course_code_mapping.get(forum['course_name'], '')
+        
+        # Check if this forum is already completed
+        is_completed = any(
+            c.get('course_code') == actual_course_code and 
+            c.get('meeting_number') == str(forum['meeting_number']) and
+            c.get('status') == 'completed'
+            for c in user_completions
+        )
+        
+        if not is_completed:
+            pending_forums.append(forum)
+    
+    return pending_forums
+
+class IncrementalReport:
+    """
+    Kirim laporan per mata kuliah begitu CourseResult-nya selesai
+    
+    Mata kuliah ditambahkan ke pesan laporan yang sedang terbuka (di-edit)
+    sampai mendekati limit Telegram, lalu lanjut di pesan baru. Forum yang
+    tersedia langsung mendapat tombol Mini App di pesan mata kuliahnya.
+    Ringkasan dan bagian Mini App dikirim di akhir lewat finish().
+    """
+    
+    def __init__(self, reply_text, nim: str, password: str):
+        from src.services.result_formatter import ResultFormatterService
+        
+        self.reply_text = reply_text
+        self.nim = nim
+        self.user_credentials = {'nim': nim, 'password': password}
+        self.stream = ResultFormatterService().report_stream()
+        self.courses = []
+        self.started = time.time()
+        self._message = None
+        self._message_forums = []
+        self._completions = None
+    
+    @property
+    def delivered(self) -> bool:
+        return bool(self.courses)
+    
+    async def _pending_forums(self, course_result) -> list:
+        if self._completions is None:
+            # Dibaca sekali per laporan; file tracker dibaca di thread
+            self._completions = await asyncio.to_thread(get_user_completions, self.nim)
+        
+        forums = extract_available_forums_from_courses([course_result])
+        return filter_pending_forums(forums, self._completions)
+    
+    async def _publish(self, text: str, forums: list):
+        """Tulis teks ke pesan laporan yang terbuka, atau kirim pesan baru"""
+        keyboard = create_miniapp_keyboard(forums, self.user_credentials) if forums else None
+        
+        with time_phase("telegram_send"):
+            if self._message is None:
+                self._message = await self.reply_text(text, parse_mode='Markdown', reply_markup=keyboard)
+                return
+            try:
+                await self._message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
+            except TelegramError as e:
+                # "message is not modified" dan sejenisnya
+                logger.debug(f"Report message edit skipped: {e}")
+    
+    async def _publish_chunks(self, chunks: list, forums: list):
+        """Chunk yang sudah penuh menutup pesan terbuka; berikutnya pesan baru"""
+        for index, chunk in enumerate(chunks):
+            await self._publish(chunk, forums if index == len(chunks) - 1 else [])
+            self._message = None
+    
+    async def on_course(self, course_result):
+        """Course callback untuk bot core"""
+        self.courses.append(course_result)
+        forums = await self._pending_forums(course_result)
+        
+        chunks = self.stream.add_course(course_result)
+        preview = self.stream.pending_text()
+        
+        if chunks and preview:
+            # Mata kuliah baru dibuka di chunk berikutnya
+            await self._publish_chunks(chunks, self._message_forums)
+            self._message_forums = forums
+        else:
+            self._message_forums = self._message_forums + forums
+            if chunks:
+                await self._publish_chunks(chunks, self._message_forums)
+                self._message_forums = []
+        
+        if preview:
+            await self._publish(preview, self._message_forums)
+    
+    async def finish(self, pending_forums: list, forum_status_text: str, processing_msg=None):
+        """Kirim ringkasan, lalu bagian Mini App dengan semua forum yang belum dikerjakan"""
+        from src.models import ScrapingResult
+        
+        result = ScrapingResult.from_course_results(self.courses, time.time() - self.started)
+        await self._publish_chunks(self.stream.finish(result), self._message_forums)
+        self._message_forums = []
+        
+        mini_app_section = format_result_message("", self.nim, pending_forums, forum_status_text).strip()
+        if mini_app_section:
+            await self._publish_chunks(split_message(mini_app_section), pending_forums)
+        
+        if processing_msg:
+            try:
+                await processing_msg.edit_text(
+                    "✅ *Pengecekan selesai!*\n\nLaporan lengkap ada di pesan di bawah.",
+                    parse_mode='Markdown'
+                )
+            except Exception as e:
+                logger.debug(f"Error updating progress: {e}")
+
+async def send_result_or_error(update, context, nim: str, password: str, scrape_function, processing_msg=None, incremental: bool = False):
+    """
+    Send scraping result or error message with live updates - Original compatibility function
+    
+    Dengan incremental=True, scrape_function menerima course_callback dan
+    laporan tiap mata kuliah dikirim begitu mata kuliah itu selesai.
+    """
     
     # Create live progress callback
     async def progress_callback(message: str):
@@ -521,58 +689,50 @@ async def send_result_or_error(update, context, nim: str, password: str, scrape_
                 )
             except Exception as e:
                 logger.debug(f"Error updating progress: {e}")
+    
+    # update None saat job dilanjutkan setelah restart; balas ke chat processing message
+    reply_text = update.message.reply_text if update is not None else processing_msg.reply_text
+    report = IncrementalReport(reply_text, nim, password) if incremental else None
         
     try:
         # Execute scraping with live progress callback
-        result = await scrape_function(nim, password, progress_callback)
+        if report is not None:
+            result = await scrape_function(nim, password, progress_callback, course_callback=report.on_course)
+        else:
+            result = await scrape_function(nim, password, progress_callback)
         
-        # DEBUG: Check result content
-        print(f"DEBUG SCRAPING RESULT:")
-        print(f"  Result length: {len(result) if result else 0} chars")
-        print(f"  Contains '🟡 Tersedia belum gabung': {'🟡 Tersedia belum gabung' in result if result else False}")
-        print(f"  Contains 'SEMUA FORUM SELESAI': {'SEMUA FORUM SELESAI' in result if result else False}")
-        print("="*30)
+        logger.debug("Scraping result received: %d chars", len(result) if result else 0)
         
-        # Extract available forums for Mini App
-        available_forums = extract_available_forums_from_result(result)
+        # Forum untuk Mini App: dari CourseResult jika ada, selain itu parse teks laporan
+        if report is not None and report.delivered and not result.startswith("❌"):
+            available_forums = extract_available_forums_from_courses(report.courses)
+        else:
+            available_forums = extract_available_forums_from_result(result)
         
-        # DEBUG: Log available forums
-        print(f"DEBUG AVAILABLE FORUMS: {len(available_forums)} found")
-        for i, forum in enumerate(available_forums):
-            print(f"  {i+1}. {forum['course_name']} - Pertemuan {forum['meeting_number']}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Available forums (%d): %s", len(available_forums),
+                [f"{forum['course_name']} P{forum['meeting_number']}" for forum in available_forums]
+            )
         
         # Get user's completed forums
-        user_completions = get_user_completions(nim)
+        user_completions = await asyncio.to_thread(get_user_completions, nim)
         
-        # DEBUG: Log completed forums
-        print(f"DEBUG COMPLETED FORUMS: {len(user_completions)} found")
-        for i, comp in enumerate(user_completions):
-            print(f"  {i+1}. {comp.get('course_code', 'N/A')} - Meeting {comp.get('meeting_number', 'N/A')} - Status: {comp.get('status', 'N/A')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Completed forums (%d): %s", len(user_completions),
+                [f"{comp.get('course_code', 'N/A')} M{comp.get('meeting_number', 'N/A')} {comp.get('status', 'N/A')}"
+                 for comp in user_completions]
+            )
         
         # Filter available forums to show only pending ones
-        pending_forums = []
-        for forum in available_forums:
-            # Create course code from mapping - FIXED to match courses.json
-            course_code_mapping = load_courses_mapping()
-            
-            actual_course_code = course_code_mapping.get(forum['course_name'], forum.get('course_code', ''))
-            
-            # Check if this forum is already completed
-            is_completed = any(
-                c.get('course_code') == actual_course_code and 
-                c.get('meeting_number') == str(forum['meeting_number']) and
-                c.get('status') == 'completed'
-                for c in user_completions
-            )
-            
-            if not is_completed:
-                pending_forums.append(forum)
+        pending_forums = filter_pending_forums(available_forums, user_completions)
         
-        # DEBUG: Log pending forums
-        print(f"DEBUG PENDING FORUMS: {len(pending_forums)} found")
-        for i, forum in enumerate(pending_forums):
-            print(f"  {i+1}. {forum['course_name']} - Pertemuan {forum['meeting_number']}")
-        print("="*50)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Pending forums (%d): %s", len(pending_forums),
+                [f"{forum['course_name']} P{forum['meeting_number']}" for forum in pending_forums]
+            )
         
         # Update forum count in message
         total_available = len(available_forums)
@@ -587,6 +747,11 @@ async def send_result_or_error(update, context, nim: str, password: str, scrape_
         else:
             forum_status_text = f"🎉 *Semua {total_available} forum sudah selesai!*"
         
+        if report is not None and report.delivered and not result.startswith("❌"):
+            # Bagian per mata kuliah sudah terkirim; tinggal ringkasan + Mini App
+            await report.finish(pending_forums, forum_status_text, processing_msg)
+            return
+        
         # Format message with updated info
         formatted_result = format_result_message(result, nim, pending_forums, forum_status_text)
         
@@ -597,30 +762,31 @@ async def send_result_or_error(update, context, nim: str, password: str, scrape_
         user_credentials = {'nim': nim, 'password': password}
         
         # Send final result with Mini App keyboard (using pending_forums for display)
-        if message_chunks:
-            if processing_msg:
-                try:
-                    await processing_msg.edit_text(
-                        message_chunks[0], 
-                        parse_mode='Markdown',
-                        reply_markup=create_miniapp_keyboard(pending_forums, user_credentials) if pending_forums else None
-                    )
-                except Exception:
-                    await update.message.reply_text(
+        with time_phase("telegram_send"):
+            if message_chunks:
+                if processing_msg:
+                    try:
+                        await processing_msg.edit_text(
+                            message_chunks[0], 
+                            parse_mode='Markdown',
+                            reply_markup=create_miniapp_keyboard(pending_forums, user_credentials) if pending_forums else None
+                        )
+                    except Exception:
+                        await reply_text(
+                            message_chunks[0], 
+                            parse_mode='Markdown',
+                            reply_markup=create_miniapp_keyboard(pending_forums, user_credentials) if pending_forums else None
+                        )
+                else:
+                    await reply_text(
                         message_chunks[0], 
                         parse_mode='Markdown',
-                        reply_markup=create_miniapp_keyboard(pending_forums, user_credentials) if pending_forums else None
+                        reply_markup=create_miniapp_keyboard(available_forums, user_credentials) if available_forums else None
                     )
-            else:
-                await update.message.reply_text(
-                    message_chunks[0], 
-                    parse_mode='Markdown',
-                    reply_markup=create_miniapp_keyboard(available_forums, user_credentials) if available_forums else None
-                )
             
-            # Send additional chunks if any
-            for chunk in message_chunks[1:]:
-                await update.message.reply_text(chunk, parse_mode='Markdown')
+                # Send additional chunks if any
+                for chunk in message_chunks[1:]:
+                    await reply_text(chunk, parse_mode='Markdown')
                 
     except Exception as e:
         logger.error(f"Error in scraping: {e}")
@@ -630,6 +796,6 @@ async def send_result_or_error(update, context, nim: str, password: str, scrape_
             try:
                 await processing_msg.edit_text(error_msg)
             except Exception:
-                await update.message.reply_text(error_msg)
+                await reply_text(error_msg)
         else:
-            await update.message.reply_text(error_msg)
\ No newline at end of file
+            await reply_text(error_msg)
\ No newline at end of file
@@ -2,7 +2,6 @@ from typing import Optional, Callable, Awaitable, Any
 import os
 import sys
 import asyncio
-import socket
 import logging
 import json
 from datetime import datetime
@@ -34,13 +33,21 @@ if sys.platform == "win32":
         # Fallback untuk kasus di mana detach tidak tersedia
         pass
 
-# Add src to path for new structure
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
 from helper import extract_credentials, send_result_or_error
-from core.bot_service import MentariBotCore
-from models import LoginCredentials
-from config import env_config, ConfigManager
+# Selalu lewat package src: import tanpa prefix membuat salinan modul kedua
+# (LoginFailedError, env_config, dll. menjadi objek yang berbeda)
+from src.core.bot_service import MentariBotCore
+from src.models import LoginCredentials
+from src.config import env_config, ConfigManager
+from src.core.metrics import MetricsServer
+from src.core.logging_setup import setup_logging, new_job_id, job_context
+from src.core.health_monitor import connectivity_monitor
+from src.core.worker_pool import ScrapeWorkerPool
+from src.services.job_store import JobStore, JobCheckpoint, CredentialVault, JOB_FAILED
+from src.services.subscriptions import SubscriptionStore, SubscriptionScheduler
+from src.services.history_store import HistoryStore
+from src.services.availability_index import availability_index
+from src.services.opening_predictor import OpeningPredictor
 
 # Setup agar bisa nested event loop di Windows
 nest_asyncio.apply()
@@ -78,30 +85,40 @@ except Exception as e:
 # Get current settings
 app_settings = config_manager.config
 
-# Setup logging dengan encoding yang benar
-logging.basicConfig(
-    level=getattr(logging, env_config.log_level.upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(app_settings.log_dir, 'bot.log'), encoding='utf-8'),
-        logging.StreamHandler()
-    ]
+# Setup logging: QueueHandler di event loop, file JSON + rotasi di thread listener
+setup_logging(
+    level=env_config.log_level,
+    log_dir=app_settings.log_dir,
+    max_bytes=env_config.log_max_bytes,
+    backup_count=env_config.log_backup_count
 )
 logger = logging.getLogger(__name__)
 
-# Ensure log directory exists
-os.makedirs(app_settings.log_dir, exist_ok=True)
-
 # Initialize bot core service
 bot_core = MentariBotCore(app_settings)
 
-# Cek apakah koneksi internet / Telegram tersedia
-def is_connected():
-    try:
-        socket.create_connection(("api.telegram.org", 443), timeout=5)
-        return True
-    except OSError:
-        return False
+# Job store persisten: job yang terputus restart dilanjutkan saat startup
+credential_vault = CredentialVault(env_config.job_store_key)
+job_store = JobStore(env_config.job_store_path, credential_vault)
+
+# Snapshot status tiap scan untuk analitik (src/services/status_analytics.py)
+if env_config.history_dir:
+    bot_core.history_store = HistoryStore(env_config.history_dir)
+
+# Perkiraan jendela pembukaan forum dari riwayat (butuh history store)
+opening_predictor = OpeningPredictor(bot_core.history_store) if bot_core.history_store else None
+
+# Mode /subscribe: scan berkala, notifikasi hanya saat status berubah
+subscription_store = SubscriptionStore(env_config.job_store_path, credential_vault)
+subscription_scheduler = SubscriptionScheduler(
+    subscription_store,
+    bot_core,
+    interval=env_config.subscription_interval,
+    max_parallel=env_config.subscription_parallel,
+    predictor=opening_predictor
+)
+# Forum yang baru terbuka (dari scan user mana pun) memajukan scan subscriber terkait
+availability_index.add_listener(subscription_scheduler.on_forum_opened)
 
 # Command /start
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -134,7 +151,9 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "*Perintah yang tersedia:*\n"
         "/start - Memulai bot\n"
         "/help - Menampilkan bantuan\n"
-        "/status - Status bot\n\n"
+        "/status - Status bot\n"
+        "/subscribe - Cek otomatis berkala, kabari jika status berubah\n"
+        "/unsubscribe - Berhenti berlangganan\n\n"
         "*Format kredensial:*\n"
         "`NIM: nomor_nim_anda`\n"
         "`Password: password_anda`\n\n"
@@ -150,13 +169,77 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if not update.message:
         return
         
+    # Baca state yang di-cache oleh background monitor (tanpa blocking probe)
     status_msg = f"🤖 *Status Bot*\n\n"
     status_msg += f"📅 Waktu: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    status_msg += f"🌐 Koneksi: {'✅ Online' if is_connected() else '❌ Offline'}\n"
+    status_msg += f"{connectivity_monitor.format_status()}\n"
+    if opening_predictor is not None:
+        status_msg += f"{opening_predictor.format_status()}\n"
     status_msg += f"🔧 Status: Aktif dan siap digunakan"
     
     await update.message.reply_text(status_msg, parse_mode="Markdown")
 
+# Command /subscribe
+async def subscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if not update.message or not update.message.text:
+        return
+    
+    if not credential_vault.enabled:
+        await update.message.reply_text("⚠️ Fitur langganan belum diaktifkan oleh admin.")
+        return
+    
+    try:
+        # Buang "/subscribe" (dan @botname) di awal pesan
+        _, _, args_text = update.message.text.partition(update.message.text.split()[0])
+        nim, pw = extract_credentials(args_text)
+        credentials = LoginCredentials(nim=nim, password=pw)
+    except ValueError:
+        await update.message.reply_text(
+            "🔔 *Langganan Pengecekan Otomatis*\n\n"
+            "Bot akan mengecek forum Anda secara berkala dan hanya mengirim pesan "
+            "jika ada perubahan status (misalnya ❌ → 🟡).\n\n"
+            "Kirim dengan format:\n"
+            "`/subscribe`\n`NIM: 241011400xxx`\n`Password: rahasiamu`",
+            parse_mode="Markdown"
+        )
+        return
+    
+    # Cek kredensial sekarang agar password salah tidak di-scan berulang kali
+    checking_msg = await update.message.reply_text("🔐 Memverifikasi login...")
+    if not await bot_core.test_login_only(credentials):
+        await checking_msg.edit_text(
+            "❌ Login gagal. Periksa NIM dan password Anda, lalu kirim /subscribe lagi."
+        )
+        return
+    
+    await asyncio.to_thread(
+        subscription_store.subscribe,
+        update.message.chat_id,
+        credentials,
+        subscription_scheduler.first_run_time()
+    )
+    logger.info(f"Chat subscribed for NIM {nim[:4]}****")
+    
+    hours = env_config.subscription_interval / 3600
+    await checking_msg.edit_text(
+        f"✅ *Langganan aktif!*\n\n"
+        f"Forum akan dicek sekitar setiap {hours:.0f} jam. "
+        f"Anda hanya akan menerima pesan jika ada perubahan status.\n\n"
+        f"Ketik /unsubscribe untuk berhenti.",
+        parse_mode="Markdown"
+    )
+
+# Command /unsubscribe
+async def unsubscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if not update.message:
+        return
+    
+    removed = await asyncio.to_thread(subscription_store.unsubscribe, update.message.chat_id)
+    if removed:
+        await update.message.reply_text("🔕 Langganan dihentikan. Kredensial Anda sudah dihapus.")
+    else:
+        await update.message.reply_text("ℹ️ Anda belum berlangganan.")
+
 # Handler untuk pesan berisi kredensial
 async def handle_credentials(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not update.effective_user or not update.message or not update.message.text:
@@ -165,7 +248,8 @@ async def handle_credentials(update: Update, context: ContextTypes.DEFAULT_TYPE)
     user_id = update.effective_user.id
     text = update.message.text
     
-    logger.info(f"User {user_id} sent credentials")
+    job_id = new_job_id()
+    logger.info("User %s sent credentials", user_id)
     
     if "nim" in text.lower() and "password" in text.lower():
         try:
@@ -182,14 +266,30 @@ async def handle_credentials(update: Update, context: ContextTypes.DEFAULT_TYPE)
             
             # Create credentials object
             credentials = LoginCredentials(nim=nim, password=pw)
+            # None: mata kuliah dideteksi dari dashboard setelah login
+            courses = None
+            
+            # Persist job agar bisa dilanjutkan jika bot restart di tengah scraping
+            await asyncio.to_thread(
+                job_store.create_job, job_id, update.message.chat_id, credentials, courses
+            )
+            checkpoint = await asyncio.to_thread(JobCheckpoint, job_store, job_id)
             
             # Process login and scrape using new bot core
-            async def scrape_function(nim: str, password: str, progress_callback: Optional[Any] = None) -> str:
-                return await bot_core.execute_full_scraping(credentials, None, progress_callback)
+            async def scrape_function(
+                nim: str, password: str,
+                progress_callback: Optional[Any] = None,
+                course_callback: Optional[Any] = None
+            ) -> str:
+                return await bot_core.execute_full_scraping(
+                    credentials, courses, progress_callback, checkpoint, course_callback
+                )
             
+            # Laporan dikirim per mata kuliah begitu selesai
             await send_result_or_error(
-                update, context, nim, pw, scrape_function, processing_msg
+                update, context, nim, pw, scrape_function, processing_msg, incremental=True
             )
+            await asyncio.to_thread(job_store.finish_job, job_id)
             
         except ValueError as e:
             logger.warning(f"Invalid format from user {user_id}: {e}")
@@ -405,7 +505,101 @@ Setelah deploy ke HTTPS, Mini App akan berfungsi sempurna untuk join forum otoma
             )
         except Exception as e:
             logger.warning(f"Failed to edit message: {e}")
-            await query.message.reply_text(demo_text, parse_mode="Markdown")# Fungsi utama menjalankan bot
+            await query.message.reply_text(demo_text, parse_mode="Markdown")
+
+async def resume_job(application: Application, job) -> None:
+    """Lanjutkan satu job dari checkpoint dan kirim hasilnya ke chat asal"""
+    with job_context(job.job_id):
+        try:
+            if job.credentials is None:
+                # Password tidak tersimpan (JOB_STORE_KEY kosong) - minta kirim ulang
+                await application.bot.send_message(
+                    job.chat_id,
+                    "⚠️ Bot sempat restart dan proses scraping Anda terhenti.\n\n"
+                    "Silakan kirim ulang NIM dan password Anda."
+                )
+                await asyncio.to_thread(job_store.finish_job, job.job_id, JOB_FAILED)
+                return
+            
+            logger.info(f"Resuming job for NIM {job.nim[:4]}**** (attempt {job.attempts})")
+            processing_msg = await application.bot.send_message(
+                job.chat_id,
+                "🔄 *Melanjutkan proses scraping...*\n\n"
+                "Bot sempat restart. Pertemuan yang sudah dicek tidak akan diulang.",
+                parse_mode="Markdown"
+            )
+            checkpoint = await asyncio.to_thread(JobCheckpoint, job_store, job.job_id)
+            
+            async def scrape_function(
+                nim: str, password: str,
+                progress_callback: Optional[Any] = None,
+                course_callback: Optional[Any] = None
+            ) -> str:
+                return await bot_core.execute_full_scraping(
+                    job.credentials, job.courses or None, progress_callback, checkpoint, course_callback
+                )
+            
+            await send_result_or_error(
+                None, None, job.nim, job.credentials.password, scrape_function, processing_msg,
+                incremental=True
+            )
+            await asyncio.to_thread(job_store.finish_job, job.job_id)
+            
+        except Exception as e:
+            logger.error(f"Failed to resume job: {e}")
+            await asyncio.to_thread(job_store.finish_job, job.job_id, JOB_FAILED)
+
+async def start_background_jobs(application: Application) -> None:
+    """Resume job yang terputus dan jalankan scheduler langganan"""
+    await resume_unfinished_jobs(application)
+    
+    async def notify(chat_id: int, text: str):
+        await application.bot.send_message(chat_id, text, parse_mode="Markdown")
+    
+    if opening_predictor is not None:
+        opening_predictor.start()
+    subscription_scheduler.start(notify)
+
+async def stop_background_jobs(application: Application) -> None:
+    """Hentikan scheduler langganan dan predictor saat bot dimatikan"""
+    await subscription_scheduler.stop()
+    if opening_predictor is not None:
+        await opening_predictor.stop()
+
+async def resume_unfinished_jobs(application: Application) -> None:
+    """Jadwalkan ulang job yang terputus oleh restart/crash"""
+    await asyncio.to_thread(job_store.purge)
+    jobs = await asyncio.to_thread(job_store.claim_unfinished)
+    if jobs:
+        logger.info(f"Resuming {len(jobs)} unfinished job(s)")
+    for job in jobs:
+        application.create_task(resume_job(application, job))
+
+def build_application(polling: bool = True) -> Application:
+    """Build Telegram Application dengan semua handler terdaftar"""
+    builder = Application.builder().token(TOKEN)
+    if polling:
+        builder = builder.post_init(start_background_jobs).post_shutdown(stop_background_jobs)
+    else:
+        # Mode webhook: update dimasukkan ke update_queue oleh server ASGI
+        builder = builder.updater(None)
+    app = builder.build()
+    
+    # Add handlers
+    app.add_handler(CommandHandler("start", start))
+    app.add_handler(CommandHandler("help", help_command))
+    app.add_handler(CommandHandler("status", status_command))
+    app.add_handler(CommandHandler("subscribe", subscribe_command))
+    app.add_handler(CommandHandler("unsubscribe", unsubscribe_command))
+    app.add_handler(CallbackQueryHandler(handle_callback_query))
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_credentials))
+    
+    # Add error handler
+    app.add_error_handler(error_handler)
+    
+    return app
+
+# Fungsi utama menjalankan bot
 async def main():
     # Set Windows event loop policy
     if sys.platform.startswith("win") and sys.version_info >= (3, 8):
@@ -417,29 +611,32 @@ async def main():
         print("❌ TELEGRAM_TOKEN tidak ditemukan. Buat file .env dan isi TELEGRAM_TOKEN.")
         return
 
-    # Check internet connection
-    if not is_connected():
+    # Check internet connection, lalu lanjutkan monitoring di background
+    await connectivity_monitor.check_now()
+    if not connectivity_monitor.is_online("telegram"):
         logger.error("Tidak bisa terhubung ke Telegram")
         print("🚫 Tidak bisa terhubung ke Telegram. Periksa koneksi internet.")
         return
+    connectivity_monitor.start()
+
+    # Jalankan scraping di worker process jika dikonfigurasi
+    if env_config.scrape_workers > 0:
+        bot_core.worker_pool = ScrapeWorkerPool(app_settings, env_config.scrape_workers)
+        await bot_core.worker_pool.start()
+
+    # Start metrics/health endpoint jika dikonfigurasi
+    if env_config.metrics_port:
+        metrics_server = MetricsServer(env_config.metrics_port, readiness_probe=bot_core.get_readiness)
+        await metrics_server.start()
+        await bot_core.warm_up()
 
     try:
         # Build application dengan konfigurasi yang benar untuk v22.2
-        app = Application.builder().token(TOKEN).build()
-        
-        # Add handlers
-        app.add_handler(CommandHandler("start", start))
-        app.add_handler(CommandHandler("help", help_command))
-        app.add_handler(CommandHandler("status", status_command))
-        app.add_handler(CallbackQueryHandler(handle_callback_query))
-        app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_credentials))
-        
-        # Add error handler
-        app.add_error_handler(error_handler)
+        app = build_application()
 
         logger.info("Bot Telegram Mentari UNPAM started successfully")
         print("🚀 Bot Telegram Mentari UNPAM aktif...", flush=True)
-        print("📝 Log disimpan di 'bot.log'", flush=True)
+        print(f"📝 Log disimpan di '{os.path.join(app_settings.log_dir, 'bot.log')}'", flush=True)
         print("⏹️  Tekan Ctrl+C untuk menghentikan bot", flush=True)
         
         # Run bot
@@ -449,6 +646,10 @@ async def main():
     except Exception as e:
         logger.error(f"Failed to start bot: {e}")
         print(f"❌ Gagal menjalankan bot: {e}")
+    finally:
+        await connectivity_monitor.stop()
+        if bot_core.worker_pool is not None:
+            await bot_core.worker_pool.stop()
 
 if __name__ == "__main__":
     try:
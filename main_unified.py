@@ -0,0 +1,60 @@
+"""
+Entry point terpadu: bot Telegram (webhook) + server Mini App dalam satu proses
+
+Menggantikan kombinasi long-polling di main.py dan Flask di api/index.py.
+Semua handler berbagi MentariBotCore, cache dan event loop yang sama.
+"""
+
+import logging
+
+import uvicorn
+
+import main as bot_main
+from forum_tracker import mark_forum_completed
+from src.config import env_config
+from src.core.health_monitor import connectivity_monitor
+from src.core.worker_pool import ScrapeWorkerPool
+from src.integrations.miniapp_server import create_unified_app
+
+
+logger = logging.getLogger(__name__)
+
+
+def create_app():
+    """Bangun aplikasi ASGI terpadu"""
+    telegram_app = bot_main.build_application(polling=False)
+
+    async def start_background_services():
+        connectivity_monitor.start()
+        if env_config.scrape_workers > 0:
+            bot_main.bot_core.worker_pool = ScrapeWorkerPool(
+                bot_main.app_settings, env_config.scrape_workers
+            )
+            await bot_main.bot_core.worker_pool.start()
+        await bot_main.bot_core.warm_up()
+        await bot_main.start_background_jobs(telegram_app)
+
+    async def stop_background_services():
+        await connectivity_monitor.stop()
+        await bot_main.subscription_scheduler.stop()
+        if bot_main.opening_predictor is not None:
+            await bot_main.opening_predictor.stop()
+        if bot_main.bot_core.worker_pool is not None:
+            await bot_main.bot_core.worker_pool.stop()
+
+    return create_unified_app(
+        telegram_app,
+        bot_main.bot_core,
+        webhook_url=env_config.webhook_url,
+        webhook_secret=env_config.webhook_secret,
+        completion_recorder=mark_forum_completed,
+        startup_hooks=[start_background_services],
+        shutdown_hooks=[stop_background_services]
+    )
+
+
+if __name__ == "__main__":
+    logger.info(f"Starting unified server on port {env_config.server_port}")
+    print(f"🚀 Bot + Mini App server aktif di port {env_config.server_port}", flush=True)
+    # loop="asyncio": nest_asyncio (di main.py) tidak bisa mem-patch uvloop
+    uvicorn.run(create_app(), host="0.0.0.0", port=env_config.server_port, loop="asyncio")
@@ -20,14 +20,32 @@ class AppSettings:
     pause_on_error: bool = False
     detailed_logging: bool = False
     
+    # Tail-sampled tracing: rekam trace tiap job, simpan hanya job lambat/bermasalah
+    enable_trace_sampling: bool = False
+    trace_latency_threshold: float = 180.0  # detik
+    trace_dir_max_mb: int = 200
+    
+    # Screenshot hanya untuk pertemuan UNKNOWN/ERROR/TIMEOUT (JPEG, terpotong ke section)
+    screenshot_quality: int = 60
+    screenshot_dir_max_mb: int = 100
+    video_dir_max_mb: int = 500
+    artifact_max_age_hours: float = 72.0
+    
     # Performance settings - Optimized for speed
     delay_between_requests: float = 0.8  # Reduced from 1.5
     delay_between_courses: float = 1.0   # Reduced from 2.0
     max_retries: int = 3
+    max_pages_per_context: int = 2
+    # Jumlah pertemuan yang dimuat di depan (1 = sekuensial, tanpa prefetch)
+    pipeline_depth: int = 1
+    # "exhaustive" = cek semua pertemuan, "binary" = cari batas forum terbuka dulu
+    scan_strategy: str = "exhaustive"
+    binary_scan_fallback: bool = True  # cek penuh jika urutan forum tidak monoton
     
     # Paths
     screenshot_dir: str = "screenshots"
     video_dir: str = "recordings"
+    trace_dir: str = "traces"
     log_dir: str = "logs"
     data_dir: str = "data"
     
@@ -85,10 +103,11 @@ class AppSettings:
             enable_video_recording=False,
             pause_on_error=False,
             detailed_logging=False,
+            enable_trace_sampling=True,
+            pipeline_depth=2,
             delay_between_requests=0.6,  # Optimized for speed
             delay_between_courses=0.8,   # Optimized for speed
-            browser_config=BrowserConfig(
-                headless=True,
+            browser_config=BrowserConfig.lean(
                 slow_mo=0,
                 timeout=30000  # Reduced timeout
             )
@@ -146,10 +165,48 @@ class EnvironmentConfig:
         
         # Mentari UNPAM
         self.mentari_base_url = os.getenv('MENTARI_BASE_URL', 'https://mentari.unpam.ac.id')
+        # TTL cache daftar mata kuliah hasil deteksi per NIM (detik)
+        self.enrollment_cache_ttl = float(os.getenv('ENROLLMENT_CACHE_TTL', str(24 * 3600)))
         
         # Optional settings
         self.log_level = os.getenv('LOG_LEVEL', 'INFO')
+        self.log_max_bytes = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+        self.log_backup_count = int(os.getenv('LOG_BACKUP_COUNT', '5'))
         self.max_concurrent_sessions = int(os.getenv('MAX_CONCURRENT_SESSIONS', '1'))
+        # Navigasi halaman Mentari paralel maksimal (semua job di satu proses)
+        self.max_concurrent_loads_per_host = int(os.getenv('MAX_CONCURRENT_LOADS_PER_HOST', '4'))
+        
+        # Monitoring (0 = metrics/health endpoint nonaktif)
+        self.metrics_port = int(os.getenv('METRICS_PORT', '0'))
+        self.health_check_interval = float(os.getenv('HEALTH_CHECK_INTERVAL', '60'))
+        
+        # Jumlah worker process scraping (0 = scraping di proses bot)
+        self.scrape_workers = int(os.getenv('SCRAPE_WORKERS', '0'))
+        
+        # Browser server bersama (playwright run-server); kosong = launch lokal
+        self.playwright_ws_endpoint = os.getenv('PLAYWRIGHT_WS_ENDPOINT')
+        self.browser_max_contexts = int(os.getenv('BROWSER_MAX_CONTEXTS', '4'))
+        
+        # Job store persisten (resume job setelah restart)
+        self.job_store_path = os.getenv('JOB_STORE_PATH', 'data/bot.db')
+        # Fernet key untuk enkripsi password job; kosong = job tidak di-resume otomatis
+        self.job_store_key = os.getenv('JOB_STORE_KEY')
+        
+        # Mode /subscribe: interval scan berkala (detik) dan jumlah scan paralel
+        self.subscription_interval = float(os.getenv('SUBSCRIPTION_INTERVAL', str(6 * 3600)))
+        self.subscription_parallel = int(os.getenv('SUBSCRIPTION_PARALLEL', '1'))
+        
+        # Indeks ketersediaan forum bersama: umur maksimal observasi UNAVAILABLE
+        # yang dipakai untuk melewati pertemuan (detik); 0 = nonaktif
+        self.availability_ttl = float(os.getenv('AVAILABILITY_TTL', '600'))
+        
+        # Riwayat status per scan (kolumnar); kosong = tidak disimpan
+        self.history_dir = os.getenv('HISTORY_DIR', 'data/history')
+        
+        # Unified server (main_unified.py)
+        self.server_port = int(os.getenv('PORT', '5000'))
+        self.webhook_url = os.getenv('WEBHOOK_URL')
+        self.webhook_secret = os.getenv('WEBHOOK_SECRET')
 
 
 class ConfigManager:
@@ -203,6 +260,7 @@ class ConfigManager:
             'delay_requests': self.config.delay_between_requests,
             'delay_courses': self.config.delay_between_courses,
             'screenshots': self.config.enable_screenshots,
+            'trace_sampling': self.config.enable_trace_sampling,
             'debug': self.config.debug_mode,
             'pause_on_error': self.config.pause_on_error
         }
@@ -217,9 +275,20 @@ class ConfigManager:
             'enable_video_recording': self.config.enable_video_recording,
             'pause_on_error': self.config.pause_on_error,
             'detailed_logging': self.config.detailed_logging,
+            'enable_trace_sampling': self.config.enable_trace_sampling,
+            'trace_latency_threshold': self.config.trace_latency_threshold,
+            'trace_dir_max_mb': self.config.trace_dir_max_mb,
+            'screenshot_quality': self.config.screenshot_quality,
+            'screenshot_dir_max_mb': self.config.screenshot_dir_max_mb,
+            'video_dir_max_mb': self.config.video_dir_max_mb,
+            'artifact_max_age_hours': self.config.artifact_max_age_hours,
             'delay_between_requests': self.config.delay_between_requests,
             'delay_between_courses': self.config.delay_between_courses,
             'max_retries': self.config.max_retries,
+            'max_pages_per_context': self.config.max_pages_per_context,
+            'pipeline_depth': self.config.pipeline_depth,
+            'scan_strategy': self.config.scan_strategy,
+            'binary_scan_fallback': self.config.binary_scan_fallback,
         }
         
         # Apply overrides
@@ -3,21 +3,40 @@ Core application service untuk Bot Mentari UNPAM
 """
 
 import asyncio
+import json
 import logging
 import time
+from contextlib import asynccontextmanager
 from typing import Optional, Callable, List
 from playwright.async_api import async_playwright
 
-from src.models import LoginCredentials, CourseInfo, ScrapingResult
-from src.config import app_settings, course_config
+from src.models import (
+    LoginCredentials, CourseInfo, CourseResult, ScrapingResult, ForumTarget, ParticipationResult
+)
+from src.config import app_settings, course_config, env_config
 from src.services.auth_service import MentariLoginService
 from src.services.forum_scraper import ForumScraperService
+from src.services.availability_index import availability_index
 from src.services.result_formatter import ResultFormatterService
+from src.services.enrollment_service import EnrollmentService
+from src.services.participation_service import ForumParticipationService
+from src.services.trace_sampler import TraceSampler
+from src.services.artifact_store import sweep_artifacts
+from src.core.single_flight import SingleFlight, credentials_key
+from src.core.memory_probe import MemorySampler
+from src.core.metrics import (
+    time_phase, PHASE_DURATION, JOBS_TOTAL, JOBS_IN_FLIGHT, BROWSER_WARM,
+    CONTEXT_RSS_BYTES, JOB_PEAK_RSS_BYTES
+)
 
 
 logger = logging.getLogger(__name__)
 
 
+class LoginFailedError(Exception):
+    """Login ke Mentari gagal setelah semua percobaan"""
+
+
 class MentariBotCore:
     """Core service untuk Bot Mentari UNPAM"""
     
@@ -26,12 +45,130 @@ class MentariBotCore:
         self.auth_service = MentariLoginService(settings)
         self.scraper_service = ForumScraperService(settings)
         self.formatter_service = ResultFormatterService()
+        self.enrollment_service = EnrollmentService(settings)
+        self.participation_service = ForumParticipationService(settings, self.scraper_service)
+        self.active_jobs = 0
+        self.browser_warm = False
+        self.last_browser_error: Optional[str] = None
+        # Pool worker process (opsional); None = scraping di proses ini
+        self.worker_pool = None
+        # Registry job in-flight per akun (single-flight)
+        self.in_flight = SingleFlight()
+        # Riwayat status per scan (HistoryStore, opsional)
+        self.history_store = None
+        self._playwright = None
+        self._persistent_browser = None
+        # Koneksi ke browser server bersama (PLAYWRIGHT_WS_ENDPOINT)
+        self._remote_browser = None
+        self._remote_lock = asyncio.Lock()
+        self._context_slots = asyncio.Semaphore(max(1, env_config.browser_max_contexts))
+    
+    def get_readiness(self) -> dict:
+        """
+        Status readiness untuk health endpoint: browser warm dan kedalaman antrian
+        
+        Dengan worker pool, browser hidup di worker process: siap jika ada
+        worker dengan browser warm, antrian dihitung dari job yang menunggu.
+        """
+        max_sessions = env_config.max_concurrent_sessions
+        if self.worker_pool is not None:
+            workers = self.worker_pool.readiness()
+            return {
+                'ready': (
+                    workers['running'] and workers['workers_warm'] > 0
+                    and workers['pending_jobs'] < workers['workers'] * 4
+                ),
+                'browser_warm': workers['workers_warm'] > 0,
+                'last_browser_error': workers['last_browser_error'],
+                'queue_depth': workers['pending_jobs'],
+                'max_concurrent_sessions': max_sessions,
+                'workers': workers
+            }
+        return {
+            'ready': self.browser_warm and self.active_jobs < max_sessions * 4,
+            'browser_warm': self.browser_warm,
+            'last_browser_error': self.last_browser_error,
+            'queue_depth': self.active_jobs,
+            'max_concurrent_sessions': max_sessions
+        }
+    
+    async def warm_up(self) -> bool:
+        """Launch dan tutup browser sekali untuk memastikan Chromium siap dipakai"""
+        if self.worker_pool is not None:
+            # Browser dipanaskan dan dilaporkan oleh worker process
+            return True
+        try:
+            async with async_playwright() as p:
+                browser = await self._launch_browser(p)
+                await browser.close()
+            return True
+        except Exception as e:
+            logger.warning(f"Browser warm-up failed: {e}")
+            return False
+    
+    async def start_persistent_browser(self):
+        """Launch browser yang tetap hidup antar job (dipakai worker process)"""
+        if self._persistent_browser is not None and self._persistent_browser.is_connected():
+            return
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._persistent_browser = await self._launch_browser(self._playwright)
+    
+    async def stop_persistent_browser(self):
+        """Tutup browser persistent dan driver Playwright"""
+        for browser in (self._persistent_browser, self._remote_browser):
+            if browser is None:
+                continue
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing persistent browser: {e}")
+        self._persistent_browser = None
+        self._remote_browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+    
+    async def _get_remote_browser(self):
+        """Koneksi ke browser server yang dipakai ulang; reconnect jika terputus"""
+        async with self._remote_lock:
+            if self._remote_browser is not None and self._remote_browser.is_connected():
+                return self._remote_browser
+            
+            if self._remote_browser is not None:
+                logger.warning("Connection to browser server lost, reconnecting")
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._remote_browser = await self._launch_browser(self._playwright)
+            return self._remote_browser
+    
+    @asynccontextmanager
+    async def _browser_session(self):
+        """Yield browser: pakai browser server / browser persistent jika ada, selain itu launch baru per job"""
+        if env_config.playwright_ws_endpoint:
+            # Batasi jumlah context yang dibuka client ini di browser server bersama
+            async with self._context_slots:
+                yield await self._get_remote_browser()
+            return
+        
+        if self._persistent_browser is not None and self._persistent_browser.is_connected():
+            yield self._persistent_browser
+            return
+        
+        async with async_playwright() as p:
+            browser = await self._launch_browser(p)
+            try:
+                yield browser
+            finally:
+                await browser.close()
     
     async def execute_full_scraping(
         self,
         credentials: LoginCredentials,
         courses: Optional[List[CourseInfo]] = None,
-        progress_callback: Optional[Callable[[str], None]] = None
+        progress_callback: Optional[Callable[[str], None]] = None,
+        checkpoint=None,
+        course_callback: Optional[Callable[[CourseResult], None]] = None
     ) -> str:
         """
         Execute full scraping process: login + scrape all courses
@@ -40,87 +177,286 @@ class MentariBotCore:
             credentials: Login credentials
             courses: List of courses to scrape (default: all configured courses)
             progress_callback: Callback for progress updates
+            checkpoint: JobCheckpoint untuk menyimpan/melanjutkan hasil per pertemuan
+            course_callback: Callback untuk setiap CourseResult yang selesai
             
         Returns:
             str: Formatted result message
         """
         
+        try:
+            scraping_result = await self.collect_result(
+                credentials, courses, progress_callback, checkpoint, course_callback
+            )
+        except LoginFailedError:
+            return "❌ Login gagal. Periksa NIM dan password Anda."
+        except Exception as e:
+            logger.error(f"Error during full scraping: {e}")
+            return f"❌ Terjadi kesalahan saat scraping: {str(e)}"
+        
+        # Format results
+        if progress_callback:
+            await progress_callback("📝 Menyusun laporan...")
+        
+        with time_phase("formatting"):
+            return self.formatter_service.format_scraping_result(scraping_result)
+    
+    async def collect_result(
+        self,
+        credentials: LoginCredentials,
+        courses: Optional[List[CourseInfo]] = None,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        checkpoint=None,
+        course_callback: Optional[Callable[[CourseResult], None]] = None
+    ) -> ScrapingResult:
+        """
+        ScrapingResult mentah, lewat worker pool jika terpasang
+        
+        Permintaan duplikat untuk akun + daftar mata kuliah yang sama (dari
+        /check maupun scan langganan) menumpang job yang sedang berjalan.
+        
+        Raises:
+            LoginFailedError: Jika login gagal setelah semua percobaan
+        """
+        scope = ";".join(f"{c.code}:{c.meetings}" for c in courses) if courses else "default"
+        key = credentials_key(credentials.nim, credentials.password, scope)
+        
+        return await self.in_flight.run(
+            key,
+            lambda progress, on_course: self._collect_result(
+                credentials, courses, progress, checkpoint, on_course
+            ),
+            progress_callback,
+            course_callback
+        )
+    
+    async def _collect_result(
+        self,
+        credentials: LoginCredentials,
+        courses: Optional[List[CourseInfo]],
+        progress_callback: Optional[Callable[[str], None]],
+        checkpoint,
+        course_callback: Optional[Callable[[CourseResult], None]]
+    ) -> ScrapingResult:
+        """Scraping di proses ini atau worker, lalu catat ke riwayat"""
+        if self.worker_pool is not None:
+            result = await self.worker_pool.submit(
+                credentials, courses, progress_callback, checkpoint, course_callback
+            )
+            # Worker mengisi indeksnya sendiri; indeks proses ini dari hasil akhir
+            availability_index.observe_result(result)
+        else:
+            result = await self.scrape(credentials, courses, progress_callback, checkpoint, course_callback)
+        
+        if self.history_store is not None:
+            try:
+                await asyncio.to_thread(self.history_store.record, credentials.nim, result)
+            except Exception as e:
+                logger.warning(f"Failed to record scan history: {e}")
+        
+        return result
+    
+    async def scrape(
+        self,
+        credentials: LoginCredentials,
+        courses: Optional[List[CourseInfo]] = None,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        checkpoint=None,
+        course_callback: Optional[Callable[[CourseResult], None]] = None
+    ) -> ScrapingResult:
+        """
+        Login + scrape semua mata kuliah tanpa formatting
+        
+        Raises:
+            LoginFailedError: Jika login gagal setelah semua percobaan
+        """
+        
         start_time = time.time()
         
-        if not courses:
-            courses = course_config.get_default_courses()
+        # Tanpa daftar eksplisit: deteksi mata kuliah dari dashboard setelah login
+        discover_courses = not courses
         
-        logger.info(f"Starting full scraping for {len(courses)} courses")
+        logger.info("Starting full scraping")
         
         if progress_callback:
             await progress_callback("🚀 Memulai proses scraping...")
         
-        async with async_playwright() as p:
-            # Launch browser
-            browser = await self._launch_browser(p)
-            
-            try:
-                # Create browser context with proper video recording setup
-                context_options = {
-                    'viewport': {
-                        'width': self.settings.browser_config.viewport_width,
-                        'height': self.settings.browser_config.viewport_height
-                    },
-                    'user_agent': self.settings.browser_config.user_agent
-                }
-                
-                # Add video recording if enabled and not headless
-                if self.settings.enable_video_recording and not self.settings.browser_config.headless:
-                    import os
-                    os.makedirs(self.settings.video_dir, exist_ok=True)
-                    context_options['record_video_dir'] = self.settings.video_dir
-                    context_options['record_video_size'] = {
-                        'width': self.settings.browser_config.viewport_width,
-                        'height': self.settings.browser_config.viewport_height
-                    }
-                
-                context = await browser.new_context(**context_options)
-                
-                # Step 1: Login with retry
-                if progress_callback:
-                    await progress_callback("🔐 Melakukan login...")
-                
-                login_success = await self.auth_service.login_with_retry(
-                    context, credentials, progress_callback
-                )
-                
-                if not login_success:
-                    error_msg = "❌ Login gagal. Periksa NIM dan password Anda."
-                    logger.error("Login failed")
-                    return error_msg
-                
-                # Step 2: Scrape forums
-                if progress_callback:
-                    await progress_callback("📊 Mengecek status forum...")
-                
-                scraping_result = await self.scraper_service.scrape_all_courses(
-                    context, courses, progress_callback
-                )
-                
-                # Step 3: Format results
-                if progress_callback:
-                    await progress_callback("📝 Menyusun laporan...")
-                
-                formatted_result = self.formatter_service.format_scraping_result(
-                    scraping_result
-                )
-                
-                execution_time = time.time() - start_time
-                logger.info(f"Full scraping completed in {execution_time:.2f} seconds")
-                
-                return formatted_result
-                
-            except Exception as e:
-                logger.error(f"Error during full scraping: {e}")
-                return f"❌ Terjadi kesalahan saat scraping: {str(e)}"
-                
-            finally:
-                await browser.close()
+        self.active_jobs += 1
+        JOBS_IN_FLIGHT.inc()
+        job_outcome = "error"
+        context = None
+        scraping_result = None
+        tracer = TraceSampler(self.settings)
+        # RSS proses browser lokal; tidak berarti jika memakai browser server bersama
+        memory = MemorySampler(enabled=not env_config.playwright_ws_endpoint)
+        
+        try:
+            async with self._browser_session() as browser, memory:
+                try:
+                    # Create browser context with proper video recording setup
+                    with time_phase("context_creation"):
+                        context = await browser.new_context(**self._build_context_options())
+                    
+                    # Step 1: Login with retry
+                    if progress_callback:
+                        await progress_callback("🔐 Melakukan login...")
+                    
+                    with time_phase("login") as phase:
+                        login_success = await self.auth_service.login_with_retry(
+                            context, credentials, progress_callback
+                        )
+                        phase.outcome = "ok" if login_success else "failed"
+                    
+                    if not login_success:
+                        logger.error("Login failed")
+                        job_outcome = "login_failed"
+                        raise LoginFailedError("Login gagal")
+                    
+                    # Trace dimulai setelah login: snapshot form login berisi NIM dan password
+                    await tracer.start(context)
+                    
+                    if discover_courses:
+                        if progress_callback:
+                            await progress_callback("📋 Mendeteksi mata kuliah Anda...")
+                        courses = await self.enrollment_service.discover(context, credentials.nim)
+                        if not courses:
+                            logger.info("Enrollment not detected, using configured courses")
+                            courses = course_config.get_default_courses()
+                    
+                    # Step 2: Scrape forums
+                    if progress_callback:
+                        await progress_callback("📊 Mengecek status forum...")
+                    
+                    with time_phase("scraping"):
+                        scraping_result = await self.scraper_service.scrape_all_courses(
+                            context, courses, progress_callback, checkpoint, course_callback
+                        )
+                    
+                    execution_time = time.time() - start_time
+                    logger.info(f"Full scraping completed in {execution_time:.2f} seconds")
+                    job_outcome = "ok"
+                    
+                    return scraping_result
+                    
+                finally:
+                    if context is not None:
+                        await tracer.finish(
+                            context, time.time() - start_time, scraping_result, job_outcome
+                        )
+                        await context.close()
+                    
+                    if self.settings.enable_screenshots or self.settings.enable_video_recording:
+                        await asyncio.to_thread(sweep_artifacts, self.settings)
+        finally:
+            self.active_jobs -= 1
+            JOBS_IN_FLIGHT.dec()
+            JOBS_TOTAL.inc(outcome=job_outcome)
+            PHASE_DURATION.observe(time.time() - start_time, phase="job", outcome=job_outcome)
+            self._record_memory(memory)
+    
+    async def run_forum_actions(
+        self,
+        credentials: LoginCredentials,
+        targets: List[ForumTarget],
+        action: str,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        result_callback: Optional[Callable[[ParticipationResult], None]] = None
+    ) -> List[ParticipationResult]:
+        """
+        Login sekali lalu join/verifikasi semua forum secara paralel
+        
+        Permintaan duplikat (akun, aksi dan daftar forum sama) menumpang
+        batch yang sedang berjalan.
+        
+        Args:
+            action: "join" atau "verify"
+            result_callback: Dipanggil dengan hasil setiap forum begitu selesai
+        
+        Raises:
+            LoginFailedError: Jika login gagal setelah semua percobaan
+        """
+        scope = f"{action}:" + ";".join(f"{t.course_code}:{t.meeting_number}" for t in targets)
+        key = credentials_key(credentials.nim, credentials.password, scope)
+        
+        return await self.in_flight.run(
+            key,
+            lambda progress, on_result: self._run_forum_actions(
+                credentials, targets, action, progress, on_result
+            ),
+            progress_callback,
+            result_callback
+        )
+    
+    async def _run_forum_actions(
+        self,
+        credentials: LoginCredentials,
+        targets: List[ForumTarget],
+        action: str,
+        progress_callback: Optional[Callable[[str], None]],
+        result_callback: Optional[Callable[[ParticipationResult], None]]
+    ) -> List[ParticipationResult]:
+        self.active_jobs += 1
+        JOBS_IN_FLIGHT.inc()
+        try:
+            async with self._browser_session() as browser:
+                with time_phase("context_creation"):
+                    context = await browser.new_context(**self._build_context_options())
+                try:
+                    if progress_callback:
+                        await progress_callback("🔐 Melakukan login...")
+                    
+                    with time_phase("login") as phase:
+                        login_success = await self.auth_service.login_with_retry(
+                            context, credentials, progress_callback
+                        )
+                        phase.outcome = "ok" if login_success else "failed"
+                    if not login_success:
+                        raise LoginFailedError("Login gagal")
+                    
+                    return await self.participation_service.run_batch(
+                        context, targets, action, progress_callback, result_callback
+                    )
+                finally:
+                    await context.close()
+        finally:
+            self.active_jobs -= 1
+            JOBS_IN_FLIGHT.dec()
+    
+    def _record_memory(self, memory: MemorySampler):
+        """Catat biaya memori context dan puncak RSS job ini"""
+        if not memory.supported or memory.peak is None:
+            return
+        
+        # Dengan beberapa job paralel di proses yang sama, delta adalah perkiraan atas
+        CONTEXT_RSS_BYTES.observe(memory.delta)
+        JOB_PEAK_RSS_BYTES.observe(memory.peak)
+        logger.info(
+            f"Browser memory: context +{memory.delta / 1048576:.0f} MB, "
+            f"peak {memory.peak / 1048576:.0f} MB"
+        )
+    
+    def _build_context_options(self) -> dict:
+        """Opsi untuk browser.new_context sesuai settings"""
+        
+        context_options = {
+            'viewport': {
+                'width': self.settings.browser_config.viewport_width,
+                'height': self.settings.browser_config.viewport_height
+            },
+            'user_agent': self.settings.browser_config.user_agent
+        }
+        
+        # Add video recording if enabled and not headless
+        if self.settings.enable_video_recording and not self.settings.browser_config.headless:
+            import os
+            os.makedirs(self.settings.video_dir, exist_ok=True)
+            context_options['record_video_dir'] = self.settings.video_dir
+            context_options['record_video_size'] = {
+                'width': self.settings.browser_config.viewport_width,
+                'height': self.settings.browser_config.viewport_height
+            }
+        
+        return context_options
     
     async def execute_quick_check(
         self,
@@ -171,38 +507,25 @@ class MentariBotCore:
         
         logger.info("Testing login only")
         
-        async with async_playwright() as p:
-            browser = await self._launch_browser(p)
-            
-            try:
-                # Create browser context for login test
-                context_options = {
-                    'viewport': {
-                        'width': self.settings.browser_config.viewport_width, 
-                        'height': self.settings.browser_config.viewport_height
-                    },
-                    'user_agent': self.settings.browser_config.user_agent
-                }
-                
-                context = await browser.new_context(**context_options)
-                
-                login_success = await self.auth_service.login_with_retry(
-                    context, credentials, progress_callback
-                )
-                
-                if login_success:
-                    logger.info("Login test successful")
-                else:
-                    logger.error("Login test failed")
-                
-                return login_success
-                
-            except Exception as e:
-                logger.error(f"Error during login test: {e}")
-                return False
-                
-            finally:
-                await browser.close()
+        try:
+            async with self._browser_session() as browser:
+                context = await browser.new_context(**self._build_context_options())
+                try:
+                    login_success = await self.auth_service.login_with_retry(
+                        context, credentials, progress_callback
+                    )
+                finally:
+                    await context.close()
+        except Exception as e:
+            logger.error(f"Error during login test: {e}")
+            return False
+        
+        if login_success:
+            logger.info("Login test successful")
+        else:
+            logger.error("Login test failed")
+        
+        return login_success
     
     async def _launch_browser(self, playwright):
         """Launch browser dengan konfigurasi yang tepat"""
@@ -218,20 +541,75 @@ class MentariBotCore:
         # Video recording is configured per context, not browser launch
         # We'll handle this when creating the browser context
         
+        if env_config.playwright_ws_endpoint:
+            return await self._connect_browser_server(
+                playwright, env_config.playwright_ws_endpoint, launch_options
+            )
+        
         logger.debug(f"Launching browser with options: {launch_options}")
         
         try:
-            browser = await playwright.chromium.launch(**launch_options)
+            with time_phase("browser_launch"):
+                browser = await playwright.chromium.launch(**launch_options)
+            self.browser_warm = True
+            self.last_browser_error = None
+            BROWSER_WARM.set(1)
             return browser
         except Exception as e:
             logger.error(f"Failed to launch browser: {e}")
+            self.browser_warm = False
+            self.last_browser_error = str(e)[:200]
+            BROWSER_WARM.set(0)
             raise Exception(f"Gagal meluncurkan browser: {e}")
     
+    async def _connect_browser_server(self, playwright, ws_endpoint: str, launch_options: dict, attempts: int = 3):
+        """
+        Connect ke browser server (playwright run-server) dengan retry
+        
+        headless dan args (termasuk profil lean) dikirim lewat header
+        x-playwright-launch-options; run-server memakainya saat meluncurkan
+        browser untuk koneksi ini. slow_mo berlaku di sisi client.
+        """
+        
+        headers = {
+            'x-playwright-launch-options': json.dumps({
+                'headless': launch_options['headless'],
+                'args': list(launch_options['args'])
+            })
+        }
+        
+        last_error = None
+        for attempt in range(1, attempts + 1):
+            try:
+                with time_phase("browser_connect"):
+                    browser = await playwright.chromium.connect(
+                        ws_endpoint,
+                        timeout=15000,
+                        slow_mo=launch_options['slow_mo'],
+                        headers=headers
+                    )
+                self.browser_warm = True
+                self.last_browser_error = None
+                BROWSER_WARM.set(1)
+                logger.info(f"Connected to browser server {ws_endpoint}")
+                return browser
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Browser server connect attempt {attempt}/{attempts} failed: {e}")
+                if attempt < attempts:
+                    await asyncio.sleep(2 ** attempt)
+        
+        self.browser_warm = False
+        self.last_browser_error = str(last_error)[:200]
+        BROWSER_WARM.set(0)
+        raise Exception(f"Gagal terhubung ke browser server: {last_error}")
+    
     def update_settings(self, new_settings):
         """Update application settings"""
         self.settings = new_settings
         self.auth_service.settings = new_settings
         self.scraper_service.settings = new_settings
+        self.participation_service.settings = new_settings
         
         logger.info("Application settings updated")
 
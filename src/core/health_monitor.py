@@ -0,0 +1,162 @@
+"""
+Background connectivity monitor untuk Telegram dan Mentari UNPAM
+
+Probe dijalankan secara async di task terpisah; handler seperti /status
+hanya membaca state yang sudah di-cache sehingga tidak pernah memblokir
+event loop.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+import httpx
+
+from src.config import env_config
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProbeResult:
+    """Hasil satu probe konektivitas"""
+    name: str
+    reachable: bool
+    latency_ms: Optional[float]
+    checked_at: float
+    error: Optional[str] = None
+
+
+class ConnectivityMonitor:
+    """Monitor reachability Telegram dan Mentari secara periodik"""
+
+    def __init__(
+        self,
+        mentari_url: str,
+        telegram_host: str = "api.telegram.org",
+        interval: float = 60.0,
+        timeout: float = 5.0,
+        history_size: int = 50
+    ):
+        self.mentari_url = mentari_url
+        self.telegram_host = telegram_host
+        self.interval = interval
+        self.timeout = timeout
+        self.results: Dict[str, ProbeResult] = {}
+        # Durasi page load Mentari terbaru yang diukur scraper (detik)
+        self._mentari_latencies: Deque[float] = deque(maxlen=history_size)
+        self._task: Optional[asyncio.Task] = None
+
+    async def check_now(self) -> Dict[str, ProbeResult]:
+        """Jalankan semua probe sekarang dan update cache"""
+        telegram, mentari = await asyncio.gather(
+            self._probe_tcp("telegram", self.telegram_host, 443),
+            self._probe_http("mentari", self.mentari_url)
+        )
+        self.results["telegram"] = telegram
+        self.results["mentari"] = mentari
+        return self.results
+
+    async def _probe_tcp(self, name: str, host: str, port: int) -> ProbeResult:
+        started = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), timeout=self.timeout
+            )
+            latency = (time.perf_counter() - started) * 1000
+            writer.close()
+            return ProbeResult(name, True, latency, time.time())
+        except Exception as e:
+            return ProbeResult(name, False, None, time.time(), str(e)[:100] or type(e).__name__)
+
+    async def _probe_http(self, name: str, url: str) -> ProbeResult:
+        started = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
+                response = await client.head(url)
+            latency = (time.perf_counter() - started) * 1000
+            reachable = response.status_code < 500
+            error = None if reachable else f"HTTP {response.status_code}"
+            return ProbeResult(name, reachable, latency, time.time(), error)
+        except Exception as e:
+            return ProbeResult(name, False, None, time.time(), str(e)[:100] or type(e).__name__)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.check_now()
+            except Exception as e:
+                logger.warning(f"Connectivity check failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Mulai background task monitor"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def is_online(self, name: str = "telegram") -> Optional[bool]:
+        """Status terakhir yang di-cache; None jika belum pernah dicek"""
+        result = self.results.get(name)
+        return result.reachable if result else None
+
+    def record_mentari_latency(self, seconds: float):
+        """Catat durasi page load Mentari dari scraper"""
+        self._mentari_latencies.append(seconds)
+
+    def mentari_latency_summary(self) -> Optional[Dict[str, float]]:
+        """Ringkasan response time Mentari terbaru (detik)"""
+        if not self._mentari_latencies:
+            return None
+        samples = sorted(self._mentari_latencies)
+        p95_index = min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))
+        return {
+            'count': len(samples),
+            'avg': sum(samples) / len(samples),
+            'p95': samples[p95_index],
+            'last': self._mentari_latencies[-1],
+        }
+
+    def format_status(self) -> str:
+        """Format status konektivitas untuk pesan /status"""
+        lines = []
+        labels = {"telegram": "Telegram", "mentari": "Mentari"}
+
+        for name, label in labels.items():
+            result = self.results.get(name)
+            if result is None:
+                lines.append(f"🌐 {label}: ⏳ Belum dicek")
+                continue
+            age = int(time.time() - result.checked_at)
+            if result.reachable:
+                lines.append(f"🌐 {label}: ✅ Online ({result.latency_ms:.0f} ms, {age}s lalu)")
+            else:
+                lines.append(f"🌐 {label}: ❌ Offline ({age}s lalu)")
+
+        summary = self.mentari_latency_summary()
+        if summary:
+            lines.append(
+                f"⏱️ Page load Mentari: rata-rata {summary['avg']:.1f}s, "
+                f"p95 {summary['p95']:.1f}s ({summary['count']} sampel)"
+            )
+
+        return "\n".join(lines)
+
+
+# Global monitor instance
+connectivity_monitor = ConnectivityMonitor(
+    env_config.mentari_base_url,
+    interval=env_config.health_check_interval
+)
@@ -0,0 +1,137 @@
+"""
+Setup logging untuk Bot Mentari UNPAM
+
+Semua record dikirim lewat QueueHandler sehingga thread event loop hanya
+melakukan enqueue; penulisan ke file (JSON, dengan rotasi ukuran) dan console
+dilakukan QueueListener di thread terpisah. Setiap record membawa job_id
+dari context job yang sedang berjalan.
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+
+# Correlation id untuk job yang sedang berjalan (per asyncio task)
+current_job_id: contextvars.ContextVar[str] = contextvars.ContextVar("job_id", default="-")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def new_job_id() -> str:
+    """Buat correlation id baru dan set sebagai job aktif di context ini"""
+    job_id = uuid.uuid4().hex[:12]
+    current_job_id.set(job_id)
+    return job_id
+
+
+@contextmanager
+def job_context(job_id: str) -> Iterator[str]:
+    """Jalankan block dengan job_id tertentu sebagai correlation id"""
+    token = current_job_id.set(job_id)
+    try:
+        yield job_id
+    finally:
+        current_job_id.reset(token)
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Tempelkan job_id ke record di thread pemanggil (sebelum masuk queue)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.job_id = current_job_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatter yang menghasilkan satu objek JSON per baris"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "job_id": getattr(record, "job_id", "-"),
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_dir: str = "logs",
+    filename: str = "bot.log",
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5
+) -> logging.handlers.QueueListener:
+    """
+    Konfigurasi root logger dengan pipeline QueueHandler -> QueueListener
+
+    Args:
+        level: Level logging (DEBUG, INFO, ...)
+        log_dir: Directory untuk file log
+        filename: Nama file log
+        max_bytes: Ukuran maksimal file sebelum dirotasi
+        backup_count: Jumlah file rotasi yang disimpan
+
+    Returns:
+        QueueListener yang sedang berjalan
+    """
+    global _listener
+
+    if _listener is not None:
+        return _listener
+
+    os.makedirs(log_dir, exist_ok=True)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(log_dir, filename),
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8"
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - [%(job_id)s] %(message)s"
+    ))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(CorrelationIdFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    return _listener
+
+
+def shutdown_logging():
+    """Flush dan hentikan QueueListener"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
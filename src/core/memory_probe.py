@@ -0,0 +1,131 @@
+"""
+Pengukuran memori proses browser (Linux /proc)
+
+Playwright tidak mengekspos PID Chromium, jadi yang diukur adalah total RSS
+dari seluruh proses turunan proses bot (driver Node + semua proses Chromium).
+Di platform tanpa /proc semua fungsi mengembalikan None.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_PROC = "/proc"
+
+
+def _read_rss_bytes(pid: int) -> int:
+    with open(f"{_PROC}/{pid}/status", "r") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def _children_map() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir(_PROC):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"{_PROC}/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Nama proses (field 2) bisa berisi spasi; ppid ada setelah ')'
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_tree_rss(root_pid: Optional[int] = None, include_root: bool = False) -> Optional[int]:
+    """
+    Total RSS (bytes) semua proses turunan root_pid
+
+    Args:
+        root_pid: PID root (default: proses ini)
+        include_root: Ikutkan RSS proses root sendiri
+    """
+    if not os.path.isdir(_PROC):
+        return None
+
+    root_pid = root_pid or os.getpid()
+    try:
+        children = _children_map()
+    except OSError:
+        return None
+
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        if pid != root_pid or include_root:
+            try:
+                total += _read_rss_bytes(pid)
+            except (OSError, ValueError):
+                # Proses sudah keluar di tengah pengukuran
+                pass
+        stack.extend(children.get(pid, ()))
+    return total
+
+
+class MemorySampler:
+    """
+    Sampling RSS browser selama satu job
+
+    baseline diambil saat masuk, peak di-update tiap interval di thread
+    terpisah (membaca /proc bisa lambat jika banyak proses).
+    """
+
+    def __init__(self, interval: float = 1.0, enabled: bool = True):
+        self.interval = interval
+        self.enabled = enabled
+        self.baseline: Optional[int] = None
+        self.peak: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def supported(self) -> bool:
+        return self.baseline is not None
+
+    @property
+    def delta(self) -> Optional[int]:
+        """Kenaikan RSS tertinggi di atas baseline (biaya context job ini)"""
+        if self.baseline is None or self.peak is None:
+            return None
+        return max(0, self.peak - self.baseline)
+
+    async def _sample(self):
+        rss = await asyncio.to_thread(process_tree_rss)
+        if rss is not None:
+            self.peak = rss if self.peak is None else max(self.peak, rss)
+        return rss
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._sample()
+            except Exception as e:
+                logger.debug(f"Memory sample failed: {e}")
+
+    async def __aenter__(self) -> "MemorySampler":
+        if not self.enabled:
+            return self
+        self.baseline = await self._sample()
+        if self.baseline is not None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self._sample()
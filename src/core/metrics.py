@@ -0,0 +1,372 @@
+"""
+Metrics in-process untuk Bot Mentari UNPAM
+
+Registry sederhana (counter, gauge, histogram) dengan format exposition
+Prometheus, plus HTTP server kecil untuk endpoint /metrics dan /health.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bucket dalam detik - dari navigasi cepat sampai solve CAPTCHA 2 menit
+DEFAULT_BUCKETS = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0
+)
+
+
+def _format_labels(label_names: Tuple[str, ...], label_values: Tuple[str, ...], extra: str = "") -> str:
+    """Format label set menjadi `{a="x",b="y"}`"""
+    pairs = []
+    for name, value in zip(label_names, label_values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Base class untuk semua metric"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.label_names}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Counter yang hanya bisa naik"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {value}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Gauge yang bisa naik dan turun"""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {value}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Histogram kumulatif dengan bucket tetap"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [0.0] * (len(self.buckets) + 2)
+                self._series[key] = series
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[idx] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[-2]) if series else 0
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+
+        lines = []
+        for key, series in items:
+            for idx, bound in enumerate(self.buckets):
+                labels = _format_labels(self.label_names, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {series[idx]}")
+            labels = _format_labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-2]}")
+            plain = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_count{plain} {series[-2]}")
+            lines.append(f"{self.name}_sum{plain} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registry untuk semua metric aplikasi"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        """Render semua metric dalam Prometheus text format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+registry = MetricsRegistry()
+
+PHASE_DURATION = registry.histogram(
+    "mentari_phase_duration_seconds",
+    "Durasi tiap fase scraping",
+    labels=("phase", "outcome")
+)
+JOBS_TOTAL = registry.counter(
+    "mentari_jobs_total",
+    "Jumlah job scraping berdasarkan hasil",
+    labels=("outcome",)
+)
+MEETINGS_TOTAL = registry.counter(
+    "mentari_meetings_total",
+    "Jumlah pertemuan yang dicek berdasarkan status forum",
+    labels=("status",)
+)
+JOBS_IN_FLIGHT = registry.gauge(
+    "mentari_jobs_in_flight",
+    "Jumlah job scraping yang sedang berjalan"
+)
+BROWSER_WARM = registry.gauge(
+    "mentari_browser_warm",
+    "1 jika peluncuran browser terakhir berhasil"
+)
+MEMORY_BUCKETS = tuple(mb * 1024 * 1024 for mb in (32, 64, 128, 256, 384, 512, 768, 1024, 1536, 2048))
+CONTEXT_RSS_BYTES = registry.histogram(
+    "mentari_context_rss_bytes",
+    "Kenaikan RSS browser per context job di atas baseline",
+    buckets=MEMORY_BUCKETS
+)
+JOB_PEAK_RSS_BYTES = registry.histogram(
+    "mentari_job_peak_rss_bytes",
+    "Puncak total RSS proses browser selama job",
+    buckets=MEMORY_BUCKETS
+)
+JOBS_COALESCED = registry.counter(
+    "mentari_jobs_coalesced_total",
+    "Jumlah permintaan yang menumpang job NIM yang sedang berjalan"
+)
+MEETING_LOADS_SKIPPED = registry.counter(
+    "mentari_meeting_loads_skipped_total",
+    "Jumlah pertemuan yang statusnya disimpulkan tanpa membuka halaman",
+    labels=("reason",)
+)
+FORUM_ACTIONS_TOTAL = registry.counter(
+    "mentari_forum_actions_total",
+    "Jumlah aksi join/verifikasi forum per hasil",
+    labels=("action", "outcome")
+)
+COMPLETION_WATCHERS = registry.gauge(
+    "mentari_completion_watchers",
+    "Jumlah watcher status pengerjaan forum yang sedang berjalan"
+)
+
+
+class PhaseTimer:
+    """Handle untuk satu pengukuran fase; outcome bisa diubah sebelum selesai"""
+
+    __slots__ = ("phase", "outcome", "started")
+
+    def __init__(self, phase: str):
+        self.phase = phase
+        self.outcome = "ok"
+        self.started = time.perf_counter()
+
+
+@contextmanager
+def time_phase(phase: str, outcome: str = "ok") -> Iterator[PhaseTimer]:
+    """
+    Ukur durasi satu fase dan catat ke PHASE_DURATION
+
+    Exception yang lolos dari block dicatat dengan outcome "error"
+    (atau "timeout" jika pesan error mengandung kata timeout); pembatalan
+    task dicatat sebagai "cancelled".
+    """
+    timer = PhaseTimer(phase)
+    timer.outcome = outcome
+    try:
+        yield timer
+    except asyncio.CancelledError:
+        timer.outcome = "cancelled"
+        raise
+    except Exception as e:
+        timer.outcome = "timeout" if "timeout" in str(e).lower() else "error"
+        raise
+    finally:
+        PHASE_DURATION.observe(
+            time.perf_counter() - timer.started,
+            phase=timer.phase,
+            outcome=timer.outcome
+        )
+
+
+class MetricsServer:
+    """HTTP server minimal untuk /metrics dan /health"""
+
+    def __init__(
+        self,
+        port: int,
+        host: str = "0.0.0.0",
+        readiness_probe: Optional[Callable[[], Dict]] = None
+    ):
+        self.host = host
+        self.port = port
+        self.readiness_probe = readiness_probe
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Metrics server listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def health_payload(self) -> Tuple[int, Dict]:
+        """Status code dan body untuk /health"""
+        readiness = self.readiness_probe() if self.readiness_probe else {"ready": True}
+        status_code = 200 if readiness.get("ready") else 503
+        return status_code, readiness
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Drain headers
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?", 1)[0] if len(parts) >= 2 else "/"
+
+            if path == "/metrics":
+                status, content_type = 200, "text/plain; version=0.0.4"
+                body = registry.render().encode()
+            elif path in ("/health", "/healthz", "/ready"):
+                status, payload = self.health_payload()
+                content_type = "application/json"
+                body = json.dumps(payload).encode()
+            else:
+                status, content_type, body = 404, "text/plain", b"not found\n"
+
+            reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}[status]
+            writer.write(
+                f"HTTP/1.1 {status} {reason}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
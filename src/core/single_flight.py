@@ -0,0 +1,147 @@
+"""
+Single-flight untuk job scraping per NIM
+
+Permintaan yang datang saat job dengan key yang sama masih berjalan tidak
+memulai login/scraping baru; permintaan itu menumpang job yang ada, menerima
+progress yang sama, hasil per mata kuliah yang sama (termasuk yang sudah
+selesai sebelum ia bergabung) dan hasil akhir yang sama.
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.core.metrics import JOBS_COALESCED
+
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[str], Awaitable[None]]
+CourseCallback = Callable[[Any], Awaitable[None]]
+
+
+def credentials_key(nim: str, password: str, scope: str = "") -> str:
+    """
+    Key single-flight untuk satu akun
+
+    Digest password ikut di key agar permintaan dengan password berbeda
+    tidak pernah menerima hasil dari login orang lain.
+    """
+    digest = hashlib.sha256(f"{nim}\0{password}".encode()).hexdigest()[:16]
+    return f"{nim}:{digest}:{scope}"
+
+
+class _Flight:
+    """Satu job yang sedang berjalan beserta pendengarnya"""
+
+    __slots__ = ("future", "subscribers", "last_progress", "course_subscribers", "courses")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.subscribers: List[ProgressCallback] = []
+        self.last_progress: Optional[str] = None
+        self.course_subscribers: List[CourseCallback] = []
+        self.courses: List[Any] = []
+
+
+class SingleFlight:
+    """Registry job in-flight yang menggabungkan permintaan duplikat"""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    async def run(
+        self,
+        key: str,
+        fn: Callable[[ProgressCallback, CourseCallback], Awaitable[Any]],
+        progress_callback: Optional[ProgressCallback] = None,
+        course_callback: Optional[CourseCallback] = None
+    ) -> Any:
+        """
+        Jalankan fn(progress, course) sekali per key
+
+        Args:
+            key: Key job (lihat credentials_key)
+            fn: Coroutine factory yang menerima progress callback dan course
+                callback gabungan
+            progress_callback: Callback progress milik pemanggil ini
+            course_callback: Callback hasil per mata kuliah milik pemanggil ini
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            return await self._join(flight, progress_callback, course_callback)
+
+        flight = _Flight(asyncio.get_running_loop().create_future())
+        # Hindari warning "exception was never retrieved" jika tidak ada follower
+        flight.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        if progress_callback:
+            flight.subscribers.append(progress_callback)
+        if course_callback:
+            flight.course_subscribers.append(course_callback)
+        self._flights[key] = flight
+
+        async def fanout(text: str):
+            flight.last_progress = text
+            for callback in list(flight.subscribers):
+                await self._notify(callback, text)
+
+        async def course_fanout(course_result: Any):
+            flight.courses.append(course_result)
+            for callback in list(flight.course_subscribers):
+                await self._notify(callback, course_result)
+
+        try:
+            result = await fn(fanout, course_fanout)
+        except asyncio.CancelledError:
+            flight.future.cancel()
+            raise
+        except BaseException as e:
+            flight.future.set_exception(e)
+            raise
+        else:
+            flight.future.set_result(result)
+            return result
+        finally:
+            self._flights.pop(key, None)
+
+    async def _join(
+        self,
+        flight: _Flight,
+        progress_callback: Optional[ProgressCallback],
+        course_callback: Optional[CourseCallback]
+    ) -> Any:
+        JOBS_COALESCED.inc()
+        logger.info("Attaching request to in-flight job")
+
+        if progress_callback:
+            flight.subscribers.append(progress_callback)
+            if flight.last_progress:
+                await self._notify(progress_callback, flight.last_progress)
+
+        if course_callback:
+            # Mata kuliah yang sudah selesai dikirim ulang dulu, baru ikut fan-out
+            delivered = 0
+            while delivered < len(flight.courses):
+                await self._notify(course_callback, flight.courses[delivered])
+                delivered += 1
+            flight.course_subscribers.append(course_callback)
+
+        try:
+            # shield: follower yang dibatalkan tidak ikut membatalkan job leader
+            return await asyncio.shield(flight.future)
+        finally:
+            if progress_callback in flight.subscribers:
+                flight.subscribers.remove(progress_callback)
+            if course_callback in flight.course_subscribers:
+                flight.course_subscribers.remove(course_callback)
+
+    @staticmethod
+    async def _notify(callback: Callable[[Any], Awaitable[None]], payload: Any):
+        try:
+            await callback(payload)
+        except Exception as e:
+            logger.debug(f"Subscriber callback failed: {e}")
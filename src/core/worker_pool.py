@@ -0,0 +1,364 @@
+"""
+Pool worker process untuk scraping Mentari UNPAM
+
+Proses bot hanya menangani handler Telegram dan formatting; login dan
+scraping dijalankan di worker process yang masing-masing memegang browser
+Playwright yang tetap hangat. Task dikirim lewat multiprocessing queue,
+worker mengirim balik event progress, CourseResult per mata kuliah yang
+selesai (dict), dan ScrapingResult dalam format biner ringkas (pack_result).
+"""
+
+import asyncio
+import logging
+import multiprocessing as mp
+import queue
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.config import AppSettings, env_config
+from src.models import CourseInfo, CourseResult, LoginCredentials, ScrapingResult
+from src.models.compact import pack_result, unpack_result
+from src.core.logging_setup import current_job_id, job_context
+
+
+logger = logging.getLogger(__name__)
+
+# Spawn: worker tidak mewarisi event loop / state Playwright dari parent
+_mp_context = mp.get_context("spawn")
+
+# Ukuran slot shared memory untuk job id yang sedang dipegang worker
+_CLAIM_SIZE = 64
+
+
+def _take_task(task_queue, claim):
+    """
+    Ambil task dari queue dan langsung klaim job id-nya di shared memory
+
+    Klaim ditulis tanpa lewat event queue (yang di-flush thread terpisah)
+    sehingga parent tetap tahu job mana yang dipegang worker yang mati.
+    Klaim dibiarkan sampai task berikutnya diambil; job yang sudah selesai
+    tidak lagi pending sehingga klaim lamanya tidak berpengaruh.
+    """
+    task = task_queue.get()
+    if task is not None:
+        claim.value = task[0].encode()[:_CLAIM_SIZE]
+    return task
+
+
+def _worker_main(worker_id: int, settings: AppSettings, task_queue, event_queue, claim):
+    """Entry point worker process"""
+    from src.core.logging_setup import setup_logging
+
+    setup_logging(
+        level=env_config.log_level,
+        log_dir=settings.log_dir,
+        filename=f"worker-{worker_id}.log",
+        max_bytes=env_config.log_max_bytes,
+        backup_count=env_config.log_backup_count
+    )
+
+    try:
+        asyncio.run(_worker_loop(worker_id, settings, task_queue, event_queue, claim))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _worker_loop(worker_id: int, settings: AppSettings, task_queue, event_queue, claim):
+    """Ambil task dari queue dan jalankan scraping dengan browser persistent"""
+    from src.core.bot_service import MentariBotCore, LoginFailedError
+
+    core = MentariBotCore(settings)
+    loop = asyncio.get_running_loop()
+    job_store = None
+
+    try:
+        await core.start_persistent_browser()
+        logger.info(f"Scrape worker {worker_id} ready")
+    except Exception as e:
+        # Browser akan dicoba lagi saat job pertama
+        logger.error(f"Scrape worker {worker_id} failed to warm browser: {e}")
+    event_queue.put(("ready", None, worker_id, core.browser_warm, core.last_browser_error))
+
+    try:
+        while True:
+            task = await loop.run_in_executor(None, _take_task, task_queue, claim)
+            if task is None:
+                break
+
+            job_id, nim, password, course_dicts, use_checkpoint = task
+            event_queue.put(("started", job_id, worker_id))
+
+            async def progress_callback(text: str, _job_id: str = job_id):
+                event_queue.put(("progress", _job_id, text))
+
+            async def course_callback(course_result, _job_id: str = job_id):
+                event_queue.put(("course", _job_id, course_result.to_dict()))
+
+            with job_context(job_id):
+                try:
+                    # Relaunch jika browser crash di job sebelumnya
+                    await core.start_persistent_browser()
+                    courses = [CourseInfo.from_dict(c) for c in course_dicts] or None
+                    checkpoint = None
+                    if use_checkpoint:
+                        # Job store SQLite dibuka sendiri oleh worker (WAL, aman multi-proses)
+                        from src.services.job_store import JobStore, JobCheckpoint
+                        if job_store is None:
+                            job_store = JobStore(env_config.job_store_path)
+                        checkpoint = JobCheckpoint(job_store, job_id)
+                    result = await core.scrape(
+                        LoginCredentials(nim=nim, password=password),
+                        courses,
+                        progress_callback,
+                        checkpoint,
+                        course_callback
+                    )
+                    event_queue.put(("result", job_id, pack_result(result)))
+                except LoginFailedError as e:
+                    event_queue.put(("error", job_id, "login", str(e)))
+                except Exception as e:
+                    logger.error(f"Scrape worker {worker_id} job failed: {e}")
+                    event_queue.put(("error", job_id, "error", str(e)))
+                finally:
+                    # Status browser bisa berubah (relaunch berhasil / crash)
+                    event_queue.put(("ready", None, worker_id, core.browser_warm, core.last_browser_error))
+    finally:
+        await core.stop_persistent_browser()
+
+
+class _PendingJob:
+    """State job yang sedang menunggu hasil dari worker"""
+
+    __slots__ = ("future", "progress_callback", "course_callback", "worker_id")
+
+    def __init__(
+        self,
+        future: asyncio.Future,
+        progress_callback: Optional[Callable],
+        course_callback: Optional[Callable] = None
+    ):
+        self.future = future
+        self.progress_callback = progress_callback
+        self.course_callback = course_callback
+        self.worker_id: Optional[int] = None
+
+
+class ScrapeWorkerPool:
+    """Dispatch job scraping ke sejumlah worker process"""
+
+    def __init__(self, settings: AppSettings, workers: int = 2):
+        self.settings = settings
+        self.size = max(1, workers)
+        self._task_queue = None
+        self._event_queue = None
+        self._processes: Dict[int, mp.Process] = {}
+        # worker_id -> job id yang terakhir diambil worker (shared memory)
+        self._claims: Dict[int, object] = {}
+        self._pending: Dict[str, _PendingJob] = {}
+        self._dispatcher: Optional[asyncio.Task] = None
+        # worker_id -> (browser warm, error terakhir) dari event "ready"
+        self._browser_state: Dict[int, Tuple[bool, Optional[str]]] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    def readiness(self) -> dict:
+        """Status worker untuk health endpoint: worker hidup, browser warm, job menunggu"""
+        alive = [worker_id for worker_id, process in self._processes.items() if process.is_alive()]
+        warm = [worker_id for worker_id in alive if self._browser_state.get(worker_id, (False, None))[0]]
+        errors = [
+            error for worker_id, (is_warm, error) in self._browser_state.items()
+            if error and not is_warm
+        ]
+        return {
+            'running': self.running,
+            'workers': self.size,
+            'workers_alive': len(alive),
+            'workers_warm': len(warm),
+            'pending_jobs': len(self._pending),
+            'last_browser_error': errors[-1] if errors else None
+        }
+
+    def _spawn(self, worker_id: int):
+        claim = self._claims.get(worker_id)
+        if claim is None:
+            claim = _mp_context.Array("c", _CLAIM_SIZE)
+            self._claims[worker_id] = claim
+        claim.value = b""
+
+        process = _mp_context.Process(
+            target=_worker_main,
+            args=(worker_id, self.settings, self._task_queue, self._event_queue, claim),
+            name=f"scrape-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        self._processes[worker_id] = process
+
+    async def start(self):
+        """Spawn worker process dan mulai dispatcher event"""
+        if self.running:
+            return
+
+        self._task_queue = _mp_context.Queue()
+        self._event_queue = _mp_context.Queue()
+        for worker_id in range(self.size):
+            self._spawn(worker_id)
+
+        self._dispatcher = asyncio.create_task(self._dispatch_events())
+        logger.info(f"Started {self.size} scrape worker process(es)")
+
+    async def stop(self, timeout: float = 10.0):
+        """Minta worker berhenti, lalu terminate yang tidak merespons"""
+        if self._task_queue is None:
+            return
+
+        for _ in self._processes:
+            self._task_queue.put(None)
+
+        loop = asyncio.get_running_loop()
+        for process in self._processes.values():
+            await loop.run_in_executor(None, process.join, timeout)
+            if process.is_alive():
+                process.terminate()
+
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        for job in self._pending.values():
+            if not job.future.done():
+                job.future.set_exception(RuntimeError("Worker pool dihentikan"))
+        self._pending.clear()
+        self._processes.clear()
+        self._claims.clear()
+        self._browser_state.clear()
+        self._task_queue = None
+        self._event_queue = None
+
+    async def submit(
+        self,
+        credentials: LoginCredentials,
+        courses: Optional[List[CourseInfo]] = None,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        checkpoint=None,
+        course_callback: Optional[Callable[[CourseResult], None]] = None
+    ) -> ScrapingResult:
+        """
+        Kirim job ke worker dan tunggu hasilnya
+
+        Raises:
+            LoginFailedError: Jika worker melaporkan login gagal
+            RuntimeError: Jika worker error atau mati di tengah job
+        """
+        if not self.running:
+            raise RuntimeError("Worker pool belum dijalankan")
+
+        if checkpoint is not None:
+            # Worker membuka checkpoint yang sama dari job store
+            job_id = checkpoint.job_id
+        else:
+            job_id = current_job_id.get()
+        if checkpoint is None and (job_id == "-" or job_id in self._pending):
+            job_id = uuid.uuid4().hex[:12]
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[job_id] = _PendingJob(future, progress_callback, course_callback)
+
+        course_dicts = [course.to_dict() for course in courses] if courses else []
+        self._task_queue.put((
+            job_id, credentials.nim, credentials.password, course_dicts, checkpoint is not None
+        ))
+
+        try:
+            return await future
+        finally:
+            self._pending.pop(job_id, None)
+
+    async def _dispatch_events(self):
+        """Baca event dari worker dan teruskan ke job yang menunggu"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                event = await loop.run_in_executor(None, self._read_event, 1.0)
+                if event is not None:
+                    await self._handle_event(event)
+                # Tiap putaran: antrian yang terus sibuk tidak boleh menunda deteksi worker mati
+                self._check_workers()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker event dispatch error: {e}")
+
+    def _read_event(self, timeout: float) -> Optional[Tuple]:
+        try:
+            return self._event_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def _handle_event(self, event: Tuple):
+        from src.core.bot_service import LoginFailedError
+
+        kind, job_id = event[0], event[1]
+        if kind == "ready":
+            self._browser_state[event[2]] = (event[3], event[4])
+            return
+
+        job = self._pending.get(job_id)
+        if job is None or job.future.done():
+            return
+
+        if kind == "started":
+            job.worker_id = event[2]
+        elif kind == "progress":
+            if job.progress_callback:
+                try:
+                    await job.progress_callback(event[2])
+                except Exception as e:
+                    logger.debug(f"Progress callback failed: {e}")
+        elif kind == "course":
+            if job.course_callback:
+                try:
+                    await job.course_callback(CourseResult.from_dict(event[2]))
+                except Exception as e:
+                    logger.warning(f"Course callback failed: {e}")
+        elif kind == "result":
+            job.future.set_result(unpack_result(event[2]).to_result())
+        elif kind == "error":
+            error_kind, message = event[2], event[3]
+            if error_kind == "login":
+                job.future.set_exception(LoginFailedError(message))
+            else:
+                job.future.set_exception(RuntimeError(message))
+
+    def _check_workers(self):
+        """
+        Gagalkan job milik worker yang mati lalu spawn pengganti
+
+        Job milik worker dikenali dari event "started" atau dari klaim di
+        shared memory (worker bisa mati sebelum event "started" terkirim).
+        Job lain tetap di task queue dan diambil worker yang masih hidup
+        atau worker pengganti.
+        """
+        for worker_id, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+
+            logger.error(
+                f"Scrape worker {worker_id} exited with code {process.exitcode}, respawning"
+            )
+            claim = self._claims.get(worker_id)
+            claimed = claim.value.decode() if claim is not None else ""
+            for job_id, job in self._pending.items():
+                if job.future.done():
+                    continue
+                if job.worker_id == worker_id or (job.worker_id is None and job_id == claimed):
+                    job.future.set_exception(RuntimeError("Worker scraping berhenti mendadak"))
+            self._browser_state.pop(worker_id, None)
+            self._spawn(worker_id)
@@ -0,0 +1,725 @@
+"""
+Konten dan logic Mini App yang dipakai bersama oleh server Flask (Vercel)
+dan server ASGI terpadu (main_unified.py)
+
+Join dan cek forum butuh bot core (browser + login), jadi hanya dilayani
+server terpadu; server Flask hanya menyajikan halaman dan health check.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from src.models import ForumTarget, LoginCredentials, ParticipationResult
+
+
+# Batas forum per permintaan /api/bulk-join
+MAX_BULK_FORUMS = 20
+
+
+def build_completion_response(result: ParticipationResult) -> dict:
+    """Bangun response /api/check-completion dari hasil verifikasi forum"""
+    if result.success:
+        return {
+            'completed': True,
+            'message': '✅ Forum diskusi sudah selesai (ada tanda centang)'
+        }
+    return {
+        'completed': False,
+        'missing_tasks': (
+            f"{result.message}\n\n"
+            "📋 Forum dianggap selesai setelah ada tanda centang hijau ✅\n"
+            "   → Butuh minimal 2 reply di forum diskusi"
+        )
+    }
+
+
+def build_mark_completed_response(nim: str, course_code: str, meeting_number: str) -> dict:
+    """Bangun response untuk /api/mark-completed"""
+    return {
+        'success': True,
+        'message': f'Forum {course_code} meeting {meeting_number} marked as completed for {nim}',
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def build_participation_response(result: ParticipationResult, course_title: str = '') -> tuple:
+    """
+    Bangun response /api/join-forum dari hasil run_forum_actions
+
+    Returns:
+        tuple: (payload dict, HTTP status code)
+    """
+    target = ForumTarget(course_code=result.course_code, meeting_number=result.meeting_number)
+    payload = {
+        'success': result.success,
+        'message': result.message,
+        'status': result.status.value,
+        'forum_url': target.url,
+        'course_code': result.course_code,
+        'course_title': course_title,
+        'meeting_number': result.meeting_number,
+        'timestamp': datetime.now().isoformat()
+    }
+    return payload, 200 if result.success else 400
+
+
+def decode_credentials(encoded: str) -> Optional[LoginCredentials]:
+    """Kredensial dari parameter `creds` Mini App (base64 JSON nim/password)"""
+    try:
+        data = json.loads(base64.b64decode(encoded).decode())
+        return LoginCredentials(nim=str(data['nim']), password=str(data['password']))
+    except Exception:
+        return None
+
+
+def parse_bulk_forums(forums) -> List[ForumTarget]:
+    """
+    Validasi daftar forum dari /api/bulk-join
+
+    Raises:
+        ValueError: Jika daftar kosong, terlalu panjang atau formatnya salah
+    """
+    if not isinstance(forums, list) or not forums:
+        raise ValueError('Daftar forum kosong')
+    if len(forums) > MAX_BULK_FORUMS:
+        raise ValueError(f'Maksimal {MAX_BULK_FORUMS} forum per permintaan')
+
+    targets = []
+    seen = set()
+    for forum in forums:
+        try:
+            target = ForumTarget(
+                course_code=str(forum['course_code']),
+                meeting_number=int(forum['meeting_number'])
+            )
+        except (KeyError, TypeError, ValueError):
+            raise ValueError('Format forum tidak valid')
+        if (target.course_code, target.meeting_number) not in seen:
+            seen.add((target.course_code, target.meeting_number))
+            targets.append(target)
+    return targets
+
+
+def bulk_event(event_type: str, **payload) -> bytes:
+    """Satu baris NDJSON untuk stream /api/bulk-join"""
+    return (json.dumps({'type': event_type, **payload}, ensure_ascii=False) + "\n").encode()
+
+
+def sse_event(event_type: str, payload: dict) -> bytes:
+    """Satu event Server-Sent Events"""
+    return f"event: {event_type}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n".encode()
+
+
+def build_unavailable_response(action: str) -> dict:
+    """Response server tanpa bot core (Flask/Vercel) untuk aksi yang butuh login"""
+    return {
+        'success': False,
+        'completed': False,
+        'message': (
+            f'❌ {action} tidak tersedia di server ini. '
+            'Buka Mini App dari tombol terbaru di bot.'
+        )
+    }
+
+
+def build_health_response() -> dict:
+    """Bangun response untuk /api/health"""
+    return {
+        "status": "ok", 
+        "service": "Mentari UNPAM Mini App",
+        "version": "2.0.0"
+    }
+
+
+MINIAPP_PAGE_HTML = '''
+    <!DOCTYPE html>
+    <html lang="id">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Mentari UNPAM Mini App</title>
+        <script src="https://telegram.org/js/telegram-web-app.js"></script>
+        <style>
+            body { 
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                margin: 0; padding: 20px; 
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                color: white; min-height: 100vh;
+            }
+            .container { 
+                max-width: 400px; margin: 0 auto; 
+                background: rgba(255, 255, 255, 0.1);
+                border-radius: 15px; padding: 20px;
+                backdrop-filter: blur(10px);
+                border: 1px solid rgba(255, 255, 255, 0.2);
+            }
+            .course-info {
+                background: rgba(255, 255, 255, 0.2);
+                padding: 15px; border-radius: 10px; margin-bottom: 20px;
+                border-left: 4px solid #ffd700;
+            }
+            .btn {
+                background: linear-gradient(45deg, #51cf66, #37b24d);
+                color: white; border: none; padding: 12px 20px;
+                border-radius: 8px; cursor: pointer; font-size: 14px;
+                width: 100%; margin: 8px 0; transition: all 0.3s ease;
+            }
+            .btn:hover { transform: translateY(-2px); }
+            .btn-primary { background: linear-gradient(45deg, #339af0, #1971c2); }
+            .btn-warning { background: linear-gradient(45deg, #ffd43b, #fab005); color: #333; }
+            .success-box { 
+                background: rgba(76, 175, 80, 0.2); border: 1px solid #4caf50; 
+                color: #4caf50; padding: 15px; border-radius: 8px; margin: 15px 0; 
+            }
+            .error-box { 
+                background: rgba(244, 67, 54, 0.2); border: 1px solid #f44336; 
+                color: #f44336; padding: 15px; border-radius: 8px; margin: 15px 0; 
+            }
+            .spinner { 
+                border: 3px solid rgba(255,255,255,0.3); border-top: 3px solid white; 
+                border-radius: 50%; width: 30px; height: 30px; 
+                animation: spin 1s linear infinite; margin: 0 auto 15px; 
+            }
+            @keyframes spin { 0% { transform: rotate(0deg); } 100% { transform: rotate(360deg); } }
+            .hidden { display: none !important; }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h2>🎓 Forum Discussion Mini App</h2>
+            
+            <div class="course-info">
+                <div style="font-size: 14px; opacity: 0.8; margin-bottom: 5px;" id="course-code">Loading...</div>
+                <div style="font-size: 18px; font-weight: bold;" id="course-title">Loading...</div>
+                <span style="background: #ff6b6b; color: white; padding: 5px 10px; border-radius: 15px; font-size: 12px; display: inline-block; margin: 10px 5px 0 0;">
+                    📚 <span id="meeting-number">-</span>
+                </span>
+                <span style="background: #51cf66; color: white; padding: 5px 10px; border-radius: 15px; font-size: 12px; display: inline-block; margin: 10px 0 0 5px;">
+                    ✅ Available
+                </span>
+            </div>
+
+            <!-- Initial View -->
+            <div id="initial-view">
+                <div style="background: rgba(255, 255, 255, 0.1); padding: 15px; border-radius: 10px; margin: 15px 0; text-align: center;">
+                    <p>🎯 Siap mengerjakan forum diskusi?</p>
+                    <p style="font-size: 14px; opacity: 0.8;">Klik tombol di bawah untuk membuka forum</p>
+                </div>
+                <button class="btn" onclick="openForumInstructions()">🚀 Buka Forum Diskusi</button>
+            </div>
+
+            <!-- Instructions View -->
+            <div id="instructions-view" class="hidden">
+                <div style="background: rgba(255, 193, 7, 0.2); border: 1px solid #ffc107; color: #856404; padding: 15px; border-radius: 8px; margin: 15px 0;">
+                    <h3>📝 PENTING - Panduan Pengerjaan:</h3>
+                    <div style="text-align: left; margin-top: 10px;">
+                        <p><strong>🔐 SEBELUM MULAI:</strong></p>
+                        <p>• Anda harus sudah ter-login di browser dengan akun Mentari UNPAM Anda</p>
+                        <br>
+                        <p><strong>📚 TUGAS YANG HARUS DISELESAIKAN:</strong></p>
+                        <p>• Minimal <strong>2x reply</strong> pada forum diskusi</p>
+                        <p>• Selesaikan semua tugas lainnya jika ada</p>
+                        <p>• Kerjakan dari <strong>Pretest sampai Kuesioner</strong></p>
+                        <br>
+                        <p><strong>⚠️ CATATAN:</strong></p>
+                        <p>• Baca soal diskusi dengan teliti</p>
+                        <p>• Berikan jawaban yang berkualitas</p>
+                        <p>• Jangan lupa submit semua tugas</p>
+                    </div>
+                </div>
+                
+                <button class="btn btn-primary" onclick="proceedToForum()">
+                    🌐 Saya Paham, Buka Forum
+                </button>
+                <button class="btn" style="background: #6c757d; margin-top: 5px;" onclick="goBack()">
+                    ← Kembali
+                </button>
+            </div>
+
+            <!-- Working View -->
+            <div id="working-view" class="hidden">
+                <div style="background: rgba(40, 167, 69, 0.2); border: 1px solid #28a745; color: #155724; padding: 15px; border-radius: 8px; margin: 15px 0;">
+                    <h3>🔄 Status: Sedang Dikerjakan</h3>
+                    <p>Forum telah dibuka di browser baru.</p>
+                    <p><strong>Jangan tutup Mini App ini!</strong></p>
+                </div>
+                
+                <div style="background: rgba(255, 255, 255, 0.1); padding: 15px; border-radius: 10px; margin: 15px 0;">
+                    <h4>� Checklist Tugas:</h4>
+                    <div style="text-align: left; margin-top: 10px;">
+                        <p>□ Login ke akun Mentari UNPAM</p>
+                        <p>□ Baca topik diskusi</p>
+                        <p>□ Reply diskusi (min. 2x)</p>
+                        <p>□ Kerjakan Pretest</p>
+                        <p>□ Selesaikan tugas lainnya</p>
+                        <p>□ Isi Kuesioner</p>
+                    </div>
+                </div>
+                
+                <button class="btn btn-warning" onclick="checkCompletion()">
+                    🔍 Cek Status Pengerjaan
+                </button>
+                <button class="btn btn-primary" style="margin-top: 5px;" onclick="openForumAgain()">
+                    🌐 Buka Forum Lagi
+                </button>
+            </div>
+
+            <!-- Checking View -->
+            <div id="checking-view" class="hidden">
+                <div style="text-align: center; padding: 20px;">
+                    <div class="spinner"></div>
+                    <div>🔍 Memeriksa status pengerjaan...</div>
+                    <div style="font-size: 14px; margin-top: 10px;">Mohon tunggu sebentar</div>
+                </div>
+            </div>
+
+            <!-- Success View -->
+            <div id="success-view" class="hidden">
+                <div class="success-box">
+                    <h3>🎉 Semua Tugas Selesai!</h3>
+                    <p>✅ Forum diskusi: Completed</p>
+                    <p>✅ Reply minimal: Completed</p>
+                    <p>✅ Pretest-Kuesioner: Completed</p>
+                    <p>� Nilai akan muncul di dashboard Anda.</p>
+                </div>
+                <button class="btn" onclick="closeAppAndReturn()">✅ Selesai & Kembali ke Bot</button>
+            </div>
+
+            <!-- Incomplete View -->
+            <div id="incomplete-view" class="hidden">
+                <div style="background: rgba(255, 193, 7, 0.2); border: 1px solid #ffc107; color: #856404; padding: 15px; border-radius: 8px; margin: 15px 0;">
+                    <h3>⚠️ Tugas Belum Selesai</h3>
+                    <div id="incomplete-details"></div>
+                </div>
+                <button class="btn btn-primary" onclick="continueWorking()">
+                    📚 Lanjutkan Pengerjaan
+                </button>
+                <button class="btn btn-warning" style="margin-top: 5px;" onclick="checkCompletion()">
+                    🔍 Cek Lagi
+                </button>
+            </div>
+
+            <!-- Error View -->
+            <div id="error-view" class="hidden">
+                <div class="error-box" id="error-message"></div>
+                <button class="btn" onclick="resetApp()">🔄 Coba Lagi</button>
+            </div>
+        </div>
+
+        <script>
+            const tg = window.Telegram?.WebApp;
+            if (tg) {
+                tg.ready();
+                tg.expand();
+            }
+
+            // Get URL parameters
+            const urlParams = new URLSearchParams(window.location.search);
+            const courseCode = urlParams.get('course_code') || 'UNKNOWN-CODE';
+            const courseTitle = decodeURIComponent(urlParams.get('course_title') || 'Course Title');
+            const meetingNumber = urlParams.get('meeting_number') || '1';
+            
+            // Debug: Log parameters with timestamp to force refresh
+            console.log('URL Parameters (v1.2.1):', {
+                courseCode, courseTitle, meetingNumber,
+                fullURL: window.location.href,
+                timestamp: new Date().toISOString()
+            });
+            
+            // Update UI with course info
+            document.getElementById('course-code').textContent = courseCode;
+            document.getElementById('course-title').textContent = courseTitle;
+            document.getElementById('meeting-number').textContent = 'Pertemuan ' + meetingNumber;
+
+            function showView(viewId) {
+                ['initial-view', 'instructions-view', 'working-view', 'checking-view', 'success-view', 'incomplete-view', 'error-view'].forEach(id => {
+                    document.getElementById(id).classList.add('hidden');
+                });
+                document.getElementById(viewId).classList.remove('hidden');
+            }
+
+            function openForumInstructions() {
+                showView('instructions-view');
+            }
+
+            function goBack() {
+                showView('initial-view');
+            }
+
+            function proceedToForum() {
+                // Debug: Log course code before creating URL
+                console.log('Creating forum URL with courseCode:', courseCode);
+                
+                // Open forum in new tab
+                const forumUrl = `https://mentari.unpam.ac.id/u-courses/${courseCode}?accord_pertemuan=PERTEMUAN_${meetingNumber}`;
+                
+                console.log('Generated forum URL:', forumUrl);
+                
+                window.open(forumUrl, '_blank');
+                
+                // Show working view
+                showView('working-view');
+                window.forumUrl = forumUrl;
+            }
+
+            function openForumAgain() {
+                if (window.forumUrl) {
+                    window.open(window.forumUrl, '_blank');
+                }
+            }
+
+            const creds = urlParams.get('creds') || '';
+            let completionStream = null;
+
+            function showCheckError() {
+                document.getElementById('error-message').innerHTML =
+                    '<h3>❌ Error Checking Status</h3><p>Terjadi kesalahan saat mengecek status. Silakan coba lagi.</p>';
+                showView('error-view');
+            }
+
+            async function watchCompletion() {
+                // Server memverifikasi di background dan mengirim state saat berubah
+                if (completionStream) completionStream.close();
+                showView('checking-view');
+
+                // Kredensial lewat body POST; stream hanya membawa tiket
+                let ticket;
+                try {
+                    const response = await fetch('/api/completion-watch', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({
+                            course_code: courseCode,
+                            meeting_number: meetingNumber,
+                            creds: creds,
+                            init_data: tg ? tg.initData : ''
+                        })
+                    });
+                    if (response.status === 404) {
+                        // Server tanpa watcher: cek sekali lewat POST biasa
+                        checkCompletionOnce();
+                        return;
+                    }
+                    ticket = await response.json();
+                } catch (error) {
+                    console.error('Completion watch error:', error);
+                    checkCompletionOnce();
+                    return;
+                }
+                if (!ticket.success) {
+                    document.getElementById('error-message').textContent = ticket.message;
+                    showView('error-view');
+                    return;
+                }
+
+                completionStream = new EventSource(
+                    '/api/completion-stream?' + new URLSearchParams({ token: ticket.token }).toString()
+                );
+
+                completionStream.addEventListener('state', (event) => {
+                    const data = JSON.parse(event.data);
+                    if (data.state === 'completed') {
+                        completionStream.close();
+                        showView('success-view');
+                    } else if (data.state === 'login_failed') {
+                        completionStream.close();
+                        document.getElementById('error-message').textContent = data.message;
+                        showView('error-view');
+                    } else {
+                        const detailsElement = document.getElementById('incomplete-details');
+                        detailsElement.style.whiteSpace = 'pre-line';
+                        detailsElement.textContent = data.message +
+                            '\\n\\n🔄 Status dicek otomatis, halaman ini akan berubah saat forum selesai.';
+                        showView('incomplete-view');
+                    }
+                });
+
+                completionStream.addEventListener('error', () => {
+                    // EventSource reconnect sendiri; tutup jika server menolak
+                    if (completionStream.readyState === EventSource.CLOSED) {
+                        showCheckError();
+                    }
+                });
+            }
+
+            async function checkCompletion() {
+                if (creds && window.EventSource) {
+                    watchCompletion();
+                    return;
+                }
+                checkCompletionOnce();
+            }
+
+            async function checkCompletionOnce() {
+                showView('checking-view');
+
+                try {
+                    const response = await fetch('/api/check-completion', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({
+                            course_code: courseCode,
+                            course_title: courseTitle,
+                            meeting_number: meetingNumber,
+                            creds: creds,
+                            init_data: tg ? tg.initData : ''
+                        })
+                    });
+
+                    const data = await response.json();
+                    
+                    if (data.completed) {
+                        showView('success-view');
+                    } else {
+                        // Show incomplete tasks with safe text handling
+                        const missingTasks = data.missing_tasks || data.message || 
+                            'Masih ada tugas yang belum selesai. Silakan periksa forum dan selesaikan semua tugas.';
+                        
+                        // Safely display text with proper line breaks
+                        const detailsElement = document.getElementById('incomplete-details');
+                        detailsElement.style.whiteSpace = 'pre-line';
+                        detailsElement.textContent = missingTasks;
+                        showView('incomplete-view');
+                    }
+                } catch (error) {
+                    console.error('Check completion error:', error);
+                    showCheckError();
+                }
+            }
+
+            function continueWorking() {
+                showView('working-view');
+            }
+
+            function closeAppAndReturn() {
+                // Send completion signal to bot
+                if (tg) {
+                    // Mark as completed via API
+                    fetch('/api/mark-completed', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({
+                            course_code: courseCode,
+                            meeting_number: meetingNumber,
+                            creds: creds,
+                            init_data: tg ? tg.initData : ''
+                        })
+                    }).then(() => {
+                        tg.sendData(JSON.stringify({
+                            action: 'completed',
+                            course_code: courseCode,
+                            meeting_number: meetingNumber
+                        }));
+                        tg.close();
+                    }).catch(() => {
+                        // Fallback: close anyway
+                        tg.close();
+                    });
+                }
+            }
+
+            // Legacy functions for error handling
+            async function joinForum() {
+                openForumInstructions();
+            }
+
+            function openForum() {
+                openForumAgain();
+            }
+
+            function resetApp() {
+                showView('initial-view');
+            }
+
+            function closeApp() {
+                if (tg) tg.close();
+            }
+        </script>
+    </body>
+    </html>
+    '''
+
+
+MINIAPP_BULK_HTML = '''
+    <!DOCTYPE html>
+    <html lang="id">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Mentari UNPAM - Gabung Forum</title>
+        <script src="https://telegram.org/js/telegram-web-app.js"></script>
+        <style>
+            body { 
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                margin: 0; padding: 20px; 
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                color: white; min-height: 100vh;
+            }
+            .container { 
+                max-width: 400px; margin: 0 auto; 
+                background: rgba(255, 255, 255, 0.1);
+                border-radius: 15px; padding: 20px;
+                backdrop-filter: blur(10px);
+                border: 1px solid rgba(255, 255, 255, 0.2);
+            }
+            .forum {
+                display: flex; align-items: flex-start; gap: 10px;
+                background: rgba(255, 255, 255, 0.2);
+                padding: 12px; border-radius: 10px; margin-bottom: 10px;
+                border-left: 4px solid #ffd700;
+            }
+            .forum.ok { border-left-color: #51cf66; }
+            .forum.failed { border-left-color: #ff6b6b; }
+            .forum-title { font-weight: bold; }
+            .forum-status { font-size: 13px; opacity: 0.9; margin-top: 4px; }
+            .btn {
+                background: linear-gradient(45deg, #51cf66, #37b24d);
+                color: white; border: none; padding: 12px 20px;
+                border-radius: 8px; cursor: pointer; font-size: 14px;
+                width: 100%; margin: 8px 0;
+            }
+            .btn:disabled { opacity: 0.5; }
+            .summary { text-align: center; margin: 15px 0; }
+            .hidden { display: none !important; }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h2>🚀 Gabung Forum Sekaligus</h2>
+            <div id="forum-list"></div>
+            <div class="summary" id="summary"></div>
+            <button class="btn" id="join-btn" onclick="joinSelected()">🚀 Gabung Forum Terpilih</button>
+            <button class="btn hidden" id="close-btn" onclick="closeApp()">✅ Selesai & Kembali ke Bot</button>
+        </div>
+
+        <script>
+            const tg = window.Telegram?.WebApp;
+            if (tg) {
+                tg.ready();
+                tg.expand();
+            }
+
+            const urlParams = new URLSearchParams(window.location.search);
+            const creds = urlParams.get('creds') || '';
+            let forums = [];
+            try {
+                forums = JSON.parse(urlParams.get('data') || '{}').forums || [];
+            } catch (error) {
+                console.error('Invalid bulk data:', error);
+            }
+
+            const forumKey = (forum) => `${forum.course_code}:${forum.meeting_number}`;
+            const rows = {};
+
+            function renderForums() {
+                const list = document.getElementById('forum-list');
+                forums.forEach((forum, index) => {
+                    const row = document.createElement('label');
+                    row.className = 'forum';
+
+                    const checkbox = document.createElement('input');
+                    checkbox.type = 'checkbox';
+                    checkbox.checked = true;
+                    checkbox.dataset.index = index;
+
+                    const info = document.createElement('div');
+                    const title = document.createElement('div');
+                    title.className = 'forum-title';
+                    title.textContent = `${forum.course_name || forum.course_code} - Pertemuan ${forum.meeting_number}`;
+                    const status = document.createElement('div');
+                    status.className = 'forum-status';
+                    status.textContent = '🟡 Tersedia';
+                    info.append(title, status);
+
+                    row.append(checkbox, info);
+                    list.appendChild(row);
+                    rows[forumKey(forum)] = { row, checkbox, status };
+                });
+
+                if (!forums.length) {
+                    document.getElementById('summary').textContent = 'Tidak ada forum yang dipilih.';
+                    document.getElementById('join-btn').disabled = true;
+                }
+            }
+
+            function showResult(result) {
+                const entry = rows[forumKey(result)];
+                if (!entry) return;
+                entry.row.classList.add(result.success ? 'ok' : 'failed');
+                entry.status.textContent = result.message;
+            }
+
+            async function joinSelected() {
+                const selected = forums.filter((forum, index) =>
+                    document.querySelector(`input[data-index="${index}"]`).checked
+                );
+                if (!selected.length) return;
+
+                const button = document.getElementById('join-btn');
+                const summary = document.getElementById('summary');
+                button.disabled = true;
+                selected.forEach(forum => {
+                    const entry = rows[forumKey(forum)];
+                    entry.checkbox.disabled = true;
+                    entry.status.textContent = '⏳ Menunggu...';
+                });
+                summary.textContent = '🔐 Login ke Mentari...';
+
+                try {
+                    const response = await fetch('/api/bulk-join', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({
+                            forums: selected,
+                            creds: creds,
+                            init_data: tg ? tg.initData : ''
+                        })
+                    });
+                    if (!response.ok || !response.body) {
+                        const data = await response.json().catch(() => ({}));
+                        throw new Error(data.message || `HTTP ${response.status}`);
+                    }
+
+                    // Hasil per forum dikirim sebagai NDJSON begitu selesai
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffer = '';
+                    while (true) {
+                        const { value, done } = await reader.read();
+                        if (done) break;
+                        buffer += decoder.decode(value, { stream: true });
+                        const lines = buffer.split('\\n');
+                        buffer = lines.pop();
+                        for (const line of lines) {
+                            if (!line.trim()) continue;
+                            const event = JSON.parse(line);
+                            if (event.type === 'progress') {
+                                summary.textContent = event.message;
+                            } else if (event.type === 'result') {
+                                showResult(event.result);
+                            } else if (event.type === 'done') {
+                                summary.textContent = `✅ ${event.succeeded} berhasil, ❌ ${event.failed} gagal`;
+                            } else if (event.type === 'error') {
+                                summary.textContent = `❌ ${event.message}`;
+                            }
+                        }
+                    }
+                } catch (error) {
+                    console.error('Bulk join error:', error);
+                    summary.textContent = `❌ Gagal memproses forum: ${error.message}`;
+                }
+
+                document.getElementById('close-btn').classList.remove('hidden');
+            }
+
+            function closeApp() {
+                if (tg) tg.close();
+            }
+
+            renderForums();
+        </script>
+    </body>
+    </html>
+    '''
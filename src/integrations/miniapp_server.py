@@ -0,0 +1,399 @@
+"""
+Server ASGI terpadu untuk Bot Mentari UNPAM
+
+Menerima update Telegram lewat webhook dan melayani route Mini App di
+event loop yang sama dengan MentariBotCore, sehingga cache, session dan
+browser dipakai bersama tanpa polling maupun worker sync.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Iterable, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import (
+    HTMLResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+)
+from starlette.routing import Route
+from telegram import Update
+from telegram.ext import Application
+
+from src.core.bot_service import LoginFailedError
+from src.core.metrics import registry
+from src.models import ForumTarget
+from src.services.completion_watcher import CompletionWatchHub, WatchTickets
+from src.integrations.miniapp_api import (
+    MINIAPP_PAGE_HTML,
+    MINIAPP_BULK_HTML,
+    build_completion_response,
+    build_mark_completed_response,
+    build_participation_response,
+    build_health_response,
+    bulk_event,
+    decode_credentials,
+    parse_bulk_forums,
+    sse_event,
+)
+from src.integrations.telegram_miniapp import verify_telegram_auth
+
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_PATH = "/telegram/webhook"
+
+# Interval komentar keep-alive di stream SSE (detik)
+SSE_HEARTBEAT = 15.0
+
+
+def derive_webhook_secret(bot_token: str) -> str:
+    """Secret token webhook default yang diturunkan dari bot token"""
+    return hashlib.sha256(f"webhook:{bot_token}".encode()).hexdigest()[:32]
+
+
+def create_unified_app(
+    telegram_app: Application,
+    bot_core,
+    webhook_url: Optional[str] = None,
+    webhook_secret: Optional[str] = None,
+    completion_recorder: Optional[Callable[[str, str, str], None]] = None,
+    startup_hooks: Iterable[Callable[[], Awaitable[None]]] = (),
+    shutdown_hooks: Iterable[Callable[[], Awaitable[None]]] = ()
+) -> Starlette:
+    """
+    Buat aplikasi ASGI yang menggabungkan webhook Telegram dan Mini App API
+
+    Args:
+        telegram_app: Application PTB yang dibangun tanpa updater
+        bot_core: Instance MentariBotCore yang dipakai bersama
+        webhook_url: Base URL publik (HTTPS); webhook didaftarkan jika diisi
+        webhook_secret: Secret token untuk header X-Telegram-Bot-Api-Secret-Token
+        completion_recorder: Fungsi sync untuk menyimpan forum yang selesai
+        startup_hooks: Coroutine tambahan saat startup
+        shutdown_hooks: Coroutine tambahan saat shutdown
+    """
+    secret = webhook_secret or derive_webhook_secret(telegram_app.bot.token)
+    startup_hooks = list(startup_hooks)
+    shutdown_hooks = list(shutdown_hooks)
+    # Referensi task bulk join yang masih berjalan
+    bulk_tasks: set = set()
+    completion_hub = CompletionWatchHub(bot_core, completion_recorder)
+    watch_tickets = WatchTickets()
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        await telegram_app.initialize()
+        await telegram_app.start()
+
+        if webhook_url:
+            await telegram_app.bot.set_webhook(
+                url=webhook_url.rstrip("/") + WEBHOOK_PATH,
+                secret_token=secret,
+                allowed_updates=Update.ALL_TYPES
+            )
+            logger.info(f"Telegram webhook registered at {webhook_url.rstrip('/')}{WEBHOOK_PATH}")
+        else:
+            logger.warning("WEBHOOK_URL not set - Telegram updates will not be delivered")
+
+        for hook in startup_hooks:
+            await hook()
+
+        try:
+            yield
+        finally:
+            await completion_hub.stop()
+            for hook in shutdown_hooks:
+                await hook()
+            await telegram_app.stop()
+            await telegram_app.shutdown()
+
+    def authorize(data: dict):
+        """
+        Kredensial dari request Mini App yang dibuka lewat bot ini
+
+        Returns:
+            tuple: (LoginCredentials, None) atau (None, response error)
+        """
+        if not verify_telegram_auth(data.get('init_data', ''), telegram_app.bot.token):
+            return None, JSONResponse({'success': False, 'message': 'Autentikasi Telegram gagal'}, status_code=403)
+
+        credentials = decode_credentials(data.get('creds', ''))
+        if credentials is None:
+            return None, JSONResponse(
+                {'success': False, 'message': 'Kredensial tidak ada. Buka ulang dari bot.'},
+                status_code=401
+            )
+        return credentials, None
+
+    async def telegram_webhook(request: Request) -> Response:
+        received = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if not hmac.compare_digest(received, secret):
+            return PlainTextResponse("forbidden", status_code=403)
+
+        try:
+            data = await request.json()
+        except Exception:
+            return PlainTextResponse("bad request", status_code=400)
+
+        update = Update.de_json(data, telegram_app.bot)
+        await telegram_app.update_queue.put(update)
+        return Response(status_code=200)
+
+    async def index(request: Request) -> Response:
+        return HTMLResponse(MINIAPP_PAGE_HTML)
+
+    async def check_completion_api(request: Request) -> Response:
+        """
+        Cek sekali apakah forum sudah selesai (ada tanda centang) lewat browser bot
+
+        Fallback untuk client tanpa EventSource; forum yang selesai langsung
+        dicatat ke tracker.
+        """
+        try:
+            data = await request.json()
+            target = ForumTarget(
+                course_code=str(data['course_code']),
+                meeting_number=int(data['meeting_number'])
+            )
+        except Exception:
+            return JSONResponse({'completed': False, 'message': 'Forum tidak valid'}, status_code=400)
+
+        credentials, error = authorize(data)
+        if error:
+            return error
+
+        try:
+            results = await bot_core.run_forum_actions(credentials, [target], "verify")
+        except LoginFailedError:
+            return JSONResponse(
+                {'completed': False, 'message': 'Login gagal. Periksa NIM dan password.'},
+                status_code=401
+            )
+        except Exception as e:
+            logger.error(f"Completion check failed: {e}")
+            return JSONResponse({
+                'completed': False,
+                'message': f'Error checking completion: {str(e)[:100]}'
+            }, status_code=500)
+
+        result = results[0]
+        if result.success and completion_recorder:
+            await asyncio.to_thread(
+                completion_recorder, credentials.nim, target.course_code, str(target.meeting_number)
+            )
+        return JSONResponse(build_completion_response(result))
+
+    async def completion_watch_api(request: Request) -> Response:
+        """
+        Tukar kredensial Mini App dengan tiket stream status pengerjaan
+
+        Kredensial dikirim di body POST; EventSource hanya membawa tiket
+        berumur pendek sehingga password tidak masuk log akses.
+        """
+        try:
+            data = await request.json()
+            target = ForumTarget(
+                course_code=str(data['course_code']),
+                meeting_number=int(data['meeting_number'])
+            )
+        except Exception:
+            return JSONResponse({'success': False, 'message': 'Forum tidak valid'}, status_code=400)
+
+        credentials, error = authorize(data)
+        if error:
+            return error
+
+        return JSONResponse({'success': True, 'token': watch_tickets.issue(credentials, target)})
+
+    async def completion_stream_api(request: Request) -> Response:
+        """
+        Stream SSE status pengerjaan satu forum
+
+        Semua koneksi untuk akun dan forum yang sama berbagi satu watcher
+        server-side; state dikirim saat berubah, dengan heartbeat di antaranya.
+        """
+        ticket = watch_tickets.resolve(request.query_params.get('token', ''))
+        if ticket is None:
+            return JSONResponse(
+                {'completed': False, 'message': 'Tiket tidak valid atau kedaluwarsa'},
+                status_code=403
+            )
+        credentials, target = ticket
+
+        subscription = completion_hub.subscribe(credentials, target)
+
+        async def stream():
+            try:
+                while True:
+                    state = await subscription.next(timeout=SSE_HEARTBEAT)
+                    if state is None:
+                        yield b": ping\n\n"
+                        continue
+                    yield sse_event('state', state.to_dict())
+                    if state.final:
+                        break
+            finally:
+                subscription.close()
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    async def mark_completed_api(request: Request) -> Response:
+        """Catat forum selesai untuk akun pemilik kredensial Mini App"""
+        try:
+            data = await request.json()
+            course_code = str(data['course_code'])
+            meeting_number = str(int(data['meeting_number']))
+        except Exception:
+            return JSONResponse({'success': False, 'message': 'Forum tidak valid'}, status_code=400)
+
+        # NIM diambil dari kredensial terverifikasi, bukan dari body
+        credentials, error = authorize(data)
+        if error:
+            return error
+
+        try:
+            # Simpan ke tracker yang sama dengan bot (file I/O di thread)
+            if completion_recorder:
+                await asyncio.to_thread(completion_recorder, credentials.nim, course_code, meeting_number)
+            return JSONResponse(build_mark_completed_response(credentials.nim, course_code, meeting_number))
+        except Exception as e:
+            return JSONResponse({
+                'success': False,
+                'message': f'Error marking completion: {str(e)}'
+            }, status_code=500)
+
+    async def join_forum_api(request: Request) -> Response:
+        """Gabung ke satu forum lewat browser bot (auth sama dengan /api/bulk-join)"""
+        try:
+            data = await request.json()
+            target = ForumTarget(
+                course_code=str(data['course_code']),
+                meeting_number=int(data['meeting_number'])
+            )
+        except Exception:
+            return JSONResponse({'success': False, 'message': 'Forum tidak valid'}, status_code=400)
+
+        credentials, error = authorize(data)
+        if error:
+            return error
+
+        try:
+            results = await bot_core.run_forum_actions(credentials, [target], "join")
+        except LoginFailedError:
+            return JSONResponse(
+                {'success': False, 'message': 'Login gagal. Periksa NIM dan password.'},
+                status_code=401
+            )
+        except Exception as e:
+            logger.error(f"Forum join failed: {e}")
+            return JSONResponse({
+                'success': False,
+                'message': f'Error: {str(e)[:100]}'
+            }, status_code=500)
+
+        payload, status = build_participation_response(results[0], data.get('course_title', ''))
+        return JSONResponse(payload, status_code=status)
+
+    async def bulk_page(request: Request) -> Response:
+        return HTMLResponse(MINIAPP_BULK_HTML)
+
+    async def bulk_join_api(request: Request) -> Response:
+        """
+        Gabung ke banyak forum dengan satu login
+
+        Hasil dikirim sebagai NDJSON begitu setiap forum selesai: event
+        progress, result (per forum), lalu done atau error.
+        """
+        try:
+            data = await request.json()
+            targets = parse_bulk_forums(data.get('forums'))
+        except ValueError as e:
+            return JSONResponse({'success': False, 'message': str(e)}, status_code=400)
+        except Exception:
+            return JSONResponse({'success': False, 'message': 'Request tidak valid'}, status_code=400)
+
+        credentials, error = authorize(data)
+        if error:
+            return error
+
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def on_progress(text: str):
+            await events.put(bulk_event('progress', message=text))
+
+        async def on_result(result):
+            await events.put(bulk_event('result', result=result.to_dict()))
+
+        async def run():
+            try:
+                results = await bot_core.run_forum_actions(
+                    credentials, targets, "join", on_progress, on_result
+                )
+                succeeded = sum(1 for result in results if result.success)
+                await events.put(bulk_event(
+                    'done', succeeded=succeeded, failed=len(results) - succeeded
+                ))
+            except LoginFailedError:
+                await events.put(bulk_event('error', message='Login gagal. Periksa NIM dan password.'))
+            except Exception as e:
+                logger.error(f"Bulk join failed: {e}")
+                await events.put(bulk_event('error', message=f'Terjadi kesalahan: {str(e)[:100]}'))
+            finally:
+                await events.put(None)
+
+        # Batch tetap selesai walaupun client menutup Mini App di tengah jalan
+        task = asyncio.create_task(run())
+        bulk_tasks.add(task)
+        task.add_done_callback(bulk_tasks.discard)
+
+        async def stream():
+            yield bulk_event('start', total=len(targets))
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+
+        return StreamingResponse(
+            stream(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    async def api_health(request: Request) -> Response:
+        return JSONResponse(build_health_response())
+
+    async def readiness(request: Request) -> Response:
+        payload = bot_core.get_readiness()
+        return JSONResponse(payload, status_code=200 if payload.get('ready') else 503)
+
+    async def metrics(request: Request) -> Response:
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+    routes = [
+        Route(WEBHOOK_PATH, telegram_webhook, methods=["POST"]),
+        Route("/", index),
+        Route("/forum", index),
+        Route("/bulk", bulk_page),
+        Route("/api/check-completion", check_completion_api, methods=["POST"]),
+        Route("/api/completion-watch", completion_watch_api, methods=["POST"]),
+        Route("/api/completion-stream", completion_stream_api),
+        Route("/api/mark-completed", mark_completed_api, methods=["POST"]),
+        Route("/api/join-forum", join_forum_api, methods=["POST"]),
+        Route("/api/bulk-join", bulk_join_api, methods=["POST"]),
+        Route("/api/health", api_health),
+        Route("/health", readiness),
+        Route("/metrics", metrics),
+    ]
+
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.telegram_app = telegram_app
+    app.state.bot_core = bot_core
+    return app
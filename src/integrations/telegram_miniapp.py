@@ -3,6 +3,7 @@ Telegram Mini App Integration untuk Mentari UNPAM
 Modul untuk mengintegrasikan Mentari UNPAM sebagai Telegram Mini App
 """
 
+import base64
 import json
 import hashlib
 import hmac
@@ -159,12 +160,39 @@ class TelegramMiniAppGenerator:
         
         return keyboard
     
-    def generate_bulk_join_url(self, available_forums: List[Dict]) -> str:
+    def generate_forum_page_url(self, course_code: str, course_title: str, meeting_number: int,
+                                user_credentials: Optional[Dict[str, str]] = None) -> str:
         """
-        Generate Mini App URL untuk join multiple forums sekaligus
+        URL halaman /forum Mini App untuk satu forum (untuk tombol WebApp)
         
         Args:
-            available_forums: List forum yang tersedia untuk di-join
+            course_code: Kode mata kuliah
+            course_title: Nama mata kuliah (ditampilkan di halaman)
+            meeting_number: Nomor pertemuan
+            user_credentials: Credentials untuk login server-side (opsional)
+        """
+        
+        params = {
+            "course_code": course_code,
+            "course_title": course_title[:30],
+            "meeting_number": meeting_number
+        }
+        if user_credentials:
+            params["creds"] = base64.b64encode(json.dumps({
+                'nim': user_credentials.get('nim', ''),
+                'password': user_credentials.get('password', '')
+            }).encode()).decode()
+        
+        return f"{self.config.app_url.rstrip('/')}/forum?{urlencode(params)}"
+    
+    def generate_bulk_page_url(self, available_forums: List[Dict],
+                               user_credentials: Optional[Dict[str, str]] = None) -> str:
+        """
+        URL halaman /bulk Mini App (untuk tombol WebApp)
+        
+        Args:
+            available_forums: List forum (course_code, meeting_number, course_name)
+            user_credentials: Credentials untuk login server-side (opsional)
         """
         
         app_data = {
@@ -173,8 +201,26 @@ class TelegramMiniAppGenerator:
             "timestamp": int(time.time())
         }
         
-        query_params = urlencode({"data": json.dumps(app_data)})
-        mini_app_url = f"{self.config.app_url}/bulk?{query_params}"
+        params = {"data": json.dumps(app_data)}
+        if user_credentials:
+            params["creds"] = base64.b64encode(json.dumps({
+                'nim': user_credentials.get('nim', ''),
+                'password': user_credentials.get('password', '')
+            }).encode()).decode()
+        
+        return f"{self.config.app_url.rstrip('/')}/bulk?{urlencode(params)}"
+    
+    def generate_bulk_join_url(self, available_forums: List[Dict],
+                               user_credentials: Optional[Dict[str, str]] = None) -> str:
+        """
+        Generate Mini App URL untuk join multiple forums sekaligus
+        
+        Args:
+            available_forums: List forum yang tersedia untuk di-join
+            user_credentials: Credentials untuk login server-side (opsional)
+        """
+        
+        mini_app_url = self.generate_bulk_page_url(available_forums, user_credentials)
         webapp_url = f"https://t.me/{self.config.app_name}?startapp={quote(mini_app_url)}"
         
         return webapp_url
@@ -25,6 +25,31 @@ class MeetingInfo:
     message: str
     screenshot_path: Optional[str] = None
     error_details: Optional[str] = None
+    # Status disimpulkan (binary scan / indeks bersama), halaman tidak dibuka
+    estimated: bool = False
+    
+    def to_dict(self) -> dict:
+        """Serialize ke dict (JSON-safe)"""
+        return {
+            'number': self.number,
+            'status': self.status.value,
+            'message': self.message,
+            'screenshot_path': self.screenshot_path,
+            'error_details': self.error_details,
+            'estimated': self.estimated
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MeetingInfo':
+        """Deserialize dari dict hasil to_dict"""
+        return cls(
+            number=data['number'],
+            status=ForumStatus(data['status']),
+            message=data['message'],
+            screenshot_path=data.get('screenshot_path'),
+            error_details=data.get('error_details'),
+            estimated=data.get('estimated', False)
+        )
 
 
 @dataclass
@@ -40,6 +65,15 @@ class CourseInfo:
             raise ValueError("Course code and name are required")
         if not self.meetings:
             raise ValueError("At least one meeting is required")
+    
+    def to_dict(self) -> dict:
+        """Serialize ke dict (format sama dengan data/courses.json)"""
+        return {'code': self.code, 'name': self.name, 'meetings': list(self.meetings)}
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CourseInfo':
+        """Deserialize dari dict"""
+        return cls(code=data['code'], name=data['name'], meetings=list(data['meetings']))
 
 
 @dataclass
@@ -78,6 +112,23 @@ class CourseResult:
             self.unavailable_count += 1
         else:
             self.error_count += 1
+    
+    def to_dict(self) -> dict:
+        """Serialize ke dict (JSON-safe)"""
+        return {
+            'course': self.course.to_dict(),
+            'meetings_status': [meeting.to_dict() for meeting in self.meetings_status],
+            'total_meetings': self.total_meetings
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CourseResult':
+        """Deserialize dari dict; counter dihitung ulang dari meetings"""
+        result = cls.from_course_info(CourseInfo.from_dict(data['course']))
+        result.total_meetings = data.get('total_meetings', result.total_meetings)
+        for meeting_data in data['meetings_status']:
+            result.add_meeting_result(MeetingInfo.from_dict(meeting_data))
+        return result
 
 
 @dataclass
@@ -106,6 +157,69 @@ class ScrapingResult:
             success_rate=success_rate,
             execution_time=execution_time
         )
+    
+    def to_dict(self) -> dict:
+        """Serialize ke dict (JSON-safe)"""
+        return {
+            'courses': [course.to_dict() for course in self.courses],
+            'execution_time': self.execution_time
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ScrapingResult':
+        """Deserialize dari dict hasil to_dict"""
+        return cls.from_course_results(
+            [CourseResult.from_dict(course) for course in data['courses']],
+            data['execution_time']
+        )
+
+
+@dataclass
+class StatusChange:
+    """Perubahan status satu pertemuan antara dua scan"""
+    course_code: str
+    course_name: str
+    meeting_number: int
+    old_status: ForumStatus
+    new_status: ForumStatus
+
+
+@dataclass
+class ForumTarget:
+    """Satu forum (mata kuliah, pertemuan) untuk join/verifikasi"""
+    course_code: str
+    meeting_number: int
+
+    @property
+    def url(self) -> str:
+        return (
+            f"https://mentari.unpam.ac.id/u-courses/{self.course_code}"
+            f"?accord_pertemuan=PERTEMUAN_{self.meeting_number}"
+        )
+
+
+@dataclass
+class ParticipationResult:
+    """Hasil join/verifikasi satu forum"""
+    course_code: str
+    meeting_number: int
+    action: str                          # "join" atau "verify"
+    success: bool
+    status: ForumStatus
+    message: str
+    error_details: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Serialize ke dict (JSON-safe)"""
+        return {
+            'course_code': self.course_code,
+            'meeting_number': self.meeting_number,
+            'action': self.action,
+            'success': self.success,
+            'status': self.status.value,
+            'message': self.message,
+            'error_details': self.error_details
+        }
 
 
 @dataclass
@@ -120,6 +234,35 @@ class LoginCredentials:
             raise ValueError("NIM and password are required")
 
 
+DEFAULT_BROWSER_ARGS = (
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-web-security',
+    '--disable-blink-features=AutomationControlled'
+)
+
+# Flag tambahan untuk BrowserConfig.lean()
+LEAN_BROWSER_ARGS = (
+    '--disable-gpu',
+    '--disable-software-rasterizer',
+    '--disable-extensions',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,BackForwardCache',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--no-first-run',
+    '--renderer-process-limit=2',
+    '--disk-cache-size=16777216',
+    '--media-cache-size=1',
+    '--js-flags=--max-old-space-size=256'
+)
+
+
 @dataclass
 class BrowserConfig:
     """Konfigurasi browser"""
@@ -133,11 +276,20 @@ class BrowserConfig:
     
     def __post_init__(self):
         """Set default args if not provided"""
-        if self.args is None:
-            self.args = [
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-web-security',
-                '--disable-blink-features=AutomationControlled'
-            ]
+        if not self.args:
+            self.args = list(DEFAULT_BROWSER_ARGS)
+    
+    @classmethod
+    def lean(cls, **overrides) -> 'BrowserConfig':
+        """
+        Profil hemat memori untuk produksi: viewport kecil, tanpa GPU/extension/
+        background networking, jumlah renderer dan cache dibatasi
+        """
+        options = {
+            'headless': True,
+            'viewport_width': 1280,
+            'viewport_height': 800,
+            'args': list(DEFAULT_BROWSER_ARGS) + list(LEAN_BROWSER_ARGS)
+        }
+        options.update(overrides)
+        return cls(**options)
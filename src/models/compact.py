@@ -0,0 +1,302 @@
+"""
+Representasi hasil scraping yang ringkas untuk dikirim antar proses
+
+Satu pertemuan disimpan sebagai pasangan (nomor, kode status) di dalam
+array; kode status menunjuk ke tabel MEETING_CODES yang berisi status dan
+teks pesan standarnya, sehingga pesan baru dirender saat dibutuhkan. Hanya
+pertemuan dengan pesan di luar tabel, screenshot, atau detail error yang
+menyimpan data tambahan.
+
+pack_result/unpack_result mengubah hasil ke/dari format biner (struct)
+yang jauh lebih kecil dan cepat dibanding JSON dari to_dict(). Saat ini
+dipakai worker pool untuk mengirim hasil job ke proses bot; riwayat scan
+punya format kolom sendiri (history_store) dan snapshot /subscribe hanya
+menyimpan status per pertemuan.
+"""
+
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from src.models import CourseInfo, CourseResult, ForumStatus, MeetingInfo, ScrapingResult
+
+
+# Kode status -> (status, pesan standar, perkiraan). Hanya boleh ditambah di
+# akhir: indeks dipakai langsung di format biner.
+MEETING_CODES: Tuple[Tuple[ForumStatus, str, bool], ...] = (
+    (ForumStatus.JOINED, "✅ Sudah bergabung", False),
+    (ForumStatus.AVAILABLE, "🟡 Tersedia tapi belum bergabung", False),
+    (ForumStatus.AVAILABLE, "🟡 Forum tersedia (status belum jelas)", False),
+    (ForumStatus.UNAVAILABLE, "❌ Forum belum tersedia", False),
+    (ForumStatus.UNAVAILABLE, "❌ Forum belum tersedia (perkiraan)", True),
+    (ForumStatus.UNKNOWN, "❔ Status forum tidak terdeteksi", False),
+    (ForumStatus.UNKNOWN, "❔ Section tidak ditemukan", False),
+    (ForumStatus.ERROR, "❗ Error", False),
+    (ForumStatus.TIMEOUT, "⏰ Timeout - server lambat", False),
+)
+
+_CODE_BY_MESSAGE: Dict[Tuple[ForumStatus, str, bool], int] = {
+    entry: code for code, entry in enumerate(MEETING_CODES)
+}
+# Kode default per (status, perkiraan): entri pertama di tabel
+_DEFAULT_CODE: Dict[Tuple[ForumStatus, bool], int] = {}
+for _code, (_status, _, _estimated) in enumerate(MEETING_CODES):
+    _DEFAULT_CODE.setdefault((_status, _estimated), _code)
+
+# (pesan, screenshot_path, error_details); pesan None = pakai pesan standar
+MeetingExtra = Tuple[Optional[str], Optional[str], Optional[str]]
+
+_MAGIC = b"MR"
+_VERSION = 1
+_HEADER = struct.Struct("<2sBdH")      # magic, versi, execution_time, jumlah course
+_COURSE = struct.Struct("<HHHH")       # total_meetings, jumlah meetings, jumlah hasil, jumlah extra
+_EXTRA = struct.Struct("<HB")          # nomor pertemuan, flag field yang ada
+_NO_STRING = 0xFFFF
+
+
+def encode_meeting(meeting: MeetingInfo) -> Tuple[int, Optional[MeetingExtra]]:
+    """Kode status untuk satu MeetingInfo beserta data tambahan (jika ada)"""
+    prefix = f"Pertemuan {meeting.number}: "
+    suffix = meeting.message[len(prefix):] if meeting.message.startswith(prefix) else None
+    code = _CODE_BY_MESSAGE.get((meeting.status, suffix, meeting.estimated))
+
+    message = None
+    if code is None:
+        # Flag perkiraan hanya bisa disimpan untuk status yang punya kode perkiraan
+        code = _DEFAULT_CODE.get(
+            (meeting.status, meeting.estimated), _DEFAULT_CODE[(meeting.status, False)]
+        )
+        message = meeting.message
+
+    if message is None and meeting.screenshot_path is None and meeting.error_details is None:
+        return code, None
+    return code, (message, meeting.screenshot_path, meeting.error_details)
+
+
+class CompactCourseResult:
+    """Hasil satu mata kuliah dalam array (nomor, kode status)"""
+
+    __slots__ = ("code", "name", "meetings", "numbers", "codes", "total_meetings", "extras")
+
+    def __init__(
+        self,
+        code: str,
+        name: str,
+        meetings: array,
+        numbers: array,
+        codes: array,
+        total_meetings: int,
+        extras: Optional[Dict[int, MeetingExtra]] = None
+    ):
+        # Kode dan nama mata kuliah sama untuk banyak user - simpan satu salinan
+        self.code = sys.intern(code)
+        self.name = sys.intern(name)
+        self.meetings = meetings
+        self.numbers = numbers
+        self.codes = codes
+        self.total_meetings = total_meetings
+        self.extras = extras or None
+
+    @classmethod
+    def from_course_result(cls, course_result: CourseResult) -> "CompactCourseResult":
+        numbers = array("H")
+        codes = array("B")
+        extras: Dict[int, MeetingExtra] = {}
+
+        for meeting in course_result.meetings_status:
+            code, extra = encode_meeting(meeting)
+            numbers.append(meeting.number)
+            codes.append(code)
+            if extra is not None:
+                extras[meeting.number] = extra
+
+        return cls(
+            course_result.course.code,
+            course_result.course.name,
+            array("H", course_result.course.meetings),
+            numbers,
+            codes,
+            course_result.total_meetings,
+            extras
+        )
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def __iter__(self) -> Iterator[Tuple[int, ForumStatus]]:
+        for number, code in zip(self.numbers, self.codes):
+            yield number, MEETING_CODES[code][0]
+
+    def count(self, status: ForumStatus) -> int:
+        return sum(1 for code in self.codes if MEETING_CODES[code][0] == status)
+
+    def message(self, index: int) -> str:
+        """Render pesan pertemuan ke-index"""
+        number = self.numbers[index]
+        extra = self.extras.get(number) if self.extras else None
+        if extra is not None and extra[0] is not None:
+            return extra[0]
+        return f"Pertemuan {number}: {MEETING_CODES[self.codes[index]][1]}"
+
+    def meeting(self, index: int) -> MeetingInfo:
+        number = self.numbers[index]
+        extra = self.extras.get(number) if self.extras else None
+        return MeetingInfo(
+            number=number,
+            status=MEETING_CODES[self.codes[index]][0],
+            message=self.message(index),
+            screenshot_path=extra[1] if extra else None,
+            error_details=extra[2] if extra else None,
+            estimated=MEETING_CODES[self.codes[index]][2]
+        )
+
+    def to_course_result(self) -> CourseResult:
+        """CourseResult lengkap (pesan dirender di sini)"""
+        result = CourseResult.from_course_info(
+            CourseInfo(code=self.code, name=self.name, meetings=list(self.meetings))
+        )
+        result.total_meetings = self.total_meetings
+        for index in range(len(self.numbers)):
+            result.add_meeting_result(self.meeting(index))
+        return result
+
+
+class CompactScrapingResult:
+    """ScrapingResult ringkas (format hasil job dari worker process)"""
+
+    __slots__ = ("courses", "execution_time")
+
+    def __init__(self, courses: Tuple[CompactCourseResult, ...], execution_time: float):
+        self.courses = courses
+        self.execution_time = execution_time
+
+    @classmethod
+    def from_result(cls, result: ScrapingResult) -> "CompactScrapingResult":
+        return cls(
+            tuple(CompactCourseResult.from_course_result(course) for course in result.courses),
+            result.execution_time
+        )
+
+    @property
+    def total_meetings(self) -> int:
+        return sum(course.total_meetings for course in self.courses)
+
+    def count(self, status: ForumStatus) -> int:
+        return sum(course.count(status) for course in self.courses)
+
+    def to_result(self) -> ScrapingResult:
+        return ScrapingResult.from_course_results(
+            [course.to_course_result() for course in self.courses],
+            self.execution_time
+        )
+
+
+def _le_bytes(values: array) -> bytes:
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _le_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values.byteswap()
+    return values
+
+
+def _pack_string(parts: List[bytes], value: str):
+    data = value.encode("utf-8")
+    if len(data) >= _NO_STRING:
+        data = data[:_NO_STRING - 1].decode("utf-8", "ignore").encode("utf-8")
+    parts.append(struct.pack("<H", len(data)))
+    parts.append(data)
+
+
+def pack_result(result: Union[ScrapingResult, CompactScrapingResult]) -> bytes:
+    """Serialize hasil scraping ke format biner ringkas"""
+    if isinstance(result, ScrapingResult):
+        result = CompactScrapingResult.from_result(result)
+
+    parts = [_HEADER.pack(_MAGIC, _VERSION, result.execution_time, len(result.courses))]
+    for course in result.courses:
+        extras = course.extras or {}
+        _pack_string(parts, course.code)
+        _pack_string(parts, course.name)
+        parts.append(_COURSE.pack(
+            course.total_meetings, len(course.meetings), len(course.numbers), len(extras)
+        ))
+        parts.append(_le_bytes(course.meetings))
+        parts.append(_le_bytes(course.numbers))
+        parts.append(course.codes.tobytes())
+
+        for number, extra in extras.items():
+            present = sum(1 << i for i, value in enumerate(extra) if value is not None)
+            parts.append(_EXTRA.pack(number, present))
+            for value in extra:
+                if value is not None:
+                    _pack_string(parts, value)
+
+    return b"".join(parts)
+
+
+def unpack_result(data: bytes) -> CompactScrapingResult:
+    """
+    Deserialize hasil pack_result
+
+    Raises:
+        ValueError: Jika data bukan format yang dikenal
+    """
+    view = memoryview(data)
+    try:
+        magic, version, execution_time, course_count = _HEADER.unpack_from(view, 0)
+    except struct.error as e:
+        raise ValueError(f"Invalid packed result: {e}") from e
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Unsupported packed result format")
+
+    offset = _HEADER.size
+
+    def read_bytes(length: int) -> bytes:
+        nonlocal offset
+        if offset + length > len(view):
+            raise struct.error(f"need {length} bytes at offset {offset}")
+        chunk = bytes(view[offset:offset + length])
+        offset += length
+        return chunk
+
+    def read_string() -> str:
+        nonlocal offset
+        (length,) = struct.unpack_from("<H", view, offset)
+        offset += 2
+        return read_bytes(length).decode("utf-8")
+
+    courses = []
+    try:
+        for _ in range(course_count):
+            code = read_string()
+            name = read_string()
+            total_meetings, meeting_count, result_count, extra_count = _COURSE.unpack_from(view, offset)
+            offset += _COURSE.size
+
+            meetings = _le_array("H", read_bytes(meeting_count * 2))
+            numbers = _le_array("H", read_bytes(result_count * 2))
+            codes = array("B", read_bytes(result_count))
+
+            extras: Dict[int, MeetingExtra] = {}
+            for _ in range(extra_count):
+                number, present = _EXTRA.unpack_from(view, offset)
+                offset += _EXTRA.size
+                extras[number] = tuple(
+                    read_string() if present & (1 << i) else None for i in range(3)
+                )
+
+            courses.append(CompactCourseResult(
+                code, name, meetings, numbers, codes, total_meetings, extras
+            ))
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Truncated packed result: {e}") from e
+
+    return CompactScrapingResult(tuple(courses), execution_time)
@@ -0,0 +1,94 @@
+"""
+Utility untuk menyimpan artifact debugging (trace, screenshot, video)
+di direktori dengan batas ukuran
+"""
+
+import logging
+import os
+import time
+from typing import List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+def _list_files(directory: str) -> List[Tuple[float, int, str]]:
+    """List (mtime, size, path) untuk semua file di directory"""
+    entries = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def prune_directory(
+    directory: str,
+    max_bytes: int,
+    max_age_seconds: Optional[float] = None,
+    min_age_seconds: float = 0
+) -> int:
+    """
+    Hapus file terlama sampai total ukuran directory <= max_bytes
+
+    File yang lebih tua dari max_age_seconds selalu dihapus. File yang lebih
+    muda dari min_age_seconds tidak pernah dihapus (mis. video yang masih
+    ditulis oleh context yang aktif).
+
+    Returns:
+        int: Jumlah file yang dihapus
+    """
+    entries = sorted(_list_files(directory))
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+
+    for mtime, size, path in entries:
+        if now - mtime < min_age_seconds:
+            continue
+        too_old = max_age_seconds is not None and now - mtime > max_age_seconds
+        if not too_old and total <= max_bytes:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError as e:
+            logger.debug(f"Failed to remove artifact {path}: {e}")
+
+    if removed:
+        logger.debug(f"Pruned {removed} artifact(s) from {directory}")
+    return removed
+
+
+def write_artifact(path: str, data: bytes):
+    """Tulis artifact ke disk (dipanggil lewat asyncio.to_thread)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def directory_size(directory: str) -> int:
+    """Total ukuran file di directory dalam bytes"""
+    return sum(size for _, size, _ in _list_files(directory))
+
+
+def sweep_artifacts(settings) -> int:
+    """
+    Terapkan batas ukuran/umur ke directory screenshot dan video
+
+    Returns:
+        int: Jumlah file yang dihapus
+    """
+    max_age = settings.artifact_max_age_hours * 3600
+    removed = prune_directory(
+        settings.screenshot_dir, settings.screenshot_dir_max_mb * 1024 * 1024, max_age
+    )
+    removed += prune_directory(
+        settings.video_dir, settings.video_dir_max_mb * 1024 * 1024, max_age, min_age_seconds=600
+    )
+    return removed
@@ -11,6 +11,8 @@ from playwright.async_api import BrowserContext, Page, TimeoutError as Playwrigh
 
 from src.models import LoginCredentials, BrowserConfig
 from src.config import app_settings, env_config
+from src.core.metrics import time_phase
+from src.services.page_pool import PagePool
 
 
 logger = logging.getLogger(__name__)
@@ -98,7 +100,8 @@ class MentariLoginService:
             bool: True jika login berhasil, False jika gagal
         """
         
-        page = await context.new_page()
+        pool = PagePool.for_context(context, self.settings)
+        page = await pool.acquire()
         
         try:
             logger.info("Starting login process to Mentari UNPAM")
@@ -106,20 +109,22 @@ class MentariLoginService:
             if progress_callback:
                 await progress_callback("🔐 Memulai proses login...")
             
-            # Configure page
-            await self._configure_page(page)
-            
             # Navigate to login page
-            await self._navigate_to_login(page, progress_callback)
+            with time_phase("login_navigate"):
+                await self._navigate_to_login(page, progress_callback)
             
             # Fill login form
-            await self._fill_login_form(page, credentials, progress_callback)
+            with time_phase("login_fill_form"):
+                await self._fill_login_form(page, credentials, progress_callback)
             
             # Handle CAPTCHA if present
-            await self._handle_captcha(page, progress_callback)
+            with time_phase("login_captcha_check"):
+                await self._handle_captcha(page, progress_callback)
             
             # Submit form and wait for result
-            success = await self._submit_and_verify(page, progress_callback)
+            with time_phase("login_submit") as phase:
+                success = await self._submit_and_verify(page, progress_callback)
+                phase.outcome = "ok" if success else "failed"
             
             if success:
                 logger.info("Login successful")
@@ -139,23 +144,8 @@ class MentariLoginService:
             return False
             
         finally:
-            await page.close()
-    
-    async def _configure_page(self, page: Page):
-        """Konfigurasi page untuk login"""
-        # Set timeout
-        page.set_default_timeout(self.settings.browser_config.timeout)
-        
-        # Set viewport  
-        await page.set_viewport_size({
-            "width": self.settings.browser_config.viewport_width,
-            "height": self.settings.browser_config.viewport_height
-        })
-        
-        # Set user agent
-        await page.set_extra_http_headers({
-            'User-Agent': self.settings.browser_config.user_agent
-        })
+            # Page dipakai ulang untuk scraping (cookie login ada di context)
+            await pool.release(page)
     
     async def _navigate_to_login(self, page: Page, progress_callback: Optional[callable] = None):
         """Navigate ke halaman login"""
@@ -308,7 +298,9 @@ class MentariLoginService:
                 # Import captcha solver
                 from src.services.captcha_solver import solve_recaptcha
                 
-                success = await solve_recaptcha(page, env_config.captcha_api_key)
+                with time_phase("captcha_solve") as phase:
+                    success = await solve_recaptcha(page, env_config.captcha_api_key)
+                    phase.outcome = "ok" if success else "failed"
                 
                 if success:
                     logger.info("CAPTCHA solved successfully")
@@ -0,0 +1,92 @@
+"""
+Indeks ketersediaan forum bersama untuk semua user
+
+Ada/tidaknya forum satu pertemuan sama untuk semua mahasiswa di kelas yang
+sama (kode mata kuliah Mentari sudah memuat kode kelas). Setiap hasil scan
+dicatat di sini; selama TTL belum lewat, scan user lain melewati pertemuan
+yang masih UNAVAILABLE tanpa membuka halamannya. Saat pertemuan berubah dari
+tertutup menjadi terbuka, listener (scheduler /subscribe) diberi tahu.
+
+Indeks ada per proses. Dengan worker pool, tiap worker punya indeks sendiri
+dan proses bot mengisi indeksnya dari hasil akhir setiap job.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.config import env_config
+from src.models import ForumStatus, MeetingInfo, ScrapingResult
+
+
+logger = logging.getLogger(__name__)
+
+
+OPEN_STATUSES = {ForumStatus.AVAILABLE, ForumStatus.JOINED}
+
+ForumOpenedListener = Callable[[str, int], None]
+
+
+class AvailabilityIndex:
+    """(kode mata kuliah, pertemuan) -> (forum ada?, waktu observasi)"""
+
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[bool, float]] = {}
+        self._listeners: List[ForumOpenedListener] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def add_listener(self, listener: ForumOpenedListener):
+        """listener(course_code, meeting_number) dipanggil saat forum baru terbuka"""
+        self._listeners.append(listener)
+
+    def observe(self, course_code: str, meeting: MeetingInfo, observed_at: Optional[float] = None):
+        """
+        Catat hasil satu pertemuan
+
+        Status sementara (error/timeout/unknown) dan status perkiraan (tidak
+        membuka halaman) diabaikan agar TTL selalu dihitung dari observasi nyata.
+        """
+        if meeting.estimated:
+            return
+        if meeting.status in OPEN_STATUSES:
+            exists = True
+        elif meeting.status == ForumStatus.UNAVAILABLE:
+            exists = False
+        else:
+            return
+
+        key = (course_code, meeting.number)
+        previous = self._entries.get(key)
+        observed_at = observed_at if observed_at is not None else time.time()
+        if previous is not None and previous[1] > observed_at:
+            # Hasil job lama yang baru selesai tidak menimpa observasi yang lebih baru
+            return
+        self._entries[key] = (exists, observed_at)
+
+        if exists and previous is not None and not previous[0]:
+            logger.info(f"Forum opened: {course_code} meeting {meeting.number}")
+            for listener in list(self._listeners):
+                try:
+                    listener(course_code, meeting.number)
+                except Exception as e:
+                    logger.warning(f"Forum-opened listener failed: {e}")
+
+    def observe_result(self, result: ScrapingResult, observed_at: Optional[float] = None):
+        for course_result in result.courses:
+            for meeting in course_result.meetings_status:
+                self.observe(course_result.course.code, meeting, observed_at)
+
+    def known_unavailable(self, course_code: str, meeting_number: int) -> bool:
+        """True jika pertemuan terlihat belum tersedia dalam TTL terakhir"""
+        if not self.enabled:
+            return False
+        entry = self._entries.get((course_code, meeting_number))
+        return entry is not None and not entry[0] and time.time() - entry[1] <= self.ttl
+
+
+# Global index instance
+availability_index = AvailabilityIndex(env_config.availability_ttl)
@@ -0,0 +1,296 @@
+"""
+Watcher status pengerjaan forum untuk Mini App
+
+Watcher dikelompokkan per akun: semua forum yang dipantau untuk satu akun
+diverifikasi dalam satu run_forum_actions (satu login untuk semua forum).
+Interval cek makin jarang selama tidak ada status yang berubah (backoff) dan
+tidak pernah lebih rapat dari initial_interval, karena setiap cek berarti
+login baru (termasuk CAPTCHA). State dikirim ke pelanggan hanya saat berubah;
+semua tab dan klik "Cek Status" untuk forum yang sama berbagi watcher.
+
+Watcher forum berhenti saat forum selesai, login gagal, atau tidak ada
+pelanggan lagi ketika jadwal cek berikutnya tiba. Loop akun berhenti saat
+tidak ada forum yang dipantau.
+
+Kredensial tidak pernah lewat query string: Mini App menukarnya lewat POST
+dengan tiket berumur pendek (WatchTickets) yang dipakai EventSource.
+"""
+
+import asyncio
+import logging
+import secrets
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.models import ForumTarget, LoginCredentials
+from src.core.bot_service import LoginFailedError
+from src.core.metrics import COMPLETION_WATCHERS
+from src.core.single_flight import credentials_key
+
+
+logger = logging.getLogger(__name__)
+
+
+COMPLETED = "completed"
+INCOMPLETE = "incomplete"
+ERROR = "error"
+LOGIN_FAILED = "login_failed"
+FINAL_STATES = (COMPLETED, LOGIN_FAILED)
+
+
+@dataclass
+class CompletionState:
+    """State pengerjaan satu forum yang dikirim ke Mini App"""
+    state: str
+    message: str
+    checked_at: float
+    next_check_in: Optional[float] = None
+
+    @property
+    def final(self) -> bool:
+        return self.state in FINAL_STATES
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _Watch:
+    """Watcher satu forum beserta pelanggannya"""
+
+    __slots__ = ("target", "subscribers", "state")
+
+    def __init__(self, target: ForumTarget):
+        self.target = target
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.state: Optional[CompletionState] = None
+
+
+class _Account:
+    """Semua forum yang dipantau untuk satu akun; satu loop verifikasi"""
+
+    __slots__ = ("key", "credentials", "watches", "wake", "task", "checked_at")
+
+    def __init__(self, key: str, credentials: LoginCredentials):
+        self.key = key
+        self.credentials = credentials
+        self.watches: Dict[Tuple[str, int], _Watch] = {}
+        self.wake = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.checked_at = 0.0
+
+
+class CompletionSubscription:
+    """Langganan satu client ke watcher"""
+
+    def __init__(self, watch: _Watch, queue: asyncio.Queue):
+        self._watch = watch
+        self._queue = queue
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[CompletionState]:
+        """State berikutnya, atau None jika timeout lewat (untuk heartbeat)"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self._watch.subscribers.discard(self._queue)
+
+
+class WatchTickets:
+    """Tiket berumur pendek untuk membuka stream tanpa kredensial di URL"""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._tickets: Dict[str, Tuple[LoginCredentials, ForumTarget, float]] = {}
+
+    def issue(self, credentials: LoginCredentials, target: ForumTarget) -> str:
+        """Buat tiket; tiket kedaluwarsa dibuang sekalian"""
+        now = time.time()
+        for token in [token for token, (_, _, expires) in self._tickets.items() if expires <= now]:
+            del self._tickets[token]
+
+        token = secrets.token_urlsafe(24)
+        self._tickets[token] = (credentials, target, now + self.ttl)
+        return token
+
+    def resolve(self, token: str) -> Optional[Tuple[LoginCredentials, ForumTarget]]:
+        """
+        Kredensial dan forum milik tiket, atau None jika tidak dikenal/kedaluwarsa
+
+        Tiket bisa dipakai ulang sampai kedaluwarsa supaya EventSource bisa
+        reconnect sendiri.
+        """
+        ticket = self._tickets.get(token)
+        if ticket is None:
+            return None
+        credentials, target, expires = ticket
+        if expires <= time.time():
+            del self._tickets[token]
+            return None
+        return credentials, target
+
+
+class CompletionWatchHub:
+    """Registry watcher forum, dikelompokkan per akun"""
+
+    def __init__(
+        self,
+        bot_core,
+        on_completed: Optional[Callable[[str, str, str], None]] = None,
+        initial_interval: float = 120.0,
+        max_interval: float = 900.0,
+        backoff: float = 2.0
+    ):
+        """
+        Args:
+            bot_core: MentariBotCore untuk verifikasi (run_forum_actions)
+            on_completed: Fungsi sync (nim, kode, pertemuan) saat forum selesai
+            initial_interval: Jeda cek setelah status berubah, sekaligus jeda
+                minimal antar cek untuk satu akun (detik)
+            max_interval: Jeda cek maksimal selama status tetap
+            backoff: Pengali jeda setiap cek tanpa perubahan
+        """
+        self.bot_core = bot_core
+        self.on_completed = on_completed
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._accounts: Dict[str, _Account] = {}
+
+    @property
+    def watching(self) -> int:
+        return sum(len(account.watches) for account in self._accounts.values())
+
+    def subscribe(self, credentials: LoginCredentials, target: ForumTarget) -> CompletionSubscription:
+        """
+        Berlangganan state forum; watcher dibuat jika belum ada
+
+        State terakhir langsung dikirim ke pelanggan baru. Forum baru atau
+        state yang sudah basi membangunkan loop akun, tapi cek tetap tidak
+        lebih rapat dari initial_interval sejak cek terakhir akun tersebut.
+        """
+        key = credentials_key(credentials.nim, credentials.password, "completion")
+        account = self._accounts.get(key)
+        if account is None:
+            account = _Account(key, credentials)
+            self._accounts[key] = account
+            account.task = asyncio.create_task(self._run(account))
+
+        target_key = (target.course_code, target.meeting_number)
+        watch = account.watches.get(target_key)
+        if watch is None:
+            watch = _Watch(target)
+            account.watches[target_key] = watch
+            COMPLETION_WATCHERS.inc()
+            account.wake.set()
+        elif watch.state is not None and time.time() - watch.state.checked_at >= self.initial_interval:
+            account.wake.set()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        if watch.state is not None:
+            queue.put_nowait(watch.state)
+        watch.subscribers.add(queue)
+        return CompletionSubscription(watch, queue)
+
+    async def stop(self):
+        """Hentikan semua watcher"""
+        tasks = [account.task for account in self._accounts.values() if account.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _publish(self, watch: _Watch, state: CompletionState):
+        watch.state = state
+        for queue in list(watch.subscribers):
+            queue.put_nowait(state)
+
+    def _drop(self, account: _Account, watch: _Watch):
+        if account.watches.pop((watch.target.course_code, watch.target.meeting_number), None) is watch:
+            COMPLETION_WATCHERS.dec()
+
+    async def _check(self, account: _Account, watches: List[_Watch]) -> List[CompletionState]:
+        """Verifikasi semua forum akun dalam satu login"""
+        targets = [watch.target for watch in watches]
+        try:
+            results = await self.bot_core.run_forum_actions(account.credentials, targets, "verify")
+        except LoginFailedError:
+            state = CompletionState(LOGIN_FAILED, "❌ Login gagal. Periksa NIM dan password.", time.time())
+            return [state] * len(watches)
+        except Exception as e:
+            logger.warning(f"Completion check failed: {e}")
+            state = CompletionState(ERROR, "❗ Gagal memeriksa status, mencoba lagi nanti", time.time())
+            return [state] * len(watches)
+
+        checked_at = time.time()
+        return [
+            CompletionState(COMPLETED, "✅ Forum diskusi sudah selesai (ada tanda centang)", checked_at)
+            if result.success else CompletionState(INCOMPLETE, result.message, checked_at)
+            for result in results
+        ]
+
+    async def _complete(self, account: _Account, watch: _Watch):
+        if not self.on_completed:
+            return
+        try:
+            await asyncio.to_thread(
+                self.on_completed, account.credentials.nim,
+                watch.target.course_code, str(watch.target.meeting_number)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record forum completion: {e}")
+
+    async def _run(self, account: _Account):
+        interval = self.initial_interval
+        try:
+            while account.watches:
+                watches = list(account.watches.values())
+                account.wake.clear()
+                account.checked_at = time.time()
+                states = await self._check(account, watches)
+
+                changed = [
+                    watch.state is None or (watch.state.state, watch.state.message) != (state.state, state.message)
+                    for watch, state in zip(watches, states)
+                ]
+                interval = self.initial_interval if any(changed) else min(interval * self.backoff, self.max_interval)
+
+                for watch, state, state_changed in zip(watches, states, changed):
+                    if state.final:
+                        # Dicatat dulu supaya tracker sudah terisi saat client menerima state
+                        if state.state == COMPLETED:
+                            await self._complete(account, watch)
+                        self._publish(watch, state)
+                        self._drop(account, watch)
+                        continue
+
+                    state.next_check_in = interval
+                    if state_changed:
+                        self._publish(watch, state)
+                    else:
+                        watch.state = state
+
+                if not account.watches:
+                    return
+
+                # Dibangunkan lebih awal (forum baru / state basi) tetap
+                # menunggu jeda minimal sejak cek terakhir
+                try:
+                    await asyncio.wait_for(account.wake.wait(), interval)
+                except asyncio.TimeoutError:
+                    pass
+                remaining = account.checked_at + self.initial_interval - time.time()
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+
+                for watch in list(account.watches.values()):
+                    if not watch.subscribers:
+                        self._drop(account, watch)
+                if not account.watches:
+                    logger.debug("Completion watchers idle, stopping account loop")
+        finally:
+            for watch in list(account.watches.values()):
+                self._drop(account, watch)
+            if self._accounts.get(account.key) is account:
+                del self._accounts[account.key]
@@ -0,0 +1,146 @@
+"""
+Service untuk mendeteksi mata kuliah yang diambil user dari dashboard Mentari
+
+Dijalankan sekali setelah login; hasilnya di-cache per NIM dengan TTL.
+Jika dashboard tidak bisa dibaca, scraper kembali memakai data/courses.json.
+"""
+
+import logging
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from playwright.async_api import BrowserContext
+
+from src.models import CourseInfo
+from src.config import app_settings, env_config, course_config
+from src.core.metrics import time_phase
+from src.services.page_pool import PagePool
+
+
+logger = logging.getLogger(__name__)
+
+
+COURSE_LINK_SELECTOR = "a[href*='/u-courses/']"
+
+# Ambil href + teks semua link mata kuliah dalam satu round-trip ke browser
+_COLLECT_LINKS_JS = """
+(links) => links.map(a => ({
+    href: a.getAttribute('href') || '',
+    text: (a.innerText || a.getAttribute('title') || '').trim()
+}))
+"""
+
+
+def parse_course_links(
+    links: List[Dict[str, str]],
+    meetings_for: Callable[[str, str], List[int]]
+) -> List[CourseInfo]:
+    """
+    Ubah link /u-courses/<kode> menjadi CourseInfo unik (urutan dashboard)
+
+    Args:
+        meetings_for: (kode, nama) -> daftar pertemuan yang dicek
+    """
+    courses: Dict[str, CourseInfo] = {}
+
+    for link in links:
+        path = urlparse(link.get('href', '')).path
+        if '/u-courses/' not in path:
+            continue
+        code = unquote(path.split('/u-courses/', 1)[1].strip('/').split('/')[0])
+        if not code or code in courses:
+            continue
+
+        name_lines = [line.strip() for line in link.get('text', '').splitlines() if line.strip()]
+        name = max(name_lines, key=len) if name_lines else code
+        courses[code] = CourseInfo(code=code, name=name, meetings=list(meetings_for(code, name)))
+
+    return list(courses.values())
+
+
+class EnrollmentService:
+    """Deteksi dan cache daftar mata kuliah per NIM"""
+
+    def __init__(self, settings=None, ttl: Optional[float] = None):
+        self.settings = settings or app_settings
+        self.ttl = env_config.enrollment_cache_ttl if ttl is None else ttl
+        self.dashboard_url = f"{env_config.mentari_base_url}/dashboard"
+        self._cache: Dict[str, Tuple[float, List[CourseInfo]]] = {}
+
+    def meeting_lookup(self) -> Callable[[str, str], List[int]]:
+        """
+        Pertemuan yang dicek untuk mata kuliah hasil deteksi
+
+        Dashboard tidak memuat daftar pertemuan. Mata kuliah yang ada di
+        courses.json (dicocokkan lewat kode, lalu nama) memakai daftar
+        pertemuannya sendiri; mata kuliah lain memakai daftar pertemuan yang
+        paling umum di courses.json.
+        """
+        configured = course_config.get_default_courses()
+        by_code = {course.code: course.meetings for course in configured}
+        by_name = {course.name.casefold(): course.meetings for course in configured}
+        common = Counter(tuple(course.meetings) for course in configured).most_common(1)
+        fallback = list(common[0][0]) if common else [1, 2, 3]
+
+        def meetings_for(code: str, name: str) -> List[int]:
+            return list(by_code.get(code) or by_name.get(name.casefold()) or fallback)
+
+        return meetings_for
+
+    def cached(self, nim: str) -> Optional[List[CourseInfo]]:
+        entry = self._cache.get(nim)
+        if entry is None:
+            return None
+        stored_at, courses = entry
+        if time.time() - stored_at > self.ttl:
+            del self._cache[nim]
+            return None
+        return courses
+
+    def store(self, nim: str, courses: List[CourseInfo]):
+        """Simpan hasil deteksi; entry NIM lain yang sudah kedaluwarsa dibuang"""
+        now = time.time()
+        expired = [key for key, (stored_at, _) in self._cache.items() if now - stored_at > self.ttl]
+        for key in expired:
+            del self._cache[key]
+        self._cache[nim] = (now, courses)
+
+    def invalidate(self, nim: str):
+        self._cache.pop(nim, None)
+
+    async def discover(self, context: BrowserContext, nim: str) -> Optional[List[CourseInfo]]:
+        """
+        Baca daftar mata kuliah dari dashboard (context harus sudah login)
+
+        Returns:
+            Optional[List[CourseInfo]]: None jika tidak ada mata kuliah terdeteksi
+        """
+        courses = self.cached(nim)
+        if courses is not None:
+            logger.info(f"Using cached enrollment ({len(courses)} courses)")
+            return courses
+
+        pool = PagePool.for_context(context, self.settings)
+        try:
+            with time_phase("enrollment_discovery") as phase:
+                async with pool.page() as page:
+                    await page.goto(self.dashboard_url, timeout=20000, wait_until="domcontentloaded")
+                    try:
+                        await page.wait_for_selector(COURSE_LINK_SELECTOR, timeout=8000)
+                    except Exception:
+                        logger.debug("No course links on dashboard")
+                    links = await page.eval_on_selector_all(COURSE_LINK_SELECTOR, _COLLECT_LINKS_JS)
+                courses = parse_course_links(links, self.meeting_lookup())
+                phase.outcome = "found" if courses else "not_found"
+        except Exception as e:
+            logger.warning(f"Enrollment discovery failed: {e}")
+            return None
+
+        if not courses:
+            return None
+
+        logger.info(f"Discovered {len(courses)} enrolled courses")
+        self.store(nim, courses)
+        return courses
@@ -6,24 +6,46 @@ import asyncio
 import logging
 import os
 import time
-from typing import List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
+from urllib.parse import urlparse
 from playwright.async_api import Page, BrowserContext
 
 from src.models import (
     CourseInfo, CourseResult, MeetingInfo, ForumStatus, 
     BrowserConfig, ScrapingResult
 )
-from src.config import app_settings
+from src.config import app_settings, env_config
+from src.core.metrics import time_phase, MEETINGS_TOTAL, MEETING_LOADS_SKIPPED
+from src.core.health_monitor import connectivity_monitor
+from src.services.artifact_store import write_artifact
+from src.services.availability_index import availability_index
+from src.services.page_pool import PagePool
+from src.services.trace_sampler import PROBLEM_STATUSES
 
 
 logger = logging.getLogger(__name__)
 
 
+# Batas navigasi paralel per host untuk semua job di proses ini
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _host_slots(url: str) -> asyncio.Semaphore:
+    host = urlparse(url).netloc
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, env_config.max_concurrent_loads_per_host))
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+
 class ForumScraperService:
     """Service untuk scraping status forum diskusi"""
     
     def __init__(self, settings=None):
         self.settings = settings or app_settings
+        # Screenshot yang masih berjalan per page; page tidak dipakai ulang sebelum selesai
+        self._captures: Dict[Page, asyncio.Task] = {}
         self._ensure_directories()
     
     def _ensure_directories(self):
@@ -37,9 +59,19 @@ class ForumScraperService:
         self, 
         context: BrowserContext, 
         courses: List[CourseInfo],
-        progress_callback: Optional[Callable[[str], None]] = None
+        progress_callback: Optional[Callable[[str], None]] = None,
+        checkpoint=None,
+        course_callback: Optional[Callable[[CourseResult], None]] = None
     ) -> ScrapingResult:
-        """Scrape semua mata kuliah"""
+        """
+        Scrape semua mata kuliah
+        
+        Args:
+            checkpoint: JobCheckpoint opsional; pertemuan yang sudah tersimpan
+                dilewati dan hasil baru di-checkpoint begitu selesai
+            course_callback: Dipanggil dengan CourseResult begitu satu mata
+                kuliah selesai (untuk pengiriman laporan bertahap)
+        """
         
         start_time = time.time()
         course_results = []
@@ -54,7 +86,9 @@ class ForumScraperService:
             logger.info(f"Processing course: {course.name}")
             
             try:
-                course_result = await self._scrape_single_course(context, course, progress_callback, idx + 1, len(courses))
+                course_result = await self._scrape_single_course(
+                    context, course, progress_callback, idx + 1, len(courses), checkpoint
+                )
                 course_results.append(course_result)
                 
                 # Reduced delay between courses for speed
@@ -74,9 +108,19 @@ class ForumScraperService:
                     )
                     error_result.add_meeting_result(error_meeting)
                 course_results.append(error_result)
+            
+            if course_callback:
+                try:
+                    await course_callback(course_results[-1])
+                except Exception as e:
+                    logger.warning(f"Course result delivery failed for {course.name}: {e}")
         
         execution_time = time.time() - start_time
         
+        for course_result in course_results:
+            for meeting in course_result.meetings_status:
+                MEETINGS_TOTAL.inc(status=meeting.status.value)
+        
         if progress_callback:
             total_meetings = sum(len(course.meetings) for course in courses)
             completed_meetings = sum(len(result.meetings_status) for result in course_results)
@@ -90,18 +134,199 @@ class ForumScraperService:
         course: CourseInfo,
         progress_callback: Optional[Callable[[str], None]] = None,
         course_idx: int = 1,
-        total_courses: int = 1
+        total_courses: int = 1,
+        checkpoint=None
     ) -> CourseResult:
         """Scrape satu mata kuliah"""
         
-        page = await context.new_page()
-        await self._configure_page(page)
-        
         course_result = CourseResult.from_course_info(course)
+        
+        # Pakai hasil dari run sebelumnya (resume setelah restart)
+        pending_meetings = []
+        for idx, meeting_num in enumerate(course.meetings):
+            previous = checkpoint.get(course.code, meeting_num) if checkpoint else None
+            if previous and previous.status not in (ForumStatus.ERROR, ForumStatus.TIMEOUT):
+                course_result.add_meeting_result(previous)
+            elif availability_index.known_unavailable(course.code, meeting_num):
+                # Scan user lain baru saja melihat forum ini belum tersedia
+                MEETING_LOADS_SKIPPED.inc(reason="shared_index")
+                course_result.add_meeting_result(self._estimated_unavailable(meeting_num))
+            else:
+                pending_meetings.append((idx, meeting_num))
+        
+        if not pending_meetings:
+            logger.info(f"All meetings for {course.name} restored from checkpoint")
+            return course_result
+        
+        pool = PagePool.for_context(context, self.settings)
+        remaining = pending_meetings
+        inferred: List[int] = []
+        
+        if self.settings.scan_strategy == "binary" and len(pending_meetings) > 2:
+            probed, inferred = await self._find_open_boundary(
+                pool, course, pending_meetings, progress_callback
+            )
+            for meeting_result in probed.values():
+                await self._record_meeting(course_result, course, meeting_result, checkpoint)
+            remaining = [
+                (idx, meeting_num) for idx, meeting_num in pending_meetings
+                if meeting_num not in probed and meeting_num not in inferred
+            ]
+        
+        await self._scan_meetings(
+            pool, course, remaining, course_result,
+            progress_callback, course_idx, total_courses, checkpoint
+        )
+        
+        if inferred:
+            # Pertemuan tertutup pertama yang ditemukan binary search (selalu di-probe)
+            boundary = min(
+                meeting_num for meeting_num, meeting_result in probed.items()
+                if meeting_result.status == ForumStatus.UNAVAILABLE
+            )
+            non_monotonic = any(
+                meeting.status == ForumStatus.UNAVAILABLE and not meeting.estimated
+                and meeting.number < boundary
+                for meeting in course_result.meetings_status
+            )
+            if non_monotonic and self.settings.binary_scan_fallback:
+                # Ada forum tertutup sebelum batas - urutan tidak monoton, cek sisanya satu per satu
+                logger.info(f"Non-monotonic forum sequence in {course.name}, falling back to exhaustive scan")
+                await self._scan_meetings(
+                    pool, course,
+                    [(idx, num) for idx, num in pending_meetings if num in inferred],
+                    course_result, progress_callback, course_idx, total_courses, checkpoint
+                )
+            else:
+                MEETING_LOADS_SKIPPED.inc(len(inferred), reason="binary_scan")
+                for meeting_num in inferred:
+                    course_result.add_meeting_result(self._estimated_unavailable(meeting_num))
+        
+        # Progress update setelah course selesai
+        if progress_callback:
+            completed_meetings = len(course_result.meetings_status)
+            joined = course_result.joined_count
+            available = course_result.available_count
+            unavailable = course_result.unavailable_count
+            
+            status_summary = f"✅{joined} 🟡{available} ❌{unavailable}"
+            progress_text = f"✅ {course.name} selesai ({course_idx}/{total_courses})\n📊 {status_summary} dari {completed_meetings} pertemuan"
+            await progress_callback(progress_text)
+        
+        course_result.meetings_status.sort(key=lambda meeting: meeting.number)
+        
+        return course_result
+    
+    def _estimated_unavailable(self, meeting_num: int) -> MeetingInfo:
+        return MeetingInfo(
+            number=meeting_num,
+            status=ForumStatus.UNAVAILABLE,
+            message=f"Pertemuan {meeting_num}: ❌ Forum belum tersedia (perkiraan)",
+            estimated=True
+        )
+    
+    async def _record_meeting(self, course_result: CourseResult, course: CourseInfo, meeting_result: MeetingInfo, checkpoint):
+        course_result.add_meeting_result(meeting_result)
+        availability_index.observe(course.code, meeting_result)
+        if checkpoint:
+            await checkpoint.record(course.code, meeting_result)
+    
+    async def _find_open_boundary(
+        self,
+        pool: PagePool,
+        course: CourseInfo,
+        pending_meetings: List[Tuple[int, int]],
+        progress_callback: Optional[Callable[[str], None]] = None
+    ) -> Tuple[Dict[int, MeetingInfo], List[int]]:
+        """
+        Binary search pertemuan terakhir yang forumnya sudah dibuka
+        
+        Mentari membuka forum berurutan, jadi cukup O(log n) page load untuk
+        menemukan batasnya.
+        
+        Returns:
+            Tuple (hasil pertemuan yang sudah di-probe, nomor pertemuan setelah
+            batas yang dianggap belum tersedia). Jika probe memberi status tidak
+            pasti (unknown/error/timeout), daftar kedua kosong sehingga sisa
+            pertemuan dicek penuh.
+        """
+        meetings = sorted(meeting_num for _, meeting_num in pending_meetings)
+        probed: Dict[int, MeetingInfo] = {}
+        # Invariant: meetings[:lo + 1] terbuka, meetings[hi:] belum tersedia
+        lo, hi = -1, len(meetings)
+        
+        async with pool.page() as page:
+            try:
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    meeting_num = meetings[mid]
+                    
+                    if progress_callback:
+                        await progress_callback(
+                            f"📚 {course.name}\n🔎 Mencari batas forum terbuka (Pertemuan {meeting_num})"
+                        )
+                    
+                    meeting_result = await self._check_meeting_forum(page, course.code, meeting_num)
+                    probed[meeting_num] = meeting_result
+                    
+                    if meeting_result.status in (ForumStatus.JOINED, ForumStatus.AVAILABLE):
+                        lo = mid
+                    elif meeting_result.status == ForumStatus.UNAVAILABLE:
+                        hi = mid
+                    else:
+                        logger.info(f"Indeterminate probe in {course.name}, using exhaustive scan")
+                        return probed, []
+                    
+                    await asyncio.sleep(max(0.3, self.settings.delay_between_requests * 0.5))
+            finally:
+                await self._settle_screenshot(page)
+        
+        inferred = [meeting_num for meeting_num in meetings[hi:] if meeting_num not in probed]
+        logger.info(
+            f"{course.name}: forums open up to meeting "
+            f"{meetings[lo] if lo >= 0 else '-'}, {len(inferred)} inferred unavailable"
+        )
+        return probed, inferred
+    
+    async def _scan_meetings(
+        self,
+        pool: PagePool,
+        course: CourseInfo,
+        meetings: List[Tuple[int, int]],
+        course_result: CourseResult,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        course_idx: int = 1,
+        total_courses: int = 1,
+        checkpoint=None
+    ):
+        """Cek setiap pertemuan (idx, nomor) secara pipeline dan tambahkan ke course_result"""
+        
+        if not meetings:
+            return
+        
         total_meetings = len(course.meetings)
+        depth = max(1, min(self.settings.pipeline_depth, pool.max_pages, len(meetings)))
+        pages: List[Page] = []
+        prefetched: Dict[int, asyncio.Task] = {}
+        
+        def prefetch(position: int):
+            """Mulai navigasi pertemuan ke-position di page-nya sendiri"""
+            if position < len(meetings):
+                prefetched[position] = asyncio.create_task(self._load_meeting_page(
+                    pages[position % depth], course.code, meetings[position][1]
+                ))
         
         try:
-            for idx, meeting_num in enumerate(course.meetings):
+            for _ in range(depth):
+                pages.append(await pool.acquire())
+            
+            # Pipeline: selama pertemuan N dianalisis, pertemuan N+1..N+depth-1 sudah dimuat
+            for position in range(1, depth):
+                prefetch(position)
+            
+            for position, (idx, meeting_num) in enumerate(meetings):
+                page = pages[position % depth]
+                
                 # Update progress untuk setiap pertemuan
                 if progress_callback:
                     progress_text = f"📚 {course.name} ({course_idx}/{total_courses})\n🔍 Mengecek Pertemuan {meeting_num} ({idx + 1}/{total_meetings})"
@@ -109,9 +334,9 @@ class ForumScraperService:
                 
                 try:
                     meeting_result = await self._check_meeting_forum(
-                        page, course.code, meeting_num
+                        page, course.code, meeting_num, prefetched.pop(position, None)
                     )
-                    course_result.add_meeting_result(meeting_result)
+                    await self._record_meeting(course_result, course, meeting_result, checkpoint)
                     
                     # Optimized delay - reduced for speed
                     if meeting_result.status in [ForumStatus.UNKNOWN, ForumStatus.ERROR]:
@@ -128,74 +353,63 @@ class ForumScraperService:
                         error_details=str(e)
                     )
                     course_result.add_meeting_result(error_meeting)
-            
-            # Progress update setelah course selesai
-            if progress_callback:
-                completed_meetings = len(course_result.meetings_status)
-                joined = course_result.joined_count
-                available = course_result.available_count
-                unavailable = course_result.unavailable_count
                 
-                status_summary = f"✅{joined} 🟡{available} ❌{unavailable}"
-                progress_text = f"✅ {course.name} selesai ({course_idx}/{total_courses})\n📊 {status_summary} dari {completed_meetings} pertemuan"
-                await progress_callback(progress_text)
+                # Page ini bebas lagi - mulai muat pertemuan berikutnya untuk page ini
+                prefetch(position + depth)
                     
         finally:
-            await page.close()
-        
-        return course_result
-    
-    async def _configure_page(self, page: Page):
-        """Konfigurasi page untuk optimal scraping"""
-        # Set timeout
-        page.set_default_timeout(self.settings.browser_config.timeout)
-        
-        # Set viewport
-        await page.set_viewport_size({
-            "width": self.settings.browser_config.viewport_width,
-            "height": self.settings.browser_config.viewport_height
-        })
-        
-        # Set user agent
-        await page.set_extra_http_headers({
-            'User-Agent': self.settings.browser_config.user_agent
-        })
+            for task in prefetched.values():
+                task.cancel()
+            await asyncio.gather(*prefetched.values(), return_exceptions=True)
+            for page in pages:
+                await self._settle_screenshot(page)
+                await pool.release(page)
     
     async def _check_meeting_forum(
         self, 
         page: Page, 
         course_code: str, 
-        meeting_num: int
+        meeting_num: int,
+        preload: Optional[asyncio.Task] = None
     ) -> MeetingInfo:
-        """Check status forum untuk pertemuan tertentu"""
+        """
+        Check status forum untuk pertemuan tertentu
         
-        url = f"https://mentari.unpam.ac.id/u-courses/{course_code}?accord_pertemuan=PERTEMUAN_{meeting_num}"
+        Args:
+            preload: Task navigasi yang sudah dimulai (prefetch) untuk page ini
+        """
         
         logger.debug(f"Checking forum for {course_code} meeting {meeting_num}")
         
         try:
-            # Load page with retry
-            await self._load_page_with_retry(page, url)
-            
-            # Take screenshot if enabled
-            screenshot_path = None
-            if self.settings.enable_screenshots:
-                screenshot_path = await self._take_screenshot(
-                    page, course_code, meeting_num
-                )
+            if preload is not None:
+                await preload
+            else:
+                await self._load_meeting_page(page, course_code, meeting_num)
             
             # Find forum section
-            section = await self._find_forum_section(page, meeting_num)
+            with time_phase("section_discovery") as phase:
+                section = await self._find_forum_section(page, meeting_num)
+                phase.outcome = "found" if section else "not_found"
             if not section:
                 return MeetingInfo(
                     number=meeting_num,
                     status=ForumStatus.UNKNOWN,
                     message=f"Pertemuan {meeting_num}: ❔ Section tidak ditemukan",
-                    screenshot_path=screenshot_path
+                    screenshot_path=self._take_screenshot(page, course_code, meeting_num)
                 )
             
             # Analyze forum status
-            status, message = await self._analyze_forum_status(section, meeting_num)
+            with time_phase("status_analysis") as phase:
+                status, message = await self._analyze_forum_status(section, meeting_num)
+                phase.outcome = status.value
+            
+            # Screenshot hanya untuk hasil yang perlu diinvestigasi
+            screenshot_path = None
+            if status in PROBLEM_STATUSES:
+                screenshot_path = self._take_screenshot(
+                    page, course_code, meeting_num, section
+                )
             
             return MeetingInfo(
                 number=meeting_num,
@@ -206,12 +420,14 @@ class ForumScraperService:
             
         except Exception as e:
             logger.warning(f"Error checking forum {course_code} meeting {meeting_num}: {e}")
+            screenshot_path = self._take_screenshot(page, course_code, meeting_num)
             
             if "timeout" in str(e).lower():
                 return MeetingInfo(
                     number=meeting_num,
                     status=ForumStatus.TIMEOUT,
                     message=f"Pertemuan {meeting_num}: ⏰ Timeout - server lambat",
+                    screenshot_path=screenshot_path,
                     error_details=str(e)
                 )
             else:
@@ -219,9 +435,21 @@ class ForumScraperService:
                     number=meeting_num,
                     status=ForumStatus.ERROR,
                     message=f"Pertemuan {meeting_num}: ❗ Error: {str(e)[:50]}...",
+                    screenshot_path=screenshot_path,
                     error_details=str(e)
                 )
     
+    async def _load_meeting_page(self, page: Page, course_code: str, meeting_num: int):
+        """Navigasi ke halaman pertemuan, dibatasi slot koneksi per host"""
+        
+        url = f"https://mentari.unpam.ac.id/u-courses/{course_code}?accord_pertemuan=PERTEMUAN_{meeting_num}"
+        
+        await self._settle_screenshot(page)
+        async with _host_slots(url):
+            with time_phase("page_navigation") as phase:
+                await self._load_page_with_retry(page, url)
+            connectivity_monitor.record_mentari_latency(time.perf_counter() - phase.started)
+    
     async def _load_page_with_retry(self, page: Page, url: str, max_retries: int = 2):
         """Load page dengan retry mechanism - optimized for speed"""
         
@@ -255,17 +483,51 @@ class ForumScraperService:
                 else:
                     raise e
     
-    async def _take_screenshot(self, page: Page, course_code: str, meeting_num: int) -> str:
-        """Take screenshot untuk analisis"""
-        timestamp = int(time.time())
-        filename = f"forum_{course_code}_{meeting_num}_{timestamp}.png"
-        filepath = os.path.join(self.settings.screenshot_dir, filename)
+    def _take_screenshot(
+        self,
+        page: Page,
+        course_code: str,
+        meeting_num: int,
+        section=None
+    ) -> Optional[str]:
+        """
+        Mulai screenshot JPEG untuk analisis pertemuan bermasalah
         
-        await page.screenshot(path=filepath, full_page=True)
-        logger.debug(f"Screenshot saved: {filepath}")
+        Capture dan encode berjalan di background task sehingga hasil
+        pertemuan tidak menunggu; page baru dinavigasi ulang atau dikembalikan
+        ke pool setelah capture selesai (_settle_screenshot). Path dikembalikan
+        langsung; file tidak ada jika capture gagal.
+        """
+        if not self.settings.enable_screenshots:
+            return None
+        
+        filename = f"forum_{course_code}_{meeting_num}_{int(time.time())}.jpg"
+        filepath = os.path.join(self.settings.screenshot_dir, filename)
+        target = section if section is not None else page
         
+        task = asyncio.create_task(self._capture_screenshot(target, filepath))
+        self._captures[page] = task
+        task.add_done_callback(
+            lambda done: self._captures.pop(page, None) if self._captures.get(page) is done else None
+        )
         return filepath
     
+    async def _capture_screenshot(self, target, filepath: str):
+        try:
+            data = await target.screenshot(
+                type="jpeg", quality=self.settings.screenshot_quality, timeout=5000
+            )
+            await asyncio.to_thread(write_artifact, filepath, data)
+            logger.debug(f"Screenshot saved: {filepath}")
+        except Exception as e:
+            logger.debug(f"Screenshot failed ({filepath}): {e}")
+    
+    async def _settle_screenshot(self, page: Page):
+        """Tunggu screenshot yang masih berjalan di page ini (sebelum page dipakai ulang)"""
+        task = self._captures.get(page)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+    
     async def _find_forum_section(self, page: Page, meeting_num: int):
         """Find section untuk pertemuan tertentu"""
         
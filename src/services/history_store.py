@@ -0,0 +1,158 @@
+"""
+Riwayat status forum per scan dalam format kolom (append-only)
+
+Setiap scan menambahkan satu baris per pertemuan: (waktu, NIM, mata kuliah,
+pertemuan, status). Tiap kolom adalah file biner terpisah dengan tipe tetap
+sehingga bisa dibaca langsung sebagai array (lihat status_analytics). NIM dan
+kode mata kuliah disimpan sebagai id ke file kamus teks.
+
+Kolom ditulis berurutan tanpa transaksi; jika proses mati di tengah append,
+pembaca memotong semua kolom ke panjang terpendek.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from src.models import ForumStatus, ScrapingResult
+
+
+logger = logging.getLogger(__name__)
+
+
+# Kode status di kolom status. Hanya boleh ditambah di akhir.
+STATUS_CODES: Tuple[ForumStatus, ...] = (
+    ForumStatus.JOINED,
+    ForumStatus.AVAILABLE,
+    ForumStatus.UNAVAILABLE,
+    ForumStatus.UNKNOWN,
+    ForumStatus.ERROR,
+    ForumStatus.TIMEOUT,
+)
+_STATUS_INDEX: Dict[ForumStatus, int] = {status: code for code, status in enumerate(STATUS_CODES)}
+
+# Nama file kolom -> typecode array (little-endian di disk)
+COLUMNS: Dict[str, str] = {
+    "ts": "d",        # float64 unix timestamp
+    "nim": "I",       # uint32 id NIM
+    "course": "H",    # uint16 id mata kuliah
+    "meeting": "H",   # uint16 nomor pertemuan
+    "status": "B",    # uint8 indeks STATUS_CODES
+}
+
+NIM_DICTIONARY = "nims.txt"
+COURSE_DICTIONARY = "courses.txt"
+
+
+class _Dictionary:
+    """Kamus string -> id yang append-only (satu string per baris)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._add(line.rstrip("\n"))
+
+    def _add(self, value: str) -> int:
+        self.ids[value] = len(self.values)
+        self.values.append(value)
+        return self.ids[value]
+
+    def id_for(self, value: str, pending: List[str]) -> int:
+        value = value.replace("\n", " ")
+        existing = self.ids.get(value)
+        if existing is not None:
+            return existing
+        pending.append(value)
+        return self._add(value)
+
+    def append(self, pending: List[str]):
+        if pending:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{value}\n" for value in pending))
+
+
+class HistoryStore:
+    """Store riwayat status kolumnar di satu direktori"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._nims = _Dictionary(os.path.join(directory, NIM_DICTIONARY))
+        self._courses = _Dictionary(os.path.join(directory, COURSE_DICTIONARY))
+
+    def column_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.bin")
+
+    @property
+    def course_codes(self) -> List[str]:
+        """Kode mata kuliah per id (indeks = nilai di kolom course)"""
+        with self._lock:
+            return list(self._courses.values)
+
+    @property
+    def nims(self) -> List[str]:
+        with self._lock:
+            return list(self._nims.values)
+
+    def record(self, nim: str, result: ScrapingResult, timestamp: Optional[float] = None) -> int:
+        """
+        Tambahkan snapshot satu scan
+
+        Timestamp diambil di dalam lock sehingga baris di file selalu urut
+        waktu (analytics mengandalkan urutan ini).
+
+        Returns:
+            int: Jumlah baris yang ditulis
+        """
+        # Hanya observasi nyata; status perkiraan tidak masuk riwayat
+        meetings = [
+            (course_result.course.code, meeting.number, meeting.status)
+            for course_result in result.courses
+            for meeting in course_result.meetings_status
+            if not meeting.estimated
+        ]
+        if not meetings:
+            return 0
+
+        with self._lock:
+            ts = timestamp if timestamp is not None else time.time()
+            new_nims: List[str] = []
+            new_courses: List[str] = []
+            nim_id = self._nims.id_for(nim, new_nims)
+
+            columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+            for course_code, number, status in meetings:
+                columns["ts"].append(ts)
+                columns["nim"].append(nim_id)
+                columns["course"].append(self._courses.id_for(course_code, new_courses))
+                columns["meeting"].append(number)
+                columns["status"].append(_STATUS_INDEX[status])
+
+            # Kamus ditulis dulu: id di kolom selalu punya entri kamus
+            self._nims.append(new_nims)
+            self._courses.append(new_courses)
+            for name, values in columns.items():
+                if values.itemsize > 1 and sys.byteorder == "big":
+                    values.byteswap()
+                with open(self.column_path(name), "ab") as f:
+                    f.write(values.tobytes())
+
+        return len(meetings)
+
+    def row_count(self) -> int:
+        """Jumlah baris lengkap (kolom terpendek)"""
+        counts = []
+        for name, typecode in COLUMNS.items():
+            path = self.column_path(name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            counts.append(size // array(typecode).itemsize)
+        return min(counts)
@@ -0,0 +1,227 @@
+"""
+Job store SQLite untuk scraping yang tahan restart
+
+Setiap job dan hasil per-pertemuan disimpan begitu selesai dicek. Saat bot
+start ulang, job yang belum selesai dilanjutkan dari pertemuan terakhir yang
+tersimpan dan hasil akhirnya dikirim ke chat asal.
+
+Password hanya disimpan terenkripsi (Fernet, key dari JOB_STORE_KEY). Tanpa
+key, job tetap di-checkpoint tetapi tidak bisa dilanjutkan otomatis.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.models import CourseInfo, LoginCredentials, MeetingInfo
+
+
+logger = logging.getLogger(__name__)
+
+
+JOB_PENDING = "pending"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    chat_id INTEGER NOT NULL,
+    nim TEXT NOT NULL,
+    secret BLOB,
+    courses TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meeting_results (
+    job_id TEXT NOT NULL,
+    course_code TEXT NOT NULL,
+    meeting_number INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (job_id, course_code, meeting_number)
+);
+"""
+
+
+class CredentialVault:
+    """Enkripsi password untuk disimpan di job store"""
+
+    def __init__(self, key: Optional[str] = None):
+        self._fernet = None
+        if key:
+            from cryptography.fernet import Fernet
+            self._fernet = Fernet(key.encode() if isinstance(key, str) else key)
+
+    @property
+    def enabled(self) -> bool:
+        return self._fernet is not None
+
+    def encrypt(self, password: str) -> Optional[bytes]:
+        if not self._fernet:
+            return None
+        return self._fernet.encrypt(password.encode())
+
+    def decrypt(self, secret: Optional[bytes]) -> Optional[str]:
+        if not self._fernet or not secret:
+            return None
+        try:
+            return self._fernet.decrypt(secret).decode()
+        except Exception as e:
+            logger.warning(f"Failed to decrypt stored credentials: {e}")
+            return None
+
+
+@dataclass
+class StoredJob:
+    """Job yang belum selesai di job store"""
+    job_id: str
+    chat_id: int
+    nim: str
+    courses: List[CourseInfo]
+    attempts: int
+    credentials: Optional[LoginCredentials] = None
+
+
+class JobStore:
+    """Antrian job scraping persisten berbasis SQLite"""
+
+    def __init__(self, path: str, vault: Optional[CredentialVault] = None):
+        self.path = path
+        self.vault = vault or CredentialVault()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def create_job(
+        self,
+        job_id: str,
+        chat_id: int,
+        credentials: LoginCredentials,
+        courses: Optional[List[CourseInfo]] = None
+    ):
+        """Simpan job baru sebelum scraping dimulai (courses None = deteksi otomatis)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)",
+                (
+                    job_id, chat_id, credentials.nim,
+                    self.vault.encrypt(credentials.password),
+                    json.dumps([course.to_dict() for course in courses or []], ensure_ascii=False),
+                    JOB_PENDING, now, now
+                )
+            )
+
+    def record_meeting(self, job_id: str, course_code: str, meeting: MeetingInfo):
+        """Checkpoint hasil satu pertemuan"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meeting_results VALUES (?, ?, ?, ?)",
+                (job_id, course_code, meeting.number,
+                 json.dumps(meeting.to_dict(), ensure_ascii=False))
+            )
+            self._conn.execute(
+                "UPDATE jobs SET updated_at = ? WHERE job_id = ?", (time.time(), job_id)
+            )
+
+    def completed_meetings(self, job_id: str) -> Dict[str, Dict[int, MeetingInfo]]:
+        """Hasil pertemuan yang sudah di-checkpoint, per kode mata kuliah"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT course_code, meeting_number, data FROM meeting_results WHERE job_id = ?",
+                (job_id,)
+            ).fetchall()
+
+        completed: Dict[str, Dict[int, MeetingInfo]] = {}
+        for course_code, meeting_number, data in rows:
+            completed.setdefault(course_code, {})[meeting_number] = MeetingInfo.from_dict(json.loads(data))
+        return completed
+
+    def finish_job(self, job_id: str, status: str = JOB_DONE):
+        """Tandai job selesai dan buang checkpoint serta kredensialnya"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, secret = NULL, updated_at = ? WHERE job_id = ?",
+                (status, time.time(), job_id)
+            )
+            self._conn.execute("DELETE FROM meeting_results WHERE job_id = ?", (job_id,))
+
+    def claim_unfinished(self, max_attempts: int = 3) -> List[StoredJob]:
+        """
+        Ambil job yang terputus oleh restart dan naikkan counter attempt
+
+        Job yang sudah dicoba max_attempts kali ditandai gagal agar tidak
+        terus-menerus crash-loop.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, chat_id, nim, secret, courses, attempts FROM jobs WHERE status = ?",
+                (JOB_PENDING,)
+            ).fetchall()
+
+            jobs = []
+            for job_id, chat_id, nim, secret, courses, attempts in rows:
+                if attempts >= max_attempts:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, secret = NULL WHERE job_id = ?",
+                        (JOB_FAILED, job_id)
+                    )
+                    continue
+
+                self._conn.execute(
+                    "UPDATE jobs SET attempts = attempts + 1 WHERE job_id = ?", (job_id,)
+                )
+                password = self.vault.decrypt(secret)
+                jobs.append(StoredJob(
+                    job_id=job_id,
+                    chat_id=chat_id,
+                    nim=nim,
+                    courses=[CourseInfo.from_dict(c) for c in json.loads(courses)],
+                    attempts=attempts + 1,
+                    credentials=LoginCredentials(nim=nim, password=password) if password else None
+                ))
+            return jobs
+
+    def purge(self, older_than_seconds: float = 7 * 24 * 3600) -> int:
+        """Hapus job selesai/gagal yang sudah lama"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status != ? AND updated_at < ?",
+                (JOB_PENDING, time.time() - older_than_seconds)
+            )
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobCheckpoint:
+    """Checkpoint satu job yang diteruskan ke ForumScraperService"""
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+        self.completed: Dict[str, Dict[int, MeetingInfo]] = store.completed_meetings(job_id)
+
+    def get(self, course_code: str, meeting_number: int) -> Optional[MeetingInfo]:
+        """Hasil pertemuan dari run sebelumnya, jika sudah pernah dicek"""
+        return self.completed.get(course_code, {}).get(meeting_number)
+
+    async def record(self, course_code: str, meeting: MeetingInfo):
+        """Simpan hasil pertemuan tanpa memblokir event loop"""
+        try:
+            await asyncio.to_thread(self.store.record_meeting, self.job_id, course_code, meeting)
+        except Exception as e:
+            logger.warning(f"Failed to checkpoint meeting {course_code} P{meeting.number}: {e}")
@@ -0,0 +1,222 @@
+"""
+Prediksi waktu pembukaan forum dari riwayat status
+
+Dari transisi UNAVAILABLE -> terbuka yang tercatat di HistoryStore, setiap
+mata kuliah mendapat irama pembukaan (median selang per pertemuan, default
+mingguan). Pertemuan berikutnya diperkirakan terbuka pada pembukaan terakhir
+yang teramati ditambah irama tersebut, dengan jendela ketidakpastian.
+
+Scheduler /subscribe memakai next_check() untuk mengecek rapat di sekitar
+jendela pembukaan dan jarang di luar jendela.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config import course_config
+
+
+logger = logging.getLogger(__name__)
+
+
+WIB = timezone(timedelta(hours=7))
+_DAY_NAMES = ("Sen", "Sel", "Rab", "Kam", "Jum", "Sab", "Min")
+
+
+@dataclass
+class OpeningForecast:
+    """Perkiraan pembukaan forum pertemuan berikutnya satu mata kuliah"""
+    course_code: str
+    meeting_number: int
+    expected_at: float
+    window_start: float
+    window_end: float
+    samples: int
+
+    def contains(self, ts: float) -> bool:
+        return self.window_start <= ts <= self.window_end
+
+
+class OpeningPredictor:
+    """Model irama pembukaan forum per mata kuliah"""
+
+    def __init__(
+        self,
+        history_store=None,
+        refresh_interval: float = 3600.0,
+        default_cadence: float = 7 * 24 * 3600,
+        min_spread: float = 3600.0,
+        max_backoff: float = 3.0,
+        min_check_interval: float = 900.0
+    ):
+        self.history_store = history_store
+        self.refresh_interval = refresh_interval
+        self.default_cadence = default_cadence
+        self.min_spread = min_spread
+        self.max_backoff = max_backoff
+        self.min_check_interval = min_check_interval
+        self.forecasts: Dict[str, OpeningForecast] = {}
+        self.updated_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def fit(
+        self,
+        windows: Dict[Tuple[str, int], Tuple[float, float]],
+        latest_open: Optional[Dict[str, int]] = None
+    ) -> Dict[str, OpeningForecast]:
+        """
+        Bangun perkiraan dari rentang pembukaan yang teramati
+
+        Args:
+            windows: (kode, pertemuan) -> (terakhir terlihat tertutup, pertama
+                terlihat terbuka), lihat status_analytics.opening_windows
+            latest_open: Pertemuan tertinggi yang pernah terlihat terbuka per
+                kode (termasuk yang tidak teramati transisinya)
+        """
+        latest_open = latest_open or {}
+        points: Dict[str, List[Tuple[int, float, float]]] = {}
+        for (code, meeting), (closed_at, opened_at) in windows.items():
+            # Titik tengah rentang sebagai waktu buka, setengah lebarnya sebagai ketidakpastian
+            points.setdefault(code, []).append(
+                (meeting, (closed_at + opened_at) / 2, (opened_at - closed_at) / 2)
+            )
+
+        forecasts = {}
+        for code, observed in points.items():
+            observed.sort()
+            steps = [
+                (later[1] - earlier[1]) / (later[0] - earlier[0])
+                for earlier, later in zip(observed, observed[1:])
+                if later[0] > earlier[0] and later[1] > earlier[1]
+            ]
+            cadence = statistics.median(steps) if steps else self.default_cadence
+            deviation = (
+                statistics.median(abs(step - cadence) for step in steps) if len(steps) > 1 else 0.0
+            )
+
+            last_meeting, last_opened, last_uncertainty = observed[-1]
+            next_meeting = max(last_meeting, latest_open.get(code, 0)) + 1
+            distance = next_meeting - last_meeting
+            expected = last_opened + cadence * distance
+            # Tanpa irama teramati (satu titik) jendela dibuat lebar
+            spread = max(
+                self.min_spread,
+                last_uncertainty,
+                deviation * distance * 1.5 if steps else cadence / 7
+            )
+
+            forecasts[code] = OpeningForecast(
+                course_code=code,
+                meeting_number=next_meeting,
+                expected_at=expected,
+                window_start=expected - spread,
+                window_end=expected + spread,
+                samples=len(observed)
+            )
+
+        self.forecasts = forecasts
+        self.updated_at = time.time()
+        return forecasts
+
+    def forecast(self, course_code: str) -> Optional[OpeningForecast]:
+        return self.forecasts.get(course_code)
+
+    def next_check(self, waiting_keys: Iterable[str], now: float, interval: float) -> Optional[float]:
+        """
+        Waktu cek berikutnya untuk subscriber yang menunggu forum
+
+        Args:
+            waiting_keys: Key "kode:pertemuan" yang masih belum tersedia
+            now: Waktu sekarang
+            interval: Interval scan default
+
+        Returns:
+            Optional[float]: Waktu cek, atau None jika tidak ada yang ditunggu
+            (scheduler memakai jadwal default)
+        """
+        codes = {key.rsplit(":", 1)[0] for key in waiting_keys}
+        candidates = []
+
+        for code in codes:
+            forecast = self.forecasts.get(code)
+            if forecast is None or now > forecast.window_end:
+                # Belum ada model atau perkiraan meleset: jadwal biasa
+                candidates.append(now + interval)
+            elif forecast.contains(now):
+                # Di dalam jendela: cek rapat
+                window = forecast.window_end - forecast.window_start
+                candidates.append(now + max(self.min_check_interval, window / 4))
+            else:
+                # Sebelum jendela: tunggu sampai jendela dibuka (dengan batas)
+                candidates.append(min(forecast.window_start, now + interval * self.max_backoff))
+
+        return min(candidates) if candidates else None
+
+    def _load(self) -> Dict[str, OpeningForecast]:
+        from src.services import status_analytics
+
+        frame = status_analytics.load_history(self.history_store)
+        return self.fit(
+            status_analytics.opening_windows(frame),
+            status_analytics.latest_open_meetings(frame)
+        )
+
+    async def refresh(self):
+        """Bangun ulang model dari HistoryStore (di thread)"""
+        if self.history_store is None:
+            return
+        try:
+            forecasts = await asyncio.to_thread(self._load)
+            logger.info(f"Opening predictor refreshed ({len(forecasts)} courses)")
+        except Exception as e:
+            logger.warning(f"Opening predictor refresh failed: {e}")
+
+    def start(self):
+        """Mulai refresh berkala di background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    def format_status(self, limit: int = 5) -> str:
+        """Perkiraan pembukaan terdekat untuk pesan /status"""
+        now = time.time()
+        upcoming = sorted(
+            (forecast for forecast in self.forecasts.values() if forecast.window_end >= now),
+            key=lambda forecast: forecast.expected_at
+        )[:limit]
+        if not upcoming:
+            return "📅 Perkiraan forum berikutnya: belum ada data"
+
+        names = {course.code: course.name for course in course_config.get_default_courses()}
+        lines = ["📅 *Perkiraan forum berikutnya:*"]
+        for forecast in upcoming:
+            start = datetime.fromtimestamp(max(forecast.window_start, now), WIB)
+            end = datetime.fromtimestamp(forecast.window_end, WIB)
+            if start.date() == end.date():
+                window = f"{_DAY_NAMES[start.weekday()]} {start:%d/%m %H:%M}–{end:%H:%M}"
+            else:
+                window = (
+                    f"{_DAY_NAMES[start.weekday()]} {start:%d/%m %H:%M} – "
+                    f"{_DAY_NAMES[end.weekday()]} {end:%d/%m %H:%M}"
+                )
+            name = names.get(forecast.course_code, forecast.course_code)
+            lines.append(f"• {name} P{forecast.meeting_number}: {window} WIB")
+        return "\n".join(lines)
@@ -0,0 +1,130 @@
+"""
+Pool page per BrowserContext
+
+Page dibuat dan dikonfigurasi (timeout, viewport, header) sekali, lalu dipakai
+ulang oleh login dan setiap mata kuliah. Di antara pemakaian page di-reset ke
+about:blank; page yang gagal di-reset atau sudah tertutup dibuang.
+
+Pool hanya memegang context lewat weakref dan dilepas dari registry saat
+context ditutup: page idle mereferensikan context-nya, jadi entry registry
+yang tertinggal akan menahan context dan semua page-nya selama proses hidup.
+"""
+
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from playwright.async_api import BrowserContext, Page
+
+from src.config import app_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class PagePool:
+    """Pool page yang sudah dikonfigurasi untuk satu context"""
+
+    _pools: "weakref.WeakKeyDictionary[BrowserContext, PagePool]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, context: BrowserContext, settings=None, max_pages: Optional[int] = None):
+        self._context_ref = weakref.ref(context)
+        self.settings = settings or app_settings
+        self.max_pages = max(1, max_pages or self.settings.max_pages_per_context)
+        self._idle: List[Page] = []
+        self._open = 0
+        self._available = asyncio.Condition()
+
+    @property
+    def context(self) -> BrowserContext:
+        context = self._context_ref()
+        if context is None:
+            raise RuntimeError("Browser context sudah tidak ada")
+        return context
+
+    @classmethod
+    def for_context(cls, context: BrowserContext, settings=None) -> "PagePool":
+        """Pool milik context ini (dibuat saat pertama kali diminta)"""
+        pool = cls._pools.get(context)
+        if pool is None:
+            pool = cls(context, settings)
+            cls._pools[context] = pool
+            context.on("close", pool._on_context_close)
+        return pool
+
+    def _on_context_close(self, *_):
+        """Lepas pool dan page idle begitu context ditutup"""
+        context = self._context_ref()
+        if context is not None:
+            self._pools.pop(context, None)
+        self._idle.clear()
+
+    async def _configure_page(self, page: Page):
+        """Konfigurasi page sekali saat dibuat"""
+        browser_config = self.settings.browser_config
+        page.set_default_timeout(browser_config.timeout)
+        await page.set_viewport_size({
+            "width": browser_config.viewport_width,
+            "height": browser_config.viewport_height
+        })
+        await page.set_extra_http_headers({
+            'User-Agent': browser_config.user_agent
+        })
+
+    async def acquire(self) -> Page:
+        """Ambil page idle, buat baru jika di bawah batas, atau tunggu"""
+        async with self._available:
+            while True:
+                while self._idle:
+                    page = self._idle.pop()
+                    if not page.is_closed():
+                        return page
+                    self._open -= 1
+
+                if self._open < self.max_pages:
+                    self._open += 1
+                    break
+
+                await self._available.wait()
+
+        try:
+            page = await self.context.new_page()
+            await self._configure_page(page)
+            return page
+        except Exception:
+            async with self._available:
+                self._open -= 1
+                self._available.notify()
+            raise
+
+    async def release(self, page: Page):
+        """Kembalikan page ke pool setelah di-reset"""
+        reusable = False
+        if not page.is_closed():
+            try:
+                await page.goto("about:blank", timeout=5000)
+                reusable = True
+            except Exception as e:
+                logger.debug(f"Page reset failed, discarding page: {e}")
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+        async with self._available:
+            if reusable:
+                self._idle.append(page)
+            else:
+                self._open -= 1
+            self._available.notify()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Pinjam page selama block berjalan"""
+        page = await self.acquire()
+        try:
+            yield page
+        finally:
+            await self.release(page)
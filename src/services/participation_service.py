@@ -0,0 +1,175 @@
+"""
+Service untuk bergabung ke forum dan memverifikasi partisipasi
+
+Semua forum dalam satu batch diproses paralel di BrowserContext yang sudah
+login (satu login untuk banyak forum). Paralelisme dibatasi oleh PagePool
+context dan slot koneksi per host yang sama dengan scraper.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from playwright.async_api import BrowserContext, Page
+
+from src.models import ForumStatus, ForumTarget, MeetingInfo, ParticipationResult
+from src.config import app_settings
+from src.core.metrics import time_phase, FORUM_ACTIONS_TOTAL
+from src.services.availability_index import availability_index
+from src.services.forum_scraper import ForumScraperService
+from src.services.page_pool import PagePool
+
+
+logger = logging.getLogger(__name__)
+
+
+JOIN = "join"
+VERIFY = "verify"
+ACTIONS = (JOIN, VERIFY)
+
+JOIN_BUTTON_SELECTOR = (
+    "button:has-text('Gabung'), button:has-text('Join'), "
+    "a:has-text('Gabung'), a:has-text('Join'), [class*='join']"
+)
+
+ResultCallback = Callable[[ParticipationResult], Awaitable[None]]
+
+
+class ForumParticipationService:
+    """Join dan verifikasi forum secara batch dalam satu context"""
+
+    def __init__(self, settings=None, scraper: Optional[ForumScraperService] = None):
+        self.settings = settings or app_settings
+        self.scraper = scraper or ForumScraperService(settings)
+
+    async def join_forums(
+        self,
+        context: BrowserContext,
+        targets: List[ForumTarget],
+        progress_callback: Optional[Callable[[str], None]] = None,
+        result_callback: Optional[ResultCallback] = None
+    ) -> List[ParticipationResult]:
+        """Gabung ke semua forum (context harus sudah login)"""
+        return await self.run_batch(context, targets, JOIN, progress_callback, result_callback)
+
+    async def verify_forums(
+        self,
+        context: BrowserContext,
+        targets: List[ForumTarget],
+        progress_callback: Optional[Callable[[str], None]] = None,
+        result_callback: Optional[ResultCallback] = None
+    ) -> List[ParticipationResult]:
+        """Cek apakah forum sudah selesai dikerjakan (ada tanda centang)"""
+        return await self.run_batch(context, targets, VERIFY, progress_callback, result_callback)
+
+    async def run_batch(
+        self,
+        context: BrowserContext,
+        targets: List[ForumTarget],
+        action: str,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        result_callback: Optional[ResultCallback] = None
+    ) -> List[ParticipationResult]:
+        """
+        Jalankan aksi untuk setiap forum secara paralel
+
+        Args:
+            action: JOIN atau VERIFY
+            result_callback: Dipanggil dengan hasil setiap forum begitu selesai
+
+        Returns:
+            List[ParticipationResult]: Hasil per forum, urutan sama dengan targets
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown forum action: {action}")
+
+        handler = self._join if action == JOIN else self._verify
+        pool = PagePool.for_context(context, self.settings)
+        completed = 0
+
+        async def run(target: ForumTarget) -> ParticipationResult:
+            nonlocal completed
+            try:
+                async with pool.page() as page:
+                    with time_phase(f"forum_{action}") as phase:
+                        result = await handler(page, target)
+                        phase.outcome = "ok" if result.success else result.status.value
+            except Exception as e:
+                logger.warning(
+                    f"Forum {action} failed for {target.course_code} meeting {target.meeting_number}: {e}"
+                )
+                result = ParticipationResult(
+                    course_code=target.course_code,
+                    meeting_number=target.meeting_number,
+                    action=action,
+                    success=False,
+                    status=ForumStatus.TIMEOUT if "timeout" in str(e).lower() else ForumStatus.ERROR,
+                    message=f"❗ Error: {str(e)[:50]}",
+                    error_details=str(e)
+                )
+
+            FORUM_ACTIONS_TOTAL.inc(action=action, outcome="ok" if result.success else "failed")
+            completed += 1
+            if progress_callback:
+                await progress_callback(f"📨 Forum diproses: {completed}/{len(targets)}")
+            if result_callback:
+                try:
+                    await result_callback(result)
+                except Exception as e:
+                    logger.warning(f"Forum result delivery failed: {e}")
+            return result
+
+        logger.info(f"Running forum {action} for {len(targets)} forums")
+        return list(await asyncio.gather(*(run(target) for target in targets)))
+
+    async def _open_section(self, page: Page, target: ForumTarget):
+        """Buka halaman pertemuan; kembalikan (section, status, pesan)"""
+        await self.scraper._load_meeting_page(page, target.course_code, target.meeting_number)
+        section = await self.scraper._find_forum_section(page, target.meeting_number)
+        if section is None:
+            return None, ForumStatus.UNKNOWN, f"Pertemuan {target.meeting_number}: ❔ Section tidak ditemukan"
+        status, message = await self.scraper._analyze_forum_status(section, target.meeting_number)
+        availability_index.observe(
+            target.course_code, MeetingInfo(number=target.meeting_number, status=status, message=message)
+        )
+        return section, status, message
+
+    def _result(self, target: ForumTarget, action: str, success: bool, status: ForumStatus, message: str) -> ParticipationResult:
+        return ParticipationResult(
+            course_code=target.course_code,
+            meeting_number=target.meeting_number,
+            action=action,
+            success=success,
+            status=status,
+            message=message
+        )
+
+    async def _join(self, page: Page, target: ForumTarget) -> ParticipationResult:
+        section, status, message = await self._open_section(page, target)
+
+        if status == ForumStatus.JOINED:
+            return self._result(target, JOIN, True, status, "✅ Sudah bergabung sebelumnya")
+        if section is None or status != ForumStatus.AVAILABLE:
+            return self._result(target, JOIN, False, status, message)
+
+        button = section.locator(JOIN_BUTTON_SELECTOR).first
+        if await button.count() == 0:
+            return self._result(target, JOIN, False, status, "❔ Tombol gabung tidak ditemukan")
+
+        await button.click()
+        await page.wait_for_timeout(1500)
+
+        # Muat ulang halaman: status setelah klik harus terlihat dari sisi server
+        section, status, message = await self._open_section(page, target)
+        if status == ForumStatus.JOINED:
+            return self._result(target, JOIN, True, status, "✅ Berhasil bergabung ke forum")
+        return self._result(target, JOIN, False, status, f"⚠️ Belum terdeteksi bergabung ({message})")
+
+    async def _verify(self, page: Page, target: ForumTarget) -> ParticipationResult:
+        _, status, message = await self._open_section(page, target)
+
+        if status == ForumStatus.JOINED:
+            return self._result(target, VERIFY, True, status, "✅ Partisipasi terverifikasi (ada tanda centang)")
+        if status == ForumStatus.AVAILABLE:
+            return self._result(target, VERIFY, False, status, "❌ Belum ada partisipasi di forum")
+        return self._result(target, VERIFY, False, status, message)
@@ -3,13 +3,137 @@ Service untuk formatting hasil scraping
 """
 
 import logging
-from typing import Dict, List
-from src.models import ScrapingResult, CourseResult, MeetingInfo, ForumStatus
+import re
+from typing import Dict, Iterator, List
+from src.models import ScrapingResult, CourseResult, MeetingInfo, ForumStatus, StatusChange
 
 
 logger = logging.getLogger(__name__)
 
 
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+CONTINUATION_PREFIX = "📄 *Lanjutan {index}*\n\n"
+CONTINUATION_SUFFIX = "\n\n*➡️ Bersambung...*"
+
+_MARKDOWN_ENTITY = re.compile(r"[*_`\[\]]")
+
+
+def telegram_length(text: str) -> int:
+    """Panjang teks menurut Telegram (UTF-16 code unit; emoji dihitung 2)"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+class ReportStream:
+    """
+    Renderer laporan yang mengeluarkan chunk siap kirim per mata kuliah
+    
+    Chunk hanya dipotong di batas baris (tiap baris memuat entity Markdown
+    yang lengkap), diutamakan di batas mata kuliah, dan selalu di bawah limit
+    Telegram termasuk penanda lanjutan. Chunk pertama dikeluarkan begitu
+    mata kuliah pertama selesai; berikutnya diisi sampai penuh.
+    """
+    
+    def __init__(self, formatter: "ResultFormatterService", limit: int = TELEGRAM_MESSAGE_LIMIT):
+        self.formatter = formatter
+        self.limit = limit
+        self._lines: List[str] = formatter._report_header_lines()
+        self._has_course = False
+        self._emitted = 0
+        self._finished = False
+    
+    def _budget(self) -> int:
+        """Ruang untuk isi chunk berikutnya setelah penanda lanjutan"""
+        prefix = telegram_length(CONTINUATION_PREFIX.format(index=self._emitted + 1)) if self._emitted else 0
+        return self.limit - prefix - telegram_length(CONTINUATION_SUFFIX)
+    
+    def _buffer_length(self, lines: List[str]) -> int:
+        return sum(telegram_length(line) for line in lines) + max(0, len(lines) - 1)
+    
+    def _emit(self, lines: List[str], last: bool = False) -> str:
+        chunk = "\n".join(lines).strip("\n")
+        if self._emitted:
+            chunk = CONTINUATION_PREFIX.format(index=self._emitted + 1) + chunk
+        if not last:
+            chunk += CONTINUATION_SUFFIX
+        self._emitted += 1
+        return chunk
+    
+    def _fit_line(self, line: str) -> List[str]:
+        """Baris yang melebihi limit dipecah tanpa Markdown agar tidak ada entity terpotong"""
+        if telegram_length(line) <= self._budget():
+            return [line]
+        # Potongan berikutnya masuk chunk lanjutan: sisakan ruang untuk penanda
+        # lanjutan dengan nomor chunk berapa pun
+        budget = (
+            self.limit
+            - telegram_length(CONTINUATION_PREFIX.format(index=10 ** 6))
+            - telegram_length(CONTINUATION_SUFFIX)
+        )
+        plain = _MARKDOWN_ENTITY.sub("", line)
+        # Potong per karakter dengan asumsi terburuk 2 code unit per karakter
+        step = budget // 2
+        return [plain[i:i + step] for i in range(0, len(plain), step)]
+    
+    def _append_block(self, block: List[str]) -> List[str]:
+        """Tambahkan satu blok baris; kembalikan chunk yang sudah penuh"""
+        ready = []
+        
+        # Blok yang muat utuh di chunk baru tidak dipecah di tengah mata kuliah
+        if (self._buffer_length(self._lines + block) > self._budget()
+                and self._buffer_length(block) <= self._budget()
+                and any(line.strip() for line in self._lines)):
+            ready.append(self._emit(self._lines))
+            self._lines = []
+        
+        for raw_line in block:
+            for line in self._fit_line(raw_line):
+                if self._lines and self._buffer_length(self._lines + [line]) > self._budget():
+                    ready.append(self._emit(self._lines))
+                    self._lines = []
+                self._lines.append(line)
+        
+        return ready
+    
+    def pending_text(self) -> str:
+        """Isi chunk yang sedang terbuka (belum penuh), untuk ditampilkan sementara"""
+        if not any(line.strip() for line in self._lines):
+            return ""
+        chunk = "\n".join(self._lines).strip("\n")
+        if self._emitted:
+            chunk = CONTINUATION_PREFIX.format(index=self._emitted + 1) + chunk
+        return chunk
+    
+    def add_course(self, course_result: CourseResult) -> List[str]:
+        """Render satu mata kuliah; kembalikan chunk yang siap dikirim (bisa kosong)"""
+        ready = self._append_block(self.formatter._course_lines(course_result))
+        
+        if not self._has_course:
+            self._has_course = True
+            if self._lines:
+                ready.append(self._emit(self._lines))
+                self._lines = []
+        
+        return ready
+    
+    def finish(self, result: ScrapingResult) -> List[str]:
+        """Tambahkan ringkasan + footer dan kembalikan semua chunk yang tersisa"""
+        if self._finished:
+            return []
+        self._finished = True
+        
+        if not self._has_course:
+            return ["📭 Tidak ada data forum yang ditemukan."]
+        
+        ready = self._append_block(
+            self.formatter._format_summary_statistics(result).split("\n")
+            + self.formatter._format_footer(result).split("\n")
+        )
+        ready.append(self._emit(self._lines, last=True))
+        self._lines = []
+        return ready
+
+
 class ResultFormatterService:
     """Service untuk formatting hasil scraping menjadi pesan yang readable"""
     
@@ -31,8 +155,7 @@ class ResultFormatterService:
         message_parts = []
         
         # Header
-        message_parts.append("📚 *LAPORAN STATUS FORUM DISKUSI*")
-        message_parts.append("═" * 40)
+        message_parts.extend(self._report_header_lines())
         
         # Course details
         for course_result in result.courses:
@@ -74,19 +197,38 @@ class ResultFormatterService:
         
         return "\n".join(message_parts)
     
-    def _format_course_result(self, course_result: CourseResult) -> str:
-        """Format hasil untuk satu mata kuliah (internal)"""
-        
-        parts = []
+    def report_stream(self, limit: int = TELEGRAM_MESSAGE_LIMIT) -> ReportStream:
+        """Renderer laporan bertahap (per mata kuliah) dengan chunk di bawah limit Telegram"""
+        return ReportStream(self, limit)
+    
+    def iter_report_chunks(
+        self,
+        result: ScrapingResult,
+        limit: int = TELEGRAM_MESSAGE_LIMIT
+    ) -> Iterator[str]:
+        """Laporan lengkap sebagai chunk siap kirim, langsung dari objek hasil"""
+        stream = self.report_stream(limit)
+        for course_result in result.courses:
+            yield from stream.add_course(course_result)
+        yield from stream.finish(result)
+    
+    def _report_header_lines(self) -> List[str]:
+        return ["📚 *LAPORAN STATUS FORUM DISKUSI*", "═" * 40]
+    
+    def _course_lines(self, course_result: CourseResult) -> List[str]:
+        """Baris laporan untuk satu mata kuliah"""
         
-        # Course header
-        parts.append(f"\n📚 *{course_result.course.name}*")
+        lines = ["", f"📚 *{course_result.course.name}*"]
         
         # Meeting statuses
         for meeting in course_result.meetings_status:
-            parts.append(f"  {self._get_status_emoji(meeting.status)} {meeting.message}")
+            lines.append(f"  {self._get_status_emoji(meeting.status)} {meeting.message}")
         
-        return "\n".join(parts)
+        return lines
+    
+    def _format_course_result(self, course_result: CourseResult) -> str:
+        """Format hasil untuk satu mata kuliah (internal)"""
+        return "\n".join(self._course_lines(course_result))
     
     def _format_meeting_info(self, meeting: MeetingInfo) -> str:
         """Format informasi satu pertemuan"""
@@ -216,6 +358,29 @@ class ResultFormatterService:
         
         return " ".join(parts)
     
+    def format_status_changes(self, changes: List[StatusChange]) -> str:
+        """Format notifikasi perubahan status forum (mode /subscribe)"""
+        
+        parts = ["🔔 *Perubahan Status Forum*", ""]
+        
+        current_course = None
+        for change in changes:
+            if change.course_code != current_course:
+                if current_course is not None:
+                    parts.append("")
+                parts.append(f"📚 *{change.course_name}*")
+                current_course = change.course_code
+            parts.append(
+                f"  Pertemuan {change.meeting_number}: "
+                f"{self._get_status_emoji(change.old_status)} → {self._get_status_emoji(change.new_status)}"
+            )
+        
+        from datetime import datetime
+        parts.append("")
+        parts.append(f"🕐 Dicek: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        return "\n".join(parts)
+    
     def format_error_message(self, error: Exception) -> str:
         """Format pesan error yang user-friendly"""
         
@@ -0,0 +1,237 @@
+"""
+Analitik riwayat status forum (vektorisasi NumPy)
+
+Semua fungsi bekerja pada HistoryFrame: kolom HistoryStore yang di-memory-map
+sebagai array NumPy, urut waktu. Agregasi memakai np.unique/bincount/sort
+tanpa loop per baris sehingga tetap cepat untuk jutaan baris.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models import ForumStatus
+from src.services.history_store import COLUMNS, STATUS_CODES, HistoryStore
+
+
+logger = logging.getLogger(__name__)
+
+
+JOINED = STATUS_CODES.index(ForumStatus.JOINED)
+AVAILABLE = STATUS_CODES.index(ForumStatus.AVAILABLE)
+UNAVAILABLE = STATUS_CODES.index(ForumStatus.UNAVAILABLE)
+OPEN_CODES = (JOINED, AVAILABLE)
+FAILURE_CODES = tuple(
+    STATUS_CODES.index(status)
+    for status in (ForumStatus.UNKNOWN, ForumStatus.ERROR, ForumStatus.TIMEOUT)
+)
+
+_DTYPES = {"d": "<f8", "I": "<u4", "H": "<u2", "B": "u1"}
+
+# Jam kampus (WIB) untuk jadwal pembukaan forum
+DEFAULT_TZ_OFFSET_HOURS = 7
+
+
+@dataclass
+class HistoryFrame:
+    """Kolom riwayat sebagai array NumPy dengan panjang sama, urut waktu"""
+    ts: np.ndarray
+    nim: np.ndarray
+    course: np.ndarray
+    meeting: np.ndarray
+    status: np.ndarray
+    course_codes: List[str]
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def course_code(self, course_id: int) -> str:
+        return self.course_codes[course_id]
+
+
+def load_history(store: HistoryStore, since: Optional[float] = None) -> HistoryFrame:
+    """Memory-map kolom store; baris sebelum `since` (unix time) dilewati"""
+    arrays = {}
+    for name, typecode in COLUMNS.items():
+        path = store.column_path(name)
+        dtype = np.dtype(_DTYPES[typecode])
+        if os.path.exists(path) and os.path.getsize(path) >= dtype.itemsize:
+            arrays[name] = np.memmap(path, dtype=dtype, mode="r")
+        else:
+            arrays[name] = np.empty(0, dtype=dtype)
+
+    # Append yang terputus: potong ke kolom terpendek
+    rows = min(len(values) for values in arrays.values())
+    arrays = {name: values[:rows] for name, values in arrays.items()}
+
+    ts = arrays["ts"]
+    if rows > 1 and not np.all(ts[1:] >= ts[:-1]):
+        # Jam sistem sempat mundur - urutkan ulang (stabil)
+        logger.warning("History timestamps out of order, sorting in memory")
+        order = np.argsort(ts, kind="stable")
+        arrays = {name: np.asarray(values)[order] for name, values in arrays.items()}
+        ts = arrays["ts"]
+
+    if since is not None and rows:
+        start = int(np.searchsorted(ts, since, side="left"))
+        arrays = {name: values[start:] for name, values in arrays.items()}
+
+    return HistoryFrame(course_codes=store.course_codes, **arrays)
+
+
+def _meeting_keys(frame: HistoryFrame) -> np.ndarray:
+    """Key (mata kuliah, pertemuan) per baris"""
+    return (frame.course.astype(np.uint32) << 16) | frame.meeting.astype(np.uint32)
+
+
+def _user_meeting_keys(frame: HistoryFrame) -> np.ndarray:
+    """Key (NIM, mata kuliah, pertemuan) per baris"""
+    return (frame.nim.astype(np.uint64) << np.uint64(32)) | _meeting_keys(frame).astype(np.uint64)
+
+
+def _first_seen(keys: np.ndarray, ts: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Key unik di baris mask beserta timestamp kemunculan pertamanya"""
+    unique, first_index = np.unique(keys[mask], return_index=True)
+    return unique, ts[mask][first_index]
+
+
+def _group_stats(group_ids: np.ndarray, values: np.ndarray) -> Dict[int, Dict[str, float]]:
+    """Statistik values per group id (jumlah, mean, median, p90)"""
+    if not len(values):
+        return {}
+    order = np.lexsort((values, group_ids))
+    group_ids, values = group_ids[order], values[order]
+    groups, starts = np.unique(group_ids, return_index=True)
+    stats = {}
+    for group, chunk in zip(groups, np.split(values, starts[1:])):
+        stats[int(group)] = {
+            "samples": int(len(chunk)),
+            "mean": float(chunk.mean()),
+            "median": float(np.median(chunk)),
+            "p90": float(np.percentile(chunk, 90)),
+        }
+    return stats
+
+
+def time_to_join(frame: HistoryFrame) -> Dict[str, Dict[str, float]]:
+    """
+    Waktu dari forum terlihat tersedia sampai user bergabung, per mata kuliah
+
+    Hanya pasangan (NIM, pertemuan) yang pernah terlihat AVAILABLE sebelum
+    JOINED yang dihitung. Nilai dalam jam.
+    """
+    keys = _user_meeting_keys(frame)
+    available_keys, available_ts = _first_seen(keys, frame.ts, frame.status == AVAILABLE)
+    joined_keys, joined_ts = _first_seen(keys, frame.ts, frame.status == JOINED)
+
+    common, available_idx, joined_idx = np.intersect1d(
+        available_keys, joined_keys, assume_unique=True, return_indices=True
+    )
+    delta_hours = (joined_ts[joined_idx] - available_ts[available_idx]) / 3600.0
+    valid = delta_hours > 0
+    course_ids = ((common[valid] >> np.uint64(16)) & np.uint64(0xFFFF)).astype(np.int64)
+
+    return {
+        frame.course_code(course_id): stats
+        for course_id, stats in _group_stats(course_ids, delta_hours[valid]).items()
+    }
+
+
+def opening_windows(frame: HistoryFrame) -> Dict[Tuple[str, int], Tuple[float, float]]:
+    """
+    Rentang waktu pembukaan forum per (kode mata kuliah, pertemuan)
+
+    Returns:
+        Dict (kode, pertemuan) -> (terakhir terlihat UNAVAILABLE, pertama
+        terlihat terbuka) dari scan user mana pun. Hanya pertemuan yang
+        pernah terlihat tertutup lalu terbuka yang dimasukkan.
+    """
+    keys = _meeting_keys(frame)
+    open_keys, open_ts = _first_seen(keys, frame.ts, np.isin(frame.status, OPEN_CODES))
+    if not len(open_keys):
+        return {}
+
+    closed = frame.status == UNAVAILABLE
+    closed_keys, closed_ts = keys[closed], frame.ts[closed]
+
+    # Observasi tertutup yang terjadi sebelum forum pertama kali terlihat terbuka
+    position = np.searchsorted(open_keys, closed_keys)
+    position = np.minimum(position, len(open_keys) - 1)
+    before_open = (open_keys[position] == closed_keys) & (closed_ts < open_ts[position])
+
+    last_closed = np.full(len(open_keys), -np.inf)
+    np.maximum.at(last_closed, position[before_open], closed_ts[before_open])
+
+    observed = np.isfinite(last_closed)
+    return {
+        (frame.course_code(int(key >> 16)), int(key & 0xFFFF)): (float(closed_at), float(opened_at))
+        for key, closed_at, opened_at in zip(
+            open_keys[observed], last_closed[observed], open_ts[observed]
+        )
+    }
+
+
+def latest_open_meetings(frame: HistoryFrame) -> Dict[str, int]:
+    """Nomor pertemuan tertinggi yang pernah terlihat terbuka, per mata kuliah"""
+    is_open = np.isin(frame.status, OPEN_CODES)
+    if not is_open.any():
+        return {}
+    latest = np.zeros(len(frame.course_codes), dtype=np.int64)
+    np.maximum.at(latest, frame.course[is_open].astype(np.int64), frame.meeting[is_open])
+    return {
+        frame.course_code(course_id): int(meeting)
+        for course_id, meeting in enumerate(latest) if meeting > 0
+    }
+
+
+def opening_schedule(
+    frame: HistoryFrame,
+    tz_offset_hours: float = DEFAULT_TZ_OFFSET_HOURS
+) -> Dict[str, np.ndarray]:
+    """
+    Kapan mata kuliah membuka forum: histogram 7x24 (hari Senin=0, jam)
+
+    Waktu pembukaan diperkirakan dengan titik tengah opening_windows.
+    """
+    windows = opening_windows(frame)
+    if not windows:
+        return {}
+
+    codes = np.array([code for code, _ in windows])
+    bounds = np.array(list(windows.values()))
+    local = (bounds.mean(axis=1) + tz_offset_hours * 3600).astype(np.int64)
+    # 1970-01-01 adalah hari Kamis (indeks 3 jika Senin=0)
+    weekday = ((local // 86400) + 3) % 7
+    hour = (local // 3600) % 24
+
+    schedule = {}
+    for code in np.unique(codes):
+        mask = codes == code
+        histogram = np.zeros((7, 24), dtype=np.int64)
+        np.add.at(histogram, (weekday[mask], hour[mask]), 1)
+        schedule[str(code)] = histogram
+    return schedule
+
+
+def error_rates(frame: HistoryFrame) -> Dict[Tuple[str, int], Dict[str, float]]:
+    """Proporsi pengecekan gagal (unknown/error/timeout) per (kode, pertemuan)"""
+    if not len(frame):
+        return {}
+
+    unique, inverse = np.unique(_meeting_keys(frame), return_inverse=True)
+    checks = np.bincount(inverse, minlength=len(unique))
+    failures = np.bincount(
+        inverse, weights=np.isin(frame.status, FAILURE_CODES), minlength=len(unique)
+    )
+
+    return {
+        (frame.course_code(int(key >> 16)), int(key & 0xFFFF)): {
+            "checks": int(total),
+            "failures": int(failed),
+            "rate": float(failed / total),
+        }
+        for key, total, failed in zip(unique, checks, failures)
+    }
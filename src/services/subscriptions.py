@@ -0,0 +1,359 @@
+"""
+Mode /subscribe: scan berkala dengan notifikasi hanya saat status berubah
+
+Kredensial subscriber disimpan terenkripsi di database job store. Scheduler
+menyebar jadwal scan tiap subscriber secara acak (jitter) di sepanjang
+interval sehingga beban ke Mentari rata, lalu membandingkan hasil scan
+dengan snapshot sebelumnya dan hanya mengirim pesan jika ada perubahan.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.models import (
+    ForumStatus, LoginCredentials, ScrapingResult, StatusChange
+)
+from src.services.job_store import CredentialVault
+
+
+logger = logging.getLogger(__name__)
+
+
+# Status sementara tidak dianggap perubahan (snapshot lama dipertahankan)
+TRANSIENT_STATUSES = {ForumStatus.UNKNOWN.value, ForumStatus.ERROR.value, ForumStatus.TIMEOUT.value}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscriptions (
+    chat_id INTEGER PRIMARY KEY,
+    nim TEXT NOT NULL,
+    secret BLOB NOT NULL,
+    snapshot TEXT,
+    next_run REAL NOT NULL,
+    created_at REAL NOT NULL,
+    login_failures INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+@dataclass
+class Subscription:
+    """Satu subscriber yang jatuh tempo untuk di-scan"""
+    chat_id: int
+    nim: str
+    credentials: Optional[LoginCredentials]
+    snapshot: Optional[Dict[str, str]]
+
+
+def diff_snapshots(
+    previous: Dict[str, str],
+    result: ScrapingResult
+) -> Tuple[List[StatusChange], Dict[str, str]]:
+    """
+    Bandingkan hasil scan dengan snapshot sebelumnya
+
+    Returns:
+        Tuple (daftar perubahan, snapshot baru). Pertemuan dengan status
+        sementara (error/timeout/unknown) tidak dilaporkan dan status
+        lamanya dipertahankan di snapshot baru.
+    """
+    changes = []
+    snapshot = dict(previous)
+
+    for course_result in result.courses:
+        course = course_result.course
+        for meeting in course_result.meetings_status:
+            key = f"{course.code}:{meeting.number}"
+            new_value = meeting.status.value
+            if new_value in TRANSIENT_STATUSES:
+                continue
+
+            old_value = previous.get(key)
+            snapshot[key] = new_value
+            if old_value is not None and old_value != new_value:
+                changes.append(StatusChange(
+                    course_code=course.code,
+                    course_name=course.name,
+                    meeting_number=meeting.number,
+                    old_status=ForumStatus(old_value),
+                    new_status=meeting.status
+                ))
+
+    return changes, snapshot
+
+
+class SubscriptionStore:
+    """Penyimpanan subscriber di SQLite (database yang sama dengan job store)"""
+
+    def __init__(self, path: str, vault: CredentialVault):
+        self.vault = vault
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(subscriptions)")}
+        if "login_failures" not in columns:
+            self._conn.execute(
+                "ALTER TABLE subscriptions ADD COLUMN login_failures INTEGER NOT NULL DEFAULT 0"
+            )
+
+    def subscribe(self, chat_id: int, credentials: LoginCredentials, first_run: float):
+        """Tambah atau perbarui subscriber; snapshot lama dibuang"""
+        secret = self.vault.encrypt(credentials.password)
+        if secret is None:
+            raise ValueError("JOB_STORE_KEY belum diset; kredensial tidak bisa disimpan aman")
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO subscriptions "
+                "(chat_id, nim, secret, snapshot, next_run, created_at, login_failures) "
+                "VALUES (?, ?, ?, NULL, ?, ?, 0)",
+                (chat_id, credentials.nim, secret, first_run, time.time())
+            )
+
+    def unsubscribe(self, chat_id: int) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM subscriptions WHERE chat_id = ?", (chat_id,))
+            return cursor.rowcount > 0
+
+    def is_subscribed(self, chat_id: int) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM subscriptions WHERE chat_id = ?", (chat_id,)
+            ).fetchone()
+            return row is not None
+
+    def claim_due(self, now: float, limit: int, lease: float) -> List[Subscription]:
+        """
+        Ambil subscriber yang jatuh tempo
+
+        next_run digeser sejauh lease agar subscriber yang sedang di-scan
+        tidak diambil lagi pada tick berikutnya.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chat_id, nim, secret, snapshot FROM subscriptions "
+                "WHERE next_run <= ? ORDER BY next_run LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            for row in rows:
+                self._conn.execute(
+                    "UPDATE subscriptions SET next_run = ? WHERE chat_id = ?", (now + lease, row[0])
+                )
+
+        subscriptions = []
+        for chat_id, nim, secret, snapshot in rows:
+            password = self.vault.decrypt(secret)
+            subscriptions.append(Subscription(
+                chat_id=chat_id,
+                nim=nim,
+                credentials=LoginCredentials(nim=nim, password=password) if password else None,
+                snapshot=json.loads(snapshot) if snapshot else None
+            ))
+        return subscriptions
+
+    def save_snapshot(self, chat_id: int, snapshot: Dict[str, str], next_run: float):
+        """Simpan snapshot scan yang berhasil; hitungan login gagal direset"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE subscriptions SET snapshot = ?, next_run = ?, login_failures = 0 WHERE chat_id = ?",
+                (json.dumps(snapshot), next_run, chat_id)
+            )
+
+    def waiting_on(self, key: str, not_before: float) -> List[int]:
+        """Subscriber yang snapshot-nya mencatat key (kode:pertemuan) belum tersedia
+        dan jadwal berikutnya masih setelah not_before"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chat_id, snapshot FROM subscriptions WHERE next_run > ? AND snapshot IS NOT NULL",
+                (not_before,)
+            ).fetchall()
+        return [
+            chat_id for chat_id, snapshot in rows
+            if json.loads(snapshot).get(key) == ForumStatus.UNAVAILABLE.value
+        ]
+
+    def record_login_failure(self, chat_id: int, next_run: float) -> int:
+        """Catat login gagal dan jadwalkan ulang; kembalikan jumlah gagal berturut-turut"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE subscriptions SET login_failures = login_failures + 1, next_run = ? "
+                "WHERE chat_id = ?",
+                (next_run, chat_id)
+            )
+            row = self._conn.execute(
+                "SELECT login_failures FROM subscriptions WHERE chat_id = ?", (chat_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def reschedule(self, chat_id: int, next_run: float):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE subscriptions SET next_run = ? WHERE chat_id = ?", (next_run, chat_id)
+            )
+
+
+class SubscriptionScheduler:
+    """Background task yang menjalankan scan subscriber sesuai jadwal"""
+
+    def __init__(
+        self,
+        store: SubscriptionStore,
+        bot_core,
+        interval: float = 6 * 3600,
+        jitter: float = 0.2,
+        max_parallel: int = 1,
+        tick: float = 30.0,
+        expedite_window: float = 300.0,
+        predictor=None,
+        max_login_failures: int = 3
+    ):
+        self.store = store
+        self.bot_core = bot_core
+        self.notify: Optional[Callable[[int, str], Awaitable[None]]] = None
+        self.interval = interval
+        self.jitter = jitter
+        self.tick = tick
+        self.expedite_window = expedite_window
+        # OpeningPredictor (opsional): cek rapat di sekitar jendela pembukaan forum
+        self.predictor = predictor
+        # Login gagal bisa karena Mentari down/timeout/CAPTCHA, bukan hanya
+        # password salah: langganan baru dihentikan setelah beberapa scan
+        # berturut-turut gagal login
+        self.max_login_failures = max(1, max_login_failures)
+        self._max_parallel = max(1, max_parallel)
+        self._task: Optional[asyncio.Task] = None
+        self._running: set = set()
+        self._expedites: set = set()
+
+    def first_run_time(self) -> float:
+        """Jadwal scan baseline: acak di 10% awal interval agar subscriber baru tidak menumpuk"""
+        return time.time() + random.uniform(0, self.interval * 0.1)
+
+    def _next_run_time(self, snapshot: Optional[Dict[str, str]] = None) -> float:
+        now = time.time()
+        if self.predictor is not None and snapshot:
+            waiting = [key for key, value in snapshot.items() if value == ForumStatus.UNAVAILABLE.value]
+            planned = self.predictor.next_check(waiting, now, self.interval)
+            if planned is not None:
+                # Jitter kecil agar subscriber dengan jendela yang sama tidak serentak
+                return planned + random.uniform(0, (planned - now) * self.jitter)
+        spread = self.interval * self.jitter
+        return now + self.interval + random.uniform(-spread, spread)
+
+    def start(self, notify: Callable[[int, str], Awaitable[None]]):
+        """Mulai scheduler; notify(chat_id, text) dipakai untuk mengirim pesan"""
+        self.notify = notify
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def on_forum_opened(self, course_code: str, meeting_number: int):
+        """
+        Listener AvailabilityIndex: majukan scan subscriber yang masih menunggu
+        forum ini, disebar acak dalam expedite_window agar tidak serentak
+        """
+        if self._task is None or self._task.done():
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._expedite(f"{course_code}:{meeting_number}")
+        )
+        self._expedites.add(task)
+        task.add_done_callback(self._expedites.discard)
+
+    async def _expedite(self, key: str):
+        try:
+            now = time.time()
+            chat_ids = await asyncio.to_thread(
+                self.store.waiting_on, key, now + self.expedite_window
+            )
+            for chat_id in chat_ids:
+                await asyncio.to_thread(
+                    self.store.reschedule, chat_id, now + random.uniform(0, self.expedite_window)
+                )
+            if chat_ids:
+                logger.info(f"Forum {key} opened, expedited {len(chat_ids)} subscription scan(s)")
+        except Exception as e:
+            logger.warning(f"Failed to expedite subscriptions for {key}: {e}")
+
+    async def _run(self):
+        while True:
+            try:
+                free = self._max_parallel - len(self._running)
+                if free > 0:
+                    due = await asyncio.to_thread(
+                        self.store.claim_due, time.time(), free, self.interval
+                    )
+                    for subscription in due:
+                        task = asyncio.create_task(self._scan(subscription))
+                        self._running.add(task)
+                        task.add_done_callback(self._running.discard)
+            except Exception as e:
+                logger.error(f"Subscription scheduler error: {e}")
+            await asyncio.sleep(self.tick)
+
+    async def _scan(self, subscription: Subscription):
+        from src.core.bot_service import LoginFailedError
+
+        if subscription.credentials is None:
+            logger.warning("Subscription credentials cannot be decrypted, unsubscribing")
+            await asyncio.to_thread(self.store.unsubscribe, subscription.chat_id)
+            await self.notify(
+                subscription.chat_id,
+                "⚠️ Langganan dihentikan karena kredensial tidak bisa dibaca. "
+                "Kirim /subscribe lagi untuk berlangganan ulang."
+            )
+            return
+
+        try:
+            # Daftar mata kuliah dideteksi (dan di-cache) per NIM oleh bot core
+            result = await self.bot_core.collect_result(subscription.credentials)
+        except LoginFailedError:
+            failures = await asyncio.to_thread(
+                self.store.record_login_failure, subscription.chat_id, self._next_run_time()
+            )
+            if failures < self.max_login_failures:
+                logger.warning(
+                    f"Subscription login failed ({failures}/{self.max_login_failures}), rescheduling"
+                )
+                return
+            await asyncio.to_thread(self.store.unsubscribe, subscription.chat_id)
+            await self.notify(
+                subscription.chat_id,
+                f"🔐 Login gagal pada {failures} pengecekan berkala berturut-turut. "
+                "Langganan dihentikan.\n\n"
+                "Jika password sudah diganti, kirim /subscribe lagi."
+            )
+            return
+        except Exception as e:
+            logger.warning(f"Subscription scan failed: {e}")
+            await asyncio.to_thread(self.store.reschedule, subscription.chat_id, self._next_run_time())
+            return
+
+        changes, snapshot = diff_snapshots(subscription.snapshot or {}, result)
+        await asyncio.to_thread(
+            self.store.save_snapshot, subscription.chat_id, snapshot, self._next_run_time(snapshot)
+        )
+
+        if changes:
+            logger.info(f"Subscription scan found {len(changes)} status change(s)")
+            await self.notify(
+                subscription.chat_id,
+                self.bot_core.formatter_service.format_status_changes(changes)
+            )
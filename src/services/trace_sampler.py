@@ -0,0 +1,113 @@
+"""
+Tail-based sampling untuk Playwright trace
+
+Setiap job merekam trace ringan (DOM snapshot tanpa screencast). Di akhir job
+trace hanya disimpan jika job lambat atau ada pertemuan ERROR/TIMEOUT/UNKNOWN;
+selain itu trace dibuang tanpa pernah ditulis ke disk.
+
+Rekaman dimulai setelah login berhasil agar kredensial yang diketik di form
+login tidak pernah masuk ke snapshot trace.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from playwright.async_api import BrowserContext
+
+from src.models import ForumStatus, ScrapingResult
+from src.config import app_settings
+from src.services.artifact_store import prune_directory
+
+
+logger = logging.getLogger(__name__)
+
+
+PROBLEM_STATUSES = (ForumStatus.ERROR, ForumStatus.TIMEOUT, ForumStatus.UNKNOWN)
+
+
+class TraceSampler:
+    """Rekam trace untuk satu job dan simpan hanya untuk job yang bermasalah"""
+
+    def __init__(self, settings=None):
+        self.settings = settings or app_settings
+        self._recording = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.enable_trace_sampling
+
+    async def start(self, context: BrowserContext):
+        """Mulai tracing pada context (panggil setelah login berhasil)"""
+        if not self.enabled:
+            return
+
+        try:
+            await context.tracing.start(screenshots=False, snapshots=True, sources=False)
+            self._recording = True
+        except Exception as e:
+            logger.warning(f"Failed to start trace recording: {e}")
+
+    def keep_reason(
+        self,
+        duration: float,
+        result: Optional[ScrapingResult] = None,
+        outcome: str = "ok"
+    ) -> Optional[str]:
+        """Alasan menyimpan trace, atau None jika trace boleh dibuang"""
+        if outcome != "ok":
+            return outcome
+        if duration >= self.settings.trace_latency_threshold:
+            return "slow"
+        if result:
+            for course_result in result.courses:
+                for meeting in course_result.meetings_status:
+                    if meeting.status in PROBLEM_STATUSES:
+                        return meeting.status.value
+        return None
+
+    async def finish(
+        self,
+        context: BrowserContext,
+        duration: float,
+        result: Optional[ScrapingResult] = None,
+        outcome: str = "ok"
+    ) -> Optional[str]:
+        """
+        Stop tracing dan simpan trace jika job memenuhi kriteria sampling
+
+        Returns:
+            Optional[str]: Path trace yang disimpan
+        """
+        if not self._recording:
+            return None
+        self._recording = False
+
+        reason = self.keep_reason(duration, result, outcome)
+
+        try:
+            if reason is None:
+                # Discard - trace tidak pernah ditulis ke disk
+                await context.tracing.stop()
+                return None
+
+            os.makedirs(self.settings.trace_dir, exist_ok=True)
+            filename = f"trace_{int(time.time())}_{reason}_{int(duration)}s.zip"
+            filepath = os.path.join(self.settings.trace_dir, filename)
+            await context.tracing.stop(path=filepath)
+
+            # Ring directory: buang trace terlama jika melebihi batas ukuran
+            await asyncio.to_thread(
+                prune_directory,
+                self.settings.trace_dir,
+                self.settings.trace_dir_max_mb * 1024 * 1024
+            )
+
+            logger.info(f"Trace kept ({reason}, {duration:.1f}s): {filepath}")
+            return filepath
+
+        except Exception as e:
+            logger.warning(f"Failed to stop trace recording: {e}")
+            return None
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test AvailabilityIndex: TTL, notifikasi forum terbuka, dan berbagi antar user
+"""
+
+import asyncio
+
+import pytest
+
+from src.models import CourseInfo, ForumStatus, MeetingInfo
+from src.services import availability_index as availability_module
+from src.services.availability_index import AvailabilityIndex
+
+
+# Senin, 1 Januari 2024 00:00 UTC (07:00 WIB)
+BASE = 1704067200.0
+CODE = "20251-03TPLK006-22TIF0093"
+
+
+class FakeClock:
+    """Pengganti modul time untuk availability_index"""
+
+    def __init__(self, now: float = BASE):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(availability_module, "time", fake)
+    return fake
+
+
+def meeting(number: int, status: ForumStatus, estimated: bool = False) -> MeetingInfo:
+    return MeetingInfo(number, status, f"Pertemuan {number}", estimated=estimated)
+
+
+def test_unavailable_expires_after_ttl(clock):
+    index = AvailabilityIndex(ttl=600)
+    index.observe(CODE, meeting(3, ForumStatus.UNAVAILABLE))
+
+    clock.now += 600
+    assert index.known_unavailable(CODE, 3)
+    clock.now += 1
+    assert not index.known_unavailable(CODE, 3)
+
+
+def test_only_real_closed_observations_are_shared(clock):
+    index = AvailabilityIndex(ttl=600)
+    index.observe(CODE, meeting(1, ForumStatus.AVAILABLE))
+    index.observe(CODE, meeting(2, ForumStatus.UNAVAILABLE, estimated=True))
+    index.observe(CODE, meeting(3, ForumStatus.TIMEOUT))
+
+    assert not index.known_unavailable(CODE, 1)
+    assert not index.known_unavailable(CODE, 2)
+    assert not index.known_unavailable(CODE, 3)
+    # TTL 0 mematikan indeks
+    disabled = AvailabilityIndex(ttl=0)
+    disabled.observe(CODE, meeting(4, ForumStatus.UNAVAILABLE))
+    assert not disabled.known_unavailable(CODE, 4)
+
+
+def test_listener_notified_once_when_forum_opens(clock):
+    index = AvailabilityIndex(ttl=600)
+    opened = []
+    index.add_listener(lambda code, number: opened.append((code, number)))
+    index.add_listener(lambda code, number: 1 / 0)  # listener rusak tidak menghentikan yang lain
+
+    # Terbuka tanpa pernah terlihat tertutup: bukan transisi
+    index.observe(CODE, meeting(2, ForumStatus.JOINED))
+    index.observe(CODE, meeting(3, ForumStatus.UNAVAILABLE))
+    clock.now += 60
+    index.observe(CODE, meeting(3, ForumStatus.AVAILABLE))
+    clock.now += 60
+    index.observe(CODE, meeting(3, ForumStatus.JOINED))
+
+    assert opened == [(CODE, 3)]
+
+
+def test_older_observation_does_not_override_newer(clock):
+    index = AvailabilityIndex(ttl=600)
+    opened = []
+    index.add_listener(lambda code, number: opened.append(number))
+
+    index.observe(CODE, meeting(3, ForumStatus.UNAVAILABLE), observed_at=BASE - 120)
+    index.observe(CODE, meeting(3, ForumStatus.AVAILABLE), observed_at=BASE)
+    # Hasil job lama yang baru selesai
+    index.observe(CODE, meeting(3, ForumStatus.UNAVAILABLE), observed_at=BASE - 60)
+
+    assert not index.known_unavailable(CODE, 3)
+    assert opened == [3]
+
+
+def test_scan_of_one_user_skips_closed_meetings_for_the_next(clock, fake_scraper, monkeypatch):
+    index = AvailabilityIndex(ttl=600)
+    monkeypatch.setattr("src.services.forum_scraper.availability_index", index)
+    course = CourseInfo(code=CODE, name="TEST", meetings=[1, 2, 3, 4])
+    status_for = lambda n: ForumStatus.AVAILABLE if n <= 2 else ForumStatus.UNAVAILABLE
+
+    first, first_loads = fake_scraper(status_for)
+    asyncio.run(first._scrape_single_course(None, course))
+    assert sorted(first_loads) == [1, 2, 3, 4]
+
+    # User lain dalam TTL: pertemuan tertutup tidak dimuat ulang
+    clock.now += 300
+    second, second_loads = fake_scraper(status_for)
+    result = asyncio.run(second._scrape_single_course(None, course))
+    assert sorted(second_loads) == [1, 2]
+    estimated = {m.number for m in result.meetings_status if m.estimated}
+    assert estimated == {3, 4}
+
+    # Setelah TTL lewat semua pertemuan dicek lagi
+    clock.now += 601
+    third, third_loads = fake_scraper(status_for)
+    asyncio.run(third._scrape_single_course(None, course))
+    assert sorted(third_loads) == [1, 2, 3, 4]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test binary scan forum_scraper: jumlah page load dan fallback urutan tidak monoton
+"""
+
+import asyncio
+
+import pytest
+
+from src.models import CourseInfo, ForumStatus
+
+
+@pytest.fixture
+def run_scan(fake_scraper, fake_page_pool, monkeypatch):
+    """Scan satu mata kuliah dengan binary strategy; kembalikan (hasil, pertemuan yang dimuat)"""
+    original_sleep = asyncio.sleep
+
+    async def no_sleep(delay, *args, **kwargs):
+        await original_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    fake_page_pool.max_pages = 2
+
+    def run(course_code, open_meetings, total=16):
+        scraper, loads = fake_scraper(
+            lambda n: ForumStatus.AVAILABLE if n in open_meetings else ForumStatus.UNAVAILABLE,
+            scan_strategy="binary"
+        )
+        course = CourseInfo(code=course_code, name="TEST", meetings=list(range(1, total + 1)))
+        result = asyncio.run(scraper._scrape_single_course(None, course))
+        return result, loads
+
+    return run
+
+
+def test_binary_scan_skips_closed_meetings(run_scan):
+    """Pertemuan 1-5 terbuka, 6-16 tertutup: 4 probe + 3 scan, sisanya disimpulkan"""
+    result, loads = run_scan("TEST-BINARY-MONOTONIC", open_meetings={1, 2, 3, 4, 5})
+
+    assert len(loads) == 7, loads
+    assert len(set(loads)) == len(loads)
+
+    statuses = {meeting.number: meeting for meeting in result.meetings_status}
+    assert sorted(statuses) == list(range(1, 17))
+    assert all(statuses[n].status == ForumStatus.AVAILABLE for n in range(1, 6))
+    assert all(statuses[n].status == ForumStatus.UNAVAILABLE for n in range(6, 17))
+    # Hanya pertemuan yang tidak dimuat yang bertanda perkiraan
+    assert {n for n, meeting in statuses.items() if meeting.estimated} == set(range(1, 17)) - set(loads)
+
+
+def test_binary_scan_falls_back_when_not_monotonic(run_scan):
+    """Pertemuan 2 tertutup di antara yang terbuka: semua pertemuan dicek sungguhan"""
+    result, loads = run_scan("TEST-BINARY-GAP", open_meetings={1, 3, 4, 5})
+
+    assert sorted(loads) == list(range(1, 17))
+    assert not any(meeting.estimated for meeting in result.meetings_status)
+    assert len(result.meetings_status) == 16
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
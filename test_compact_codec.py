@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test format biner ringkas hasil scraping (pack_result/unpack_result)
+"""
+
+from src.models import CourseInfo, CourseResult, ForumStatus, MeetingInfo, ScrapingResult
+from src.models.compact import CompactScrapingResult, encode_meeting, pack_result, unpack_result
+
+
+def sample_result() -> ScrapingResult:
+    course = CourseResult.from_course_info(
+        CourseInfo(code="20251-03TPLK006-22TIF0093", name="STATISTIKA DAN PROBABILITAS", meetings=[1, 2, 3, 4, 5, 6])
+    )
+    course.add_meeting_result(MeetingInfo(1, ForumStatus.JOINED, "Pertemuan 1: ✅ Sudah bergabung"))
+    course.add_meeting_result(MeetingInfo(2, ForumStatus.AVAILABLE, "Pertemuan 2: 🟡 Tersedia tapi belum bergabung"))
+    course.add_meeting_result(MeetingInfo(
+        3, ForumStatus.UNAVAILABLE, "Pertemuan 3: ❌ Forum belum tersedia (perkiraan)", estimated=True
+    ))
+    # Pesan di luar tabel, screenshot dan detail error disimpan sebagai extra
+    course.add_meeting_result(MeetingInfo(
+        4, ForumStatus.ERROR, "Pertemuan 4: ❗ Error: net::ERR_CONNECTION_RESET",
+        screenshot_path="screenshots/p4.png", error_details="net::ERR_CONNECTION_RESET"
+    ))
+    course.add_meeting_result(MeetingInfo(5, ForumStatus.TIMEOUT, "Pertemuan 5: ⏰ Timeout - server lambat"))
+    course.add_meeting_result(MeetingInfo(6, ForumStatus.UNKNOWN, "Pertemuan 6: ❔ Status Ω tidak biasa"))
+
+    empty = CourseResult.from_course_info(CourseInfo(code="KOSONG", name="MATA KULIAH KOSONG", meetings=[1]))
+    return ScrapingResult.from_course_results([course, empty], 12.5)
+
+
+def test_round_trip_preserves_result():
+    result = sample_result()
+    data = pack_result(result)
+    restored = unpack_result(data).to_result()
+
+    assert restored.to_dict() == result.to_dict()
+    assert restored.total_meetings == result.total_meetings
+    assert restored.success_rate == result.success_rate
+    assert [meeting.estimated for meeting in restored.courses[0].meetings_status] == [
+        False, False, True, False, False, False
+    ]
+    # Hasil ringkas bisa di-pack ulang tanpa perubahan
+    assert pack_result(unpack_result(data)) == data
+    assert pack_result(CompactScrapingResult.from_result(result)) == data
+
+
+def test_standard_messages_need_no_extra():
+    assert encode_meeting(MeetingInfo(1, ForumStatus.JOINED, "Pertemuan 1: ✅ Sudah bergabung"))[1] is None
+    code, extra = encode_meeting(MeetingInfo(2, ForumStatus.JOINED, "Pesan lain"))
+    assert extra == ("Pesan lain", None, None)
+
+
+def test_invalid_data_raises_value_error():
+    data = pack_result(sample_result())
+    truncated = [data[:length] for length in range(len(data))]
+    for broken in [b"XX" + data[2:]] + truncated:
+        try:
+            unpack_result(broken)
+        except ValueError:
+            continue
+        raise AssertionError(f"unpack_result accepted {len(broken)} bytes")
+
+
+if __name__ == "__main__":
+    test_round_trip_preserves_result()
+    test_standard_messages_need_no_extra()
+    test_invalid_data_raises_value_error()
+    print("OK")
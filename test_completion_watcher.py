@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test CompletionWatchHub: forum satu akun diverifikasi dalam satu login
+"""
+
+import asyncio
+import os
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from src.models import ForumStatus, ForumTarget, LoginCredentials, ParticipationResult
+from src.services.completion_watcher import CompletionWatchHub, WatchTickets
+
+
+class FakeBotCore:
+    """run_forum_actions tanpa browser; forum dianggap selesai pada cek kedua"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def run_forum_actions(self, credentials, targets, action, progress_callback=None, result_callback=None):
+        self.calls.append([(target.course_code, target.meeting_number) for target in targets])
+        done = len(self.calls) >= 2
+        return [
+            ParticipationResult(
+                course_code=target.course_code,
+                meeting_number=target.meeting_number,
+                action=action,
+                success=done,
+                status=ForumStatus.JOINED if done else ForumStatus.AVAILABLE,
+                message="✅" if done else "❌ Belum ada partisipasi di forum"
+            )
+            for target in targets
+        ]
+
+
+def test_watchers_batched_per_account():
+    async def scenario():
+        bot_core = FakeBotCore()
+        recorded = []
+        hub = CompletionWatchHub(
+            bot_core, lambda *args: recorded.append(args), initial_interval=0.05, max_interval=0.05
+        )
+        credentials = LoginCredentials(nim="123", password="secret")
+        first = hub.subscribe(credentials, ForumTarget("COURSE-A", 1))
+        second = hub.subscribe(credentials, ForumTarget("COURSE-B", 2))
+        assert hub.watching == 2
+
+        states = []
+        for subscription in (first, second):
+            while True:
+                state = await subscription.next(timeout=2)
+                assert state is not None
+                states.append(state.state)
+                if state.final:
+                    break
+        await asyncio.sleep(0)
+        await hub.stop()
+        return bot_core.calls, states, recorded, hub.watching
+
+    calls, states, recorded, watching = asyncio.run(scenario())
+
+    # Satu verifikasi (satu login) per putaran untuk kedua forum
+    assert calls == [[("COURSE-A", 1), ("COURSE-B", 2)]] * 2
+    assert states == ["incomplete", "completed", "incomplete", "completed"]
+    assert sorted(recorded) == [("123", "COURSE-A", "1"), ("123", "COURSE-B", "2")]
+    assert watching == 0
+
+
+def test_watch_tickets_expire():
+    tickets = WatchTickets(ttl=0)
+    token = tickets.issue(LoginCredentials(nim="123", password="secret"), ForumTarget("COURSE-A", 1))
+    assert tickets.resolve(token) is None
+    assert tickets.resolve("unknown") is None
+
+    tickets = WatchTickets()
+    token = tickets.issue(LoginCredentials(nim="123", password="secret"), ForumTarget("COURSE-A", 1))
+    credentials, target = tickets.resolve(token)
+    assert (credentials.nim, target.course_code) == ("123", "COURSE-A")
+
+
+if __name__ == "__main__":
+    test_watchers_batched_per_account()
+    test_watch_tickets_expire()
+    print("OK")
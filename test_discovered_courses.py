@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test mata kuliah hasil deteksi dashboard (tidak ada di data/courses.json)
+"""
+
+import os
+import time
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from helper import create_miniapp_keyboard, extract_available_forums_from_courses
+from src.config import env_config
+from src.models import CourseInfo, CourseResult, ForumStatus, MeetingInfo
+from src.services import enrollment_service
+from src.services.enrollment_service import EnrollmentService, parse_course_links
+
+
+DISCOVERED_CODE = "20252-05TPLK001-22TIF0999"
+
+
+def discovered_result() -> CourseResult:
+    result = CourseResult.from_course_info(
+        CourseInfo(code=DISCOVERED_CODE, name="KECERDASAN BUATAN", meetings=[1, 2])
+    )
+    result.add_meeting_result(MeetingInfo(1, ForumStatus.JOINED, "Pertemuan 1: ✅ Sudah bergabung"))
+    result.add_meeting_result(MeetingInfo(2, ForumStatus.AVAILABLE, "Pertemuan 2: 🟡 Tersedia tapi belum bergabung"))
+    return result
+
+
+def test_keyboard_uses_course_code_from_result():
+    forums = extract_available_forums_from_courses([discovered_result()])
+    assert forums == [{
+        'course_name': "KECERDASAN BUATAN",
+        'course_code': DISCOVERED_CODE,
+        'meeting_number': 2,
+        'status': 'available'
+    }]
+
+    original_webhook_url = env_config.webhook_url
+    env_config.webhook_url = "https://bot.example.com/"
+    try:
+        keyboard = create_miniapp_keyboard(forums, {'nim': "123", 'password': "secret"})
+    finally:
+        env_config.webhook_url = original_webhook_url
+    urls = [row[0].web_app.url for row in keyboard.inline_keyboard if row[0].web_app]
+    assert len(urls) == 1
+    # Halaman forum dilayani server terpadu, bukan deploy Flask lama
+    assert urls[0].startswith("https://bot.example.com/forum?")
+    assert f"course_code={DISCOVERED_CODE}" in urls[0]
+
+
+def test_keyboard_without_unified_server_has_no_miniapp_buttons():
+    forums = extract_available_forums_from_courses([discovered_result()])
+
+    original_webhook_url = env_config.webhook_url
+    env_config.webhook_url = None
+    try:
+        keyboard = create_miniapp_keyboard(forums, {'nim': "123", 'password': "secret"})
+    finally:
+        env_config.webhook_url = original_webhook_url
+    assert not any(row[0].web_app for row in keyboard.inline_keyboard)
+
+
+def test_enrollment_cache_prunes_expired_entries():
+    service = EnrollmentService(ttl=60)
+    courses = [CourseInfo(code=DISCOVERED_CODE, name="KECERDASAN BUATAN", meetings=[1])]
+    service._cache["old"] = (time.time() - 120, courses)
+
+    service.store("123", courses)
+
+    assert set(service._cache) == {"123"}
+    assert service.cached("123") == courses
+
+
+def test_discovered_courses_use_their_own_meetings():
+    class FakeCourseConfig:
+        @staticmethod
+        def get_default_courses():
+            return [
+                CourseInfo(code="20251-A", name="STATISTIKA", meetings=[1, 2, 3, 4, 5, 6, 7]),
+                CourseInfo(code="20251-B", name="SISTEM BERKAS", meetings=[1, 2, 3]),
+                CourseInfo(code="20251-C", name="MATEMATIKA DISKRIT", meetings=[1, 2, 3]),
+            ]
+
+    original_config = enrollment_service.course_config
+    enrollment_service.course_config = FakeCourseConfig()
+    try:
+        meetings_for = EnrollmentService(ttl=60).meeting_lookup()
+    finally:
+        enrollment_service.course_config = original_config
+
+    links = [
+        {'href': "/u-courses/20251-A", 'text': "STATISTIKA"},
+        # Kode semester baru, nama sama dengan courses.json
+        {'href': "/u-courses/20252-B?tab=1", 'text': "Sistem Berkas\nDosen X"},
+        {'href': f"/u-courses/{DISCOVERED_CODE}", 'text': "KECERDASAN BUATAN"},
+        {'href': "/u-courses/20251-A", 'text': "duplikat"},
+    ]
+    courses = {course.code: course for course in parse_course_links(links, meetings_for)}
+
+    assert list(courses) == ["20251-A", "20252-B", DISCOVERED_CODE]
+    assert courses["20251-A"].meetings == [1, 2, 3, 4, 5, 6, 7]
+    assert courses["20252-B"].meetings == [1, 2, 3]
+    # Tidak ada di courses.json: daftar pertemuan yang paling umum, bukan gabungan semuanya
+    assert courses[DISCOVERED_CODE].meetings == [1, 2, 3]
+
+
+if __name__ == "__main__":
+    test_keyboard_uses_course_code_from_result()
+    test_keyboard_without_unified_server_has_no_miniapp_buttons()
+    test_enrollment_cache_prunes_expired_entries()
+    test_discovered_courses_use_their_own_meetings()
+    print("OK")
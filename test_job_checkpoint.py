@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test job store: job yang terputus restart dilanjutkan dari checkpoint
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from cryptography.fernet import Fernet
+
+from src.models import CourseInfo, ForumStatus, LoginCredentials, MeetingInfo
+from src.services.job_store import CredentialVault, JobCheckpoint, JobStore, JOB_DONE
+
+
+def test_resume_skips_checkpointed_meetings(fake_scraper):
+    course = CourseInfo(code="TEST-RESUME", name="TEST", meetings=[1, 2, 3, 4])
+    credentials = LoginCredentials(nim="123", password="secret")
+    key = Fernet.generate_key().decode()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.db")
+
+        # Run pertama: pertemuan 1 selesai, pertemuan 2 error, lalu proses mati
+        store = JobStore(path, CredentialVault(key))
+        store.create_job("job-1", 42, credentials, [course])
+        store.record_meeting("job-1", course.code, MeetingInfo(1, ForumStatus.UNAVAILABLE, "Pertemuan 1: ❌ Forum belum tersedia"))
+        store.record_meeting("job-1", course.code, MeetingInfo(2, ForumStatus.ERROR, "Pertemuan 2: ❗ Error"))
+        store.close()
+
+        # Restart: job diklaim ulang dengan kredensial terdekripsi
+        store = JobStore(path, CredentialVault(key))
+        jobs = store.claim_unfinished()
+        assert [(job.job_id, job.chat_id, job.attempts) for job in jobs] == [("job-1", 42, 1)]
+        assert jobs[0].credentials.password == "secret"
+        assert jobs[0].courses[0].code == course.code
+
+        checkpoint = JobCheckpoint(store, "job-1")
+        # Scan ulang: semua pertemuan yang dimuat sudah bergabung
+        scraper, loads = fake_scraper(lambda n: ForumStatus.JOINED)
+        result = asyncio.run(scraper._scrape_single_course(None, jobs[0].courses[0], checkpoint=checkpoint))
+
+        # Pertemuan 1 dari checkpoint; pertemuan error dicek ulang
+        assert sorted(loads) == [2, 3, 4]
+        statuses = {meeting.number: meeting.status for meeting in result.meetings_status}
+        assert statuses == {
+            1: ForumStatus.UNAVAILABLE,
+            2: ForumStatus.JOINED,
+            3: ForumStatus.JOINED,
+            4: ForumStatus.JOINED
+        }
+        # Hasil baru ikut di-checkpoint
+        assert set(store.completed_meetings("job-1")[course.code]) == {1, 2, 3, 4}
+
+        store.finish_job("job-1", JOB_DONE)
+        assert store.claim_unfinished() == []
+        assert store.completed_meetings("job-1") == {}
+        store.close()
+
+
+def test_claim_gives_up_after_max_attempts():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.db"))
+        store.create_job("job-1", 42, LoginCredentials(nim="123", password="secret"))
+        for _ in range(3):
+            jobs = store.claim_unfinished(max_attempts=3)
+            assert len(jobs) == 1 and jobs[0].credentials is None
+        assert store.claim_unfinished(max_attempts=3) == []
+        store.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test route Mini App di server terpadu (tanpa browser dan tanpa Telegram)
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from starlette.testclient import TestClient
+
+from src.core.bot_service import LoginFailedError
+from src.models import ForumStatus, ParticipationResult
+from src.integrations.miniapp_server import create_unified_app
+
+
+BOT_TOKEN = "123:test-token"
+
+
+def make_init_data(bot_token: str = BOT_TOKEN) -> str:
+    """initData bertanda tangan seperti yang dikirim Telegram.WebApp"""
+    fields = {"auth_date": "1700000000", "user": json.dumps({"id": 1})}
+    data_check_string = "\n".join(f"{k}={v}" for k, v in sorted(fields.items()))
+    secret_key = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+    fields["hash"] = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+    return urlencode(fields)
+
+
+def make_creds(nim: str = "123", password: str = "secret") -> str:
+    return base64.b64encode(json.dumps({"nim": nim, "password": password}).encode()).decode()
+
+
+class FakeBotCore:
+    """Bot core yang mencatat panggilan run_forum_actions"""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = []
+
+    async def run_forum_actions(self, credentials, targets, action, progress_callback=None, result_callback=None):
+        self.calls.append((credentials.nim, action, [(t.course_code, t.meeting_number) for t in targets]))
+        if self.error:
+            raise self.error
+        return [
+            ParticipationResult(
+                course_code=target.course_code,
+                meeting_number=target.meeting_number,
+                action=action,
+                success=True,
+                status=ForumStatus.JOINED,
+                message="✅ Berhasil bergabung ke forum"
+            )
+            for target in targets
+        ]
+
+
+def make_client(bot_core, completion_recorder=None) -> TestClient:
+    telegram_app = SimpleNamespace(bot=SimpleNamespace(token=BOT_TOKEN))
+    return TestClient(create_unified_app(telegram_app, bot_core, completion_recorder=completion_recorder))
+
+
+def read_events(response) -> list:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_bulk_join_reports_login_failure():
+    bot_core = FakeBotCore(LoginFailedError("Login gagal setelah semua percobaan"))
+    response = make_client(bot_core).post("/api/bulk-join", json={
+        "forums": [{"course_code": "COURSE-A", "meeting_number": 1}],
+        "creds": make_creds(),
+        "init_data": make_init_data()
+    })
+
+    assert response.status_code == 200
+    events = read_events(response)
+    assert [event["type"] for event in events] == ["start", "error"]
+    assert "Login gagal" in events[-1]["message"]
+    assert bot_core.calls == [("123", "join", [("COURSE-A", 1)])]
+
+
+def test_bulk_join_requires_telegram_auth():
+    bot_core = FakeBotCore()
+    response = make_client(bot_core).post("/api/bulk-join", json={
+        "forums": [{"course_code": "COURSE-A", "meeting_number": 1}],
+        "creds": make_creds(),
+        "init_data": make_init_data("999:other-bot")
+    })
+
+    assert response.status_code == 403
+    assert not bot_core.calls
+
+
+def test_join_forum_uses_bot_core():
+    bot_core = FakeBotCore()
+    client = make_client(bot_core)
+    forum = {"course_code": "COURSE-A", "meeting_number": "3", "course_title": "Kursus A"}
+
+    response = client.post("/api/join-forum", json=forum)
+    assert response.status_code == 403
+    assert not bot_core.calls
+
+    response = client.post("/api/join-forum", json={**forum, "creds": make_creds(), "init_data": make_init_data()})
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["success"] and payload["status"] == "joined"
+    assert payload["forum_url"].endswith("/u-courses/COURSE-A?accord_pertemuan=PERTEMUAN_3")
+    assert bot_core.calls == [("123", "join", [("COURSE-A", 3)])]
+
+
+def test_mark_completed_records_authenticated_nim():
+    recorded = []
+    client = make_client(FakeBotCore(), lambda *args: recorded.append(args))
+    forum = {"course_code": "COURSE-A", "meeting_number": 2, "nim": "someone-else"}
+
+    response = client.post("/api/mark-completed", json=forum)
+    assert response.status_code == 403
+    assert not recorded
+
+    response = client.post("/api/mark-completed", json={**forum, "creds": make_creds(), "init_data": make_init_data()})
+    assert response.status_code == 200
+    assert recorded == [("123", "COURSE-A", "2")]
+
+
+def test_check_completion_verifies_with_bot_core():
+    recorded = []
+    bot_core = FakeBotCore()
+    client = make_client(bot_core, lambda *args: recorded.append(args))
+
+    response = client.post("/api/check-completion", json={
+        "course_code": "COURSE-A", "meeting_number": "4",
+        "creds": make_creds(), "init_data": make_init_data()
+    })
+    assert response.status_code == 200
+    assert response.json()["completed"] is True
+    assert bot_core.calls == [("123", "verify", [("COURSE-A", 4)])]
+    assert recorded == [("123", "COURSE-A", "4")]
+
+
+if __name__ == "__main__":
+    test_bulk_join_reports_login_failure()
+    test_bulk_join_requires_telegram_auth()
+    test_join_forum_uses_bot_core()
+    test_mark_completed_records_authenticated_nim()
+    test_check_completion_verifies_with_bot_core()
+    print("OK")
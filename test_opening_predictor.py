@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test OpeningPredictor: irama pembukaan, jendela perkiraan, dan jadwal cek
+"""
+
+import os
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from src.services.opening_predictor import OpeningPredictor
+
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+BASE = 1_700_000_000.0
+CODE = "20251-03TPLK006-22TIF0093"
+
+
+def weekly_windows(meetings, code=CODE, half_width=600):
+    """Forum pertemuan n terbuka tepat seminggu setelah pertemuan n-1"""
+    return {
+        (code, meeting): (BASE + (meeting - 1) * WEEK - half_width, BASE + (meeting - 1) * WEEK + half_width)
+        for meeting in meetings
+    }
+
+
+def test_regular_weekly_openings():
+    predictor = OpeningPredictor()
+    forecast = predictor.fit(weekly_windows([1, 2, 3, 4]))[CODE]
+
+    assert forecast.meeting_number == 5
+    assert forecast.samples == 4
+    assert forecast.expected_at == BASE + 4 * WEEK
+    # Irama tanpa deviasi: jendela selebar min_spread
+    assert forecast.window_start == forecast.expected_at - HOUR
+    assert forecast.window_end == forecast.expected_at + HOUR
+
+
+def test_latest_open_meeting_moves_forecast_forward():
+    predictor = OpeningPredictor()
+    forecast = predictor.fit(weekly_windows([1, 2, 3]), latest_open={CODE: 5})[CODE]
+
+    # Pertemuan 4-5 terlihat terbuka tanpa transisi teramati
+    assert forecast.meeting_number == 6
+    assert forecast.expected_at == BASE + 5 * WEEK
+
+
+def test_single_observation_falls_back_to_default_cadence():
+    predictor = OpeningPredictor(default_cadence=WEEK)
+    forecast = predictor.fit(weekly_windows([3]))[CODE]
+
+    assert forecast.meeting_number == 4
+    assert forecast.expected_at == BASE + 3 * WEEK
+    # Tanpa irama teramati jendela dibuat lebar (cadence / 7)
+    assert forecast.window_end - forecast.expected_at == DAY
+
+
+def test_next_check_without_forecast_uses_interval():
+    predictor = OpeningPredictor()
+    now = BASE
+
+    assert predictor.next_check([], now, 6 * HOUR) is None
+    assert predictor.next_check([f"{CODE}:5"], now, 6 * HOUR) == now + 6 * HOUR
+
+
+def test_next_check_waits_for_window_with_backoff_cap():
+    predictor = OpeningPredictor(max_backoff=3.0)
+    forecast = predictor.fit(weekly_windows([1, 2, 3, 4]))[CODE]
+
+    # Jendela dekat: cek tepat saat jendela dibuka
+    now = forecast.window_start - 2 * HOUR
+    assert predictor.next_check([f"{CODE}:5"], now, 6 * HOUR) == forecast.window_start
+
+    # Jendela masih jauh: dibatasi interval * max_backoff
+    now = forecast.window_start - 5 * DAY
+    assert predictor.next_check([f"{CODE}:5"], now, 6 * HOUR) == now + 18 * HOUR
+
+
+def test_next_check_inside_window_is_dense_but_clamped():
+    predictor = OpeningPredictor(min_check_interval=900)
+    forecast = predictor.fit(weekly_windows([1, 2, 3, 4]))[CODE]
+    now = forecast.expected_at
+
+    # Jendela 2 jam: seperempatnya 30 menit
+    assert predictor.next_check([f"{CODE}:5"], now, 6 * HOUR) == now + 30 * 60
+
+    # Jendela sempit: tidak lebih rapat dari min_check_interval
+    predictor.min_spread = 600
+    forecast = predictor.fit(weekly_windows([1, 2, 3, 4], half_width=60))[CODE]
+    now = forecast.expected_at
+    assert predictor.next_check([f"{CODE}:5"], now, 6 * HOUR) == now + 900
+
+
+def test_next_check_after_missed_window_uses_interval():
+    predictor = OpeningPredictor()
+    forecast = predictor.fit(weekly_windows([1, 2, 3, 4]))[CODE]
+    now = forecast.window_end + 1
+
+    assert predictor.next_check([f"{CODE}:5"], now, 6 * HOUR) == now + 6 * HOUR
+
+
+def test_next_check_takes_earliest_course():
+    other = "20251-03TPLK007-22TIF0093"
+    predictor = OpeningPredictor()
+    windows = weekly_windows([1, 2, 3, 4])
+    windows.update(weekly_windows([1, 2, 3], code=other))
+    forecasts = predictor.fit(windows)
+
+    now = forecasts[other].window_start - HOUR
+    assert predictor.next_check([f"{CODE}:5", f"{other}:4"], now, 6 * HOUR) == forecasts[other].window_start
+
+
+if __name__ == "__main__":
+    test_regular_weekly_openings()
+    test_latest_open_meeting_moves_forecast_forward()
+    test_single_observation_falls_back_to_default_cadence()
+    test_next_check_without_forecast_uses_interval()
+    test_next_check_waits_for_window_with_backoff_cap()
+    test_next_check_inside_window_is_dense_but_clamped()
+    test_next_check_after_missed_window_uses_interval()
+    test_next_check_takes_earliest_course()
+    print("OK")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test PagePool: pool dilepas dari registry saat context ditutup
+"""
+
+import asyncio
+import gc
+import os
+import weakref
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from src.services.page_pool import PagePool
+
+
+class FakePage:
+    """Page tanpa browser; seperti Playwright, memegang context-nya"""
+
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def set_viewport_size(self, size):
+        pass
+
+    async def set_extra_http_headers(self, headers):
+        pass
+
+    async def goto(self, url, timeout=None):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    """BrowserContext minimal dengan event close"""
+
+    def __init__(self):
+        self._handlers = []
+
+    def on(self, event, handler):
+        if event == "close":
+            self._handlers.append(handler)
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        for handler in self._handlers:
+            handler(self)
+
+
+def test_pool_released_on_context_close():
+    async def scenario():
+        context = FakeContext()
+        pool = PagePool.for_context(context)
+        assert PagePool.for_context(context) is pool
+
+        async with pool.page() as page:
+            assert page.context is context
+        assert len(pool._idle) == 1
+
+        await context.close()
+        assert context not in PagePool._pools
+        assert not pool._idle
+        return weakref.ref(context)
+
+    context_ref = asyncio.run(scenario())
+    gc.collect()
+    assert context_ref() is None
+
+
+if __name__ == "__main__":
+    test_pool_released_on_context_close()
+    print("OK")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test readiness bot core dan outcome time_phase
+"""
+
+import asyncio
+import os
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from src.core.bot_service import MentariBotCore
+from src.core.metrics import PHASE_DURATION, time_phase
+
+
+class FakeWorkerPool:
+    """Worker pool dengan status tetap"""
+
+    def __init__(self, warm: int, pending: int = 0):
+        self.warm = warm
+        self.pending = pending
+
+    def readiness(self) -> dict:
+        return {
+            'running': True,
+            'workers': 2,
+            'workers_alive': 2,
+            'workers_warm': self.warm,
+            'pending_jobs': self.pending,
+            'last_browser_error': None if self.warm else "launch failed"
+        }
+
+
+def test_readiness_follows_worker_pool():
+    bot_core = MentariBotCore()
+    assert not bot_core.get_readiness()['ready']
+
+    bot_core.worker_pool = FakeWorkerPool(warm=0)
+    readiness = bot_core.get_readiness()
+    assert not readiness['ready']
+    assert readiness['last_browser_error'] == "launch failed"
+
+    bot_core.worker_pool = FakeWorkerPool(warm=1, pending=3)
+    readiness = bot_core.get_readiness()
+    assert readiness['ready'] and readiness['browser_warm']
+    assert readiness['queue_depth'] == 3
+
+    bot_core.worker_pool = FakeWorkerPool(warm=2, pending=8)
+    assert not bot_core.get_readiness()['ready']
+
+    # Worker memanaskan browser sendiri; proses bot tidak meluncurkan browser
+    assert asyncio.run(bot_core.warm_up())
+
+
+def test_time_phase_outcomes():
+    async def cancelled_phase():
+        with time_phase("test_cancel"):
+            await asyncio.sleep(10)
+
+    async def scenario():
+        task = asyncio.create_task(cancelled_phase())
+        await asyncio.sleep(0)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(scenario())
+    assert PHASE_DURATION.count(phase="test_cancel", outcome="cancelled") == 1
+    assert PHASE_DURATION.count(phase="test_cancel", outcome="error") == 0
+
+    for message in ("Timeout 30000ms exceeded", "boom"):
+        try:
+            with time_phase("test_error"):
+                raise RuntimeError(message)
+        except RuntimeError:
+            pass
+    assert PHASE_DURATION.count(phase="test_error", outcome="timeout") == 1
+    assert PHASE_DURATION.count(phase="test_error", outcome="error") == 1
+
+
+if __name__ == "__main__":
+    test_readiness_follows_worker_pool()
+    test_time_phase_outcomes()
+    print("OK")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test pemecahan laporan ke chunk Telegram (limit 4096 UTF-16, Markdown utuh)
+"""
+
+from src.models import CourseInfo, CourseResult, ForumStatus, MeetingInfo, ScrapingResult
+from src.services.result_formatter import (
+    CONTINUATION_SUFFIX,
+    TELEGRAM_MESSAGE_LIMIT,
+    ResultFormatterService,
+    telegram_length,
+)
+
+
+STATUSES = [ForumStatus.JOINED, ForumStatus.AVAILABLE, ForumStatus.UNAVAILABLE, ForumStatus.TIMEOUT]
+
+
+def big_result(courses: int = 40, meetings: int = 16) -> ScrapingResult:
+    """Laporan panjang dengan emoji (2 code unit) dan entity Markdown di tiap baris"""
+    course_results = []
+    for index in range(courses):
+        course = CourseResult.from_course_info(CourseInfo(
+            code=f"20251-03TPLK006-22TIF{index:04d}",
+            name=f"MATA KULIAH 🎓 NOMOR {index}",
+            meetings=list(range(1, meetings + 1))
+        ))
+        for number in range(1, meetings + 1):
+            course.add_meeting_result(MeetingInfo(
+                number, STATUSES[number % len(STATUSES)], f"Pertemuan {number}: 🟡 forum *penting* `P{number}`"
+            ))
+        course_results.append(course)
+    return ScrapingResult.from_course_results(course_results, 42.0)
+
+
+def assert_markdown_balanced(chunk: str):
+    for marker in ("*", "`"):
+        assert chunk.count(marker) % 2 == 0, f"unbalanced {marker!r} in chunk:\n{chunk[:200]}"
+
+
+def test_telegram_length_counts_utf16_units():
+    assert telegram_length("abc") == 3
+    assert telegram_length("✅") == 1      # BMP
+    assert telegram_length("🟡📚") == 4    # di luar BMP: surrogate pair
+    assert len("🟡📚") == 2
+
+
+def test_chunks_fit_limit_and_keep_markdown():
+    formatter = ResultFormatterService()
+    result = big_result()
+    chunks = list(formatter.iter_report_chunks(result))
+
+    assert len(chunks) > 2
+    # Jumlah karakter Python bisa di bawah limit padahal UTF-16 sudah lewat
+    assert sum(telegram_length(chunk) for chunk in chunks) > sum(len(chunk) for chunk in chunks)
+    for index, chunk in enumerate(chunks):
+        assert telegram_length(chunk) <= TELEGRAM_MESSAGE_LIMIT
+        assert_markdown_balanced(chunk)
+        assert chunk.endswith(CONTINUATION_SUFFIX) == (index < len(chunks) - 1)
+        if index:
+            assert chunk.startswith(f"📄 *Lanjutan {index + 1}*")
+
+    # Semua baris pertemuan terkirim tepat sekali dan urut
+    text = "\n".join(chunks)
+    positions = [
+        text.index(f"📚 *MATA KULIAH 🎓 NOMOR {index}*\n") for index in range(len(result.courses))
+    ]
+    assert positions == sorted(positions)
+    assert text.count("forum *penting*") == 40 * 16
+    assert "RINGKASAN STATUS" in chunks[-1]
+
+
+def test_course_not_split_when_it_fits_next_chunk():
+    formatter = ResultFormatterService()
+    for chunk in formatter.iter_report_chunks(big_result(courses=12, meetings=16)):
+        # Setiap chunk memuat mata kuliah utuh: header diikuti semua pertemuannya
+        for section in chunk.split("📚 *MATA KULIAH")[1:]:
+            assert section.count("forum *penting*") == 16
+
+
+def test_overlong_line_split_without_markdown():
+    formatter = ResultFormatterService()
+    course = CourseResult.from_course_info(CourseInfo(code="LONG", name="PANJANG", meetings=[1]))
+    course.add_meeting_result(MeetingInfo(1, ForumStatus.ERROR, "*tebal* " + "🟡" * 5000 + " `kode`"))
+    chunks = list(formatter.iter_report_chunks(ScrapingResult.from_course_results([course], 1.0)))
+
+    assert len(chunks) >= 3
+    for chunk in chunks:
+        assert telegram_length(chunk) <= TELEGRAM_MESSAGE_LIMIT
+        assert_markdown_balanced(chunk)
+    # Ringkasan punya 🟡 sendiri; hitung hanya isi baris yang dipecah
+    body = "".join(chunk.split("RINGKASAN STATUS")[0] for chunk in chunks)
+    assert body.count("🟡") == 5000
+
+
+def test_stream_emits_first_course_immediately():
+    formatter = ResultFormatterService()
+    result = big_result(courses=3, meetings=2)
+    stream = formatter.report_stream()
+
+    first = stream.add_course(result.courses[0])
+    assert len(first) == 1 and "NOMOR 0" in first[0]
+    assert stream.add_course(result.courses[1]) == []
+    assert "NOMOR 1" in stream.pending_text()
+    stream.add_course(result.courses[2])
+    rest = stream.finish(result)
+    assert "NOMOR 2" in rest[-1] and not rest[-1].endswith(CONTINUATION_SUFFIX)
+    assert stream.finish(result) == []
+
+
+if __name__ == "__main__":
+    test_telegram_length_counts_utf16_units()
+    test_chunks_fit_limit_and_keep_markdown()
+    test_course_not_split_when_it_fits_next_chunk()
+    test_overlong_line_split_without_markdown()
+    test_stream_emits_first_course_immediately()
+    print("OK")
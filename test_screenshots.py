@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test screenshot pertemuan bermasalah: capture tidak ditunggu hasil scan,
+tetapi page tidak dinavigasi ulang sebelum capture selesai
+"""
+
+import asyncio
+import os
+import tempfile
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from src.config import AppSettings
+from src.models import ForumStatus
+from src.services.forum_scraper import ForumScraperService
+
+
+class SlowScreenshotPage:
+    """Page yang screenshot-nya baru selesai saat finish di-set"""
+
+    def __init__(self):
+        self.finish = asyncio.Event()
+
+    async def screenshot(self, **options):
+        await self.finish.wait()
+        return b"jpeg"
+
+
+def test_screenshot_runs_in_background_and_holds_page():
+    async def scenario(directory):
+        scraper = ForumScraperService(AppSettings(enable_screenshots=True, screenshot_dir=directory))
+        page = SlowScreenshotPage()
+        navigations = []
+
+        async def load_page(page, url):
+            navigations.append(url.rsplit("_", 1)[1])
+
+        async def find_section(page, meeting_num):
+            return None
+
+        scraper._load_page_with_retry = load_page
+        scraper._find_forum_section = find_section
+
+        # Hasil pertemuan kembali sebelum capture selesai
+        result = await scraper._check_meeting_forum(page, "TEST-SHOT", 1)
+        assert result.status == ForumStatus.UNKNOWN
+        assert result.screenshot_path and not os.path.exists(result.screenshot_path)
+
+        # Navigasi berikutnya di page yang sama menunggu capture
+        next_load = asyncio.create_task(scraper._load_meeting_page(page, "TEST-SHOT", 2))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert navigations == ["1"]
+
+        page.finish.set()
+        await next_load
+        assert navigations == ["1", "2"]
+        assert os.path.exists(result.screenshot_path)
+        await asyncio.sleep(0)
+        assert scraper._captures == {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(scenario(tmp))
+
+
+if __name__ == "__main__":
+    test_screenshot_runs_in_background_and_holds_page()
+    print("OK")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test single-flight MentariBotCore: /check dan scan langganan berbagi satu job
+"""
+
+import asyncio
+import os
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from src.core.bot_service import MentariBotCore
+from src.models import LoginCredentials, ScrapingResult
+
+
+def test_subscription_scan_joins_in_flight_check():
+    async def scenario():
+        bot_core = MentariBotCore()
+        calls = []
+        release = asyncio.Event()
+
+        async def scrape(credentials, courses=None, progress_callback=None, checkpoint=None, course_callback=None):
+            calls.append(credentials.nim)
+            await release.wait()
+            return ScrapingResult.from_course_results([], 1.0)
+
+        bot_core.scrape = scrape
+        credentials = LoginCredentials(nim="123", password="secret")
+
+        check = asyncio.create_task(bot_core.execute_full_scraping(credentials))
+        await asyncio.sleep(0)
+        scan = asyncio.create_task(bot_core.collect_result(credentials))
+        await asyncio.sleep(0)
+        release.set()
+        report, result = await asyncio.gather(check, scan)
+        return calls, report, result
+
+    calls, report, result = asyncio.run(scenario())
+
+    assert calls == ["123"]
+    assert isinstance(report, str)
+    assert isinstance(result, ScrapingResult)
+
+
+if __name__ == "__main__":
+    test_subscription_scan_joins_in_flight_check()
+    print("OK")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test analitik riwayat status (HistoryStore + status_analytics)
+"""
+
+import tempfile
+
+from src.models import CourseInfo, CourseResult, ForumStatus, MeetingInfo, ScrapingResult
+from src.services.history_store import HistoryStore
+from src.services.status_analytics import (
+    error_rates,
+    latest_open_meetings,
+    load_history,
+    opening_schedule,
+    opening_windows,
+    time_to_join,
+)
+
+
+# Senin, 1 Januari 2024 00:00 UTC (07:00 WIB)
+BASE = 1704067200.0
+HOUR = 3600.0
+
+
+def snapshot(course_code: str, *statuses: ForumStatus, estimated_meeting: int = None) -> ScrapingResult:
+    """Hasil scan satu mata kuliah; pertemuan ke-n memakai statuses[n-1]"""
+    meetings = list(range(1, len(statuses) + 1))
+    course = CourseResult.from_course_info(CourseInfo(code=course_code, name=course_code, meetings=meetings))
+    for number, status in zip(meetings, statuses):
+        course.add_meeting_result(MeetingInfo(number, status, f"Pertemuan {number}"))
+    if estimated_meeting:
+        course.add_meeting_result(MeetingInfo(
+            estimated_meeting, ForumStatus.UNAVAILABLE, "perkiraan", estimated=True
+        ))
+    return ScrapingResult.from_course_results([course], 1.0)
+
+
+def build_history(directory: str) -> HistoryStore:
+    store = HistoryStore(directory)
+    U, A, J = ForumStatus.UNAVAILABLE, ForumStatus.AVAILABLE, ForumStatus.JOINED
+    # Pertemuan 3 hanya perkiraan: tidak boleh masuk riwayat
+    assert store.record("111", snapshot("COURSE-A", U, U, estimated_meeting=3), BASE) == 2
+    store.record("222", snapshot("COURSE-A", A, ForumStatus.ERROR), BASE + 2 * HOUR)
+    store.record("111", snapshot("COURSE-A", A, ForumStatus.TIMEOUT), BASE + 4 * HOUR)
+    store.record("111", snapshot("COURSE-A", J, A), BASE + 10 * HOUR)
+    store.record("222", snapshot("COURSE-B", U), BASE + 10 * HOUR)
+    return store
+
+
+def test_history_analytics():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = build_history(tmp)
+        frame = load_history(store)
+        assert len(frame) == 9
+        assert store.course_codes == ["COURSE-A", "COURSE-B"]
+
+        # NIM 111: terlihat tersedia +4 jam, bergabung +10 jam; NIM 222 tidak bergabung
+        joins = time_to_join(frame)
+        assert list(joins) == ["COURSE-A"]
+        assert joins["COURSE-A"]["samples"] == 1
+        assert joins["COURSE-A"]["mean"] == 6.0
+
+        # Observasi ERROR/TIMEOUT bukan bukti forum tertutup
+        assert opening_windows(frame) == {
+            ("COURSE-A", 1): (BASE, BASE + 2 * HOUR),
+            ("COURSE-A", 2): (BASE, BASE + 10 * HOUR),
+        }
+        assert latest_open_meetings(frame) == {"COURSE-A": 2}
+
+        rates = error_rates(frame)
+        assert rates[("COURSE-A", 1)] == {"checks": 4, "failures": 0, "rate": 0.0}
+        assert rates[("COURSE-A", 2)] == {"checks": 4, "failures": 2, "rate": 0.5}
+        assert rates[("COURSE-B", 1)]["checks"] == 1
+
+        # Titik tengah jendela: +1 jam (08:00 WIB) dan +5 jam (12:00 WIB), hari Senin
+        schedule = opening_schedule(frame)
+        assert list(schedule) == ["COURSE-A"]
+        assert schedule["COURSE-A"].sum() == 2
+        assert schedule["COURSE-A"][0, 8] == 1 and schedule["COURSE-A"][0, 12] == 1
+
+        # Filter waktu: hanya scan +4 jam dan +10 jam
+        recent = load_history(store, since=BASE + 3 * HOUR)
+        assert len(recent) == 5
+        assert opening_windows(recent) == {}
+
+        # Append terputus (hanya kolom ts yang tertulis): dipotong ke kolom terpendek
+        with open(store.column_path("ts"), "ab") as f:
+            f.write(b"\0" * 8)
+        assert len(load_history(store)) == 9
+
+
+def test_empty_history():
+    with tempfile.TemporaryDirectory() as tmp:
+        frame = load_history(HistoryStore(tmp))
+        assert len(frame) == 0
+        assert time_to_join(frame) == {}
+        assert opening_windows(frame) == {}
+        assert latest_open_meetings(frame) == {}
+        assert error_rates(frame) == {}
+        assert opening_schedule(frame) == {}
+
+
+if __name__ == "__main__":
+    test_history_analytics()
+    test_empty_history()
+    print("OK")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test /subscribe: deteksi perubahan snapshot dan login gagal yang tidak
+langsung menghentikan langganan
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from cryptography.fernet import Fernet
+
+from src.core.bot_service import LoginFailedError
+from src.models import CourseInfo, CourseResult, ForumStatus, LoginCredentials, MeetingInfo, ScrapingResult
+from src.services.job_store import CredentialVault
+from src.services.subscriptions import SubscriptionScheduler, SubscriptionStore, diff_snapshots
+
+
+def scan(*courses) -> ScrapingResult:
+    """Hasil scan; setiap course berupa (kode, [status pertemuan 1..n])"""
+    results = []
+    for code, statuses in courses:
+        meetings = list(range(1, len(statuses) + 1))
+        result = CourseResult.from_course_info(CourseInfo(code=code, name=f"MK {code}", meetings=meetings))
+        for number, status in zip(meetings, statuses):
+            result.add_meeting_result(MeetingInfo(number, status, f"Pertemuan {number}"))
+        results.append(result)
+    return ScrapingResult.from_course_results(results, 1.0)
+
+
+def test_diff_reports_newly_available_forum():
+    U, A = ForumStatus.UNAVAILABLE, ForumStatus.AVAILABLE
+    changes, snapshot = diff_snapshots({"A:1": "available", "A:2": "unavailable"}, scan(("A", [A, A])))
+
+    assert [(c.course_code, c.meeting_number, c.old_status, c.new_status) for c in changes] == [
+        ("A", 2, U, A)
+    ]
+    assert changes[0].course_name == "MK A"
+    assert snapshot == {"A:1": "available", "A:2": "available"}
+
+
+def test_diff_unchanged_and_first_scan_report_nothing():
+    U, A = ForumStatus.UNAVAILABLE, ForumStatus.AVAILABLE
+    # Scan pertama hanya membangun baseline
+    changes, baseline = diff_snapshots({}, scan(("A", [A, U])))
+    assert changes == []
+    assert baseline == {"A:1": "available", "A:2": "unavailable"}
+
+    changes, snapshot = diff_snapshots(baseline, scan(("A", [A, U])))
+    assert changes == []
+    assert snapshot == baseline
+
+
+def test_diff_keeps_old_status_for_transient_results():
+    A = ForumStatus.AVAILABLE
+    changes, snapshot = diff_snapshots(
+        {"A:1": "available", "A:2": "unavailable"}, scan(("A", [A, ForumStatus.TIMEOUT]))
+    )
+    assert changes == []
+    assert snapshot["A:2"] == "unavailable"
+
+
+def test_diff_removed_course_is_not_reported():
+    J = ForumStatus.JOINED
+    previous = {"A:1": "available", "B:1": "joined"}
+    changes, snapshot = diff_snapshots(previous, scan(("A", [J])))
+
+    # Mata kuliah B tidak ada di scan ini (mis. deteksi dashboard berubah)
+    assert [(c.course_code, c.new_status) for c in changes] == [("A", J)]
+    assert snapshot["A:1"] == "joined"
+
+
+class FailingBotCore:
+    """Bot core yang login-nya selalu gagal"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def collect_result(self, credentials):
+        self.calls += 1
+        raise LoginFailedError("Login gagal")
+
+
+def test_login_failures_unsubscribe_only_after_consecutive_scans():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SubscriptionStore(os.path.join(tmp, "jobs.db"), CredentialVault(Fernet.generate_key()))
+        store.subscribe(42, LoginCredentials(nim="123", password="secret"), first_run=0)
+
+        bot_core = FailingBotCore()
+        scheduler = SubscriptionScheduler(store, bot_core, max_login_failures=3)
+        messages = []
+
+        async def notify(chat_id, text):
+            messages.append((chat_id, text))
+
+        scheduler.notify = notify
+
+        async def scan_due():
+            # Jadwal dimajukan manual: setiap scan gagal menjadwalkan ulang
+            store.reschedule(42, 0)
+            due = store.claim_due(time.time(), 1, 60)
+            assert [subscription.chat_id for subscription in due] == [42]
+            await scheduler._scan(due[0])
+
+        for _ in range(2):
+            asyncio.run(scan_due())
+            assert store.is_subscribed(42)
+            assert messages == []
+
+        asyncio.run(scan_due())
+        assert not store.is_subscribed(42)
+        assert bot_core.calls == 3
+        assert len(messages) == 1 and "3 pengecekan" in messages[0][1]
+
+
+def test_successful_scan_resets_login_failures():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SubscriptionStore(os.path.join(tmp, "jobs.db"), CredentialVault(Fernet.generate_key()))
+        store.subscribe(42, LoginCredentials(nim="123", password="secret"), first_run=0)
+
+        assert store.record_login_failure(42, 0) == 1
+        assert store.record_login_failure(42, 0) == 2
+        store.save_snapshot(42, {}, 0)
+        assert store.record_login_failure(42, 0) == 1
+
+
+if __name__ == "__main__":
+    test_diff_reports_newly_available_forum()
+    test_diff_unchanged_and_first_scan_report_nothing()
+    test_diff_keeps_old_status_for_transient_results()
+    test_diff_removed_course_is_not_reported()
+    test_login_failures_unsubscribe_only_after_consecutive_scans()
+    test_successful_scan_resets_login_failures()
+    print("OK")
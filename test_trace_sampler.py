@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test tail-sampled tracing: login tidak pernah terekam di trace
+"""
+
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from src.config import AppSettings
+from src.core.bot_service import LoginFailedError, MentariBotCore
+from src.models import CourseInfo, LoginCredentials, ScrapingResult
+
+
+class FakeTracing:
+    def __init__(self, events):
+        self.events = events
+
+    async def start(self, **kwargs):
+        self.events.append("trace_start")
+
+    async def stop(self, path=None):
+        self.events.append("trace_stop")
+        if path:
+            with open(path, "wb") as f:
+                f.write(b"trace")
+
+
+class FakeContext:
+    def __init__(self, events):
+        self.tracing = FakeTracing(events)
+
+    async def close(self):
+        pass
+
+
+def run_scrape(trace_dir, login_success):
+    """Jalankan scrape dengan browser palsu; kembalikan (urutan kejadian, error)"""
+    settings = AppSettings(
+        enable_trace_sampling=True,
+        trace_latency_threshold=0,
+        trace_dir=trace_dir,
+        enable_screenshots=False,
+        enable_video_recording=False
+    )
+    bot_core = MentariBotCore(settings)
+    events = []
+
+    class FakeBrowser:
+        async def new_context(self, **options):
+            return FakeContext(events)
+
+    @asynccontextmanager
+    async def browser_session():
+        yield FakeBrowser()
+
+    async def login_with_retry(context, credentials, progress_callback=None):
+        events.append("login")
+        return login_success
+
+    async def scrape_all_courses(context, courses, *args):
+        events.append("scrape")
+        return ScrapingResult.from_course_results([], 1.0)
+
+    bot_core._browser_session = browser_session
+    bot_core.auth_service.login_with_retry = login_with_retry
+    bot_core.scraper_service.scrape_all_courses = scrape_all_courses
+
+    courses = [CourseInfo(code="TEST", name="TEST", meetings=[1])]
+    try:
+        asyncio.run(bot_core.scrape(LoginCredentials(nim="123", password="secret"), courses))
+    except LoginFailedError as e:
+        return events, e
+    return events, None
+
+
+def test_failed_login_keeps_no_trace():
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_dir = os.path.join(tmp, "traces")
+        events, error = run_scrape(trace_dir, login_success=False)
+
+        assert isinstance(error, LoginFailedError)
+        assert events == ["login"]
+        assert not os.path.exists(trace_dir) or os.listdir(trace_dir) == []
+
+
+def test_trace_starts_after_login():
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_dir = os.path.join(tmp, "traces")
+        events, error = run_scrape(trace_dir, login_success=True)
+
+        assert error is None
+        assert events == ["login", "trace_start", "scrape", "trace_stop"]
+        # Threshold 0: setiap job dianggap lambat sehingga trace disimpan
+        assert len(os.listdir(trace_dir)) == 1
+
+
+if __name__ == "__main__":
+    test_failed_login_keeps_no_trace()
+    test_trace_starts_after_login()
+    print("OK")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test ScrapeWorkerPool: worker mati hanya menggagalkan job yang dipegangnya
+"""
+
+import asyncio
+import os
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test-token")
+os.environ.setdefault("CAPTCHA_API_KEY", "test-key")
+
+from src.config import AppSettings
+from src.core import worker_pool
+from src.core.worker_pool import ScrapeWorkerPool, _PendingJob, _take_task
+
+
+class FakeProcess:
+    def __init__(self, alive: bool):
+        self.alive = alive
+        self.exitcode = None if alive else -9
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+
+class FakeQueue:
+    def __init__(self, items):
+        self.items = list(items)
+
+    def get(self):
+        return self.items.pop(0)
+
+
+def test_dead_worker_fails_only_its_claimed_job():
+    async def scenario():
+        pool = ScrapeWorkerPool(AppSettings(), workers=2)
+        loop = asyncio.get_running_loop()
+        respawned = []
+        pool._spawn = respawned.append
+
+        claim = worker_pool._mp_context.Array("c", worker_pool._CLAIM_SIZE)
+        pool._claims = {0: claim}
+        pool._processes = {0: FakeProcess(alive=False), 1: FakeProcess(alive=True)}
+
+        # Worker 0 mengambil job "claimed" lalu mati sebelum event "started" terkirim
+        assert _take_task(FakeQueue([("claimed", "123", "secret", [], False)]), claim)[0] == "claimed"
+        for job_id in ("claimed", "queued", "running"):
+            pool._pending[job_id] = _PendingJob(loop.create_future(), None)
+        pool._pending["running"].worker_id = 1
+
+        pool._check_workers()
+        return pool._pending, respawned
+
+    pending, respawned = asyncio.run(scenario())
+
+    assert respawned == [0]
+    assert isinstance(pending["claimed"].future.exception(), RuntimeError)
+    # Job yang masih di queue atau dipegang worker lain tidak ikut digagalkan
+    assert not pending["queued"].future.done()
+    assert not pending["running"].future.done()
+
+
+def test_stop_sentinel_is_not_claimed():
+    claim = worker_pool._mp_context.Array("c", worker_pool._CLAIM_SIZE)
+    claim.value = b"previous"
+
+    assert _take_task(FakeQueue([None]), claim) is None
+    assert claim.value == b"previous"
+
+
+if __name__ == "__main__":
+    test_dead_worker_fails_only_its_claimed_job()
+    test_stop_sentinel_is_not_claimed()
+    print("OK")